@@ -1,5 +1,6 @@
 from contextlib import AbstractContextManager, nullcontext
 from datetime import datetime
+import logging
 from pathlib import Path, PurePath
 from shutil import copy
 import sys
@@ -7,21 +8,36 @@ import tempfile
 from typing import List, Optional, TextIO, Union
 
 import click
+import h5py
 from mpi4py import MPI
 from loguru import logger
 
 import httomo.globals
 from httomo.cli_utils import is_sweep_pipeline
+from httomo.loaders.standard_tomo_loader import StandardLoaderWrapper
 from httomo.logger import setup_logger
 from httomo.monitors import MONITORS_MAP, make_monitors
 from httomo.sweep_runner.param_sweep_runner import ParamSweepRunner
 from httomo.transform_layer import TransformLayer
 from httomo.yaml_checker import validate_yaml_config
+from httomo.runner.autotune import CpuBlockSizeTuner
+from httomo.runner.checkpoint import SectionCheckpoint, pipeline_hash
+from httomo.runner.dataset_store_backing import DataSetStoreBacking
+from httomo.runner.plan import format_plan, loader_global_shape_and_dtype, plan_pipeline
 from httomo.runner.task_runner import TaskRunner
 from httomo.ui_layer import UiLayer
+from httomo.utils import log_once
 
 from . import __version__
 
+# backing of the store for data that doesn't fit into memory, by `--file-store`
+FILE_STORE_BACKINGS = {
+    "hdf5": DataSetStoreBacking.File,
+    "mmap": DataSetStoreBacking.Mmap,
+    "hybrid": DataSetStoreBacking.Hybrid,
+    "local": DataSetStoreBacking.LocalFile,
+}
+
 
 @click.group
 @click.version_option(version=__version__, message="%(version)s")
@@ -95,6 +111,28 @@ def check(yaml_config: Path, in_data_file: Optional[Path] = None):
     default="0",
     help="Limit the amount of memory used by the pipeline to the given memory (supports strings like 3.2G or bytes)",
 )
+@click.option(
+    "--reslice-buffer",
+    type=click.STRING,
+    default="0",
+    help="Memory for the buffers of in-memory reslicing, which then exchanges the data in rounds (supports strings like 512M or bytes). By default (0), the data is exchanged all at once",
+)
+@click.option(
+    "--hierarchical-reslice",
+    is_flag=True,
+    help="Exchange the data of in-memory reslicing between nodes, through shared memory within each node",
+)
+@click.option(
+    "--compress-reslice",
+    is_flag=True,
+    help="Compress the data sent between processes when reslicing in memory, unless that turns out to be slower",
+)
+@click.option(
+    "--loader-read-size",
+    type=click.STRING,
+    default="0",
+    help="Size of the super-blocks the loader reads from the input file at a time, which the blocks are copied from (supports strings like 512M or bytes, 0 to read each block on its own)",
+)
 @click.option(
     "--monitor",
     type=click.STRING,
@@ -140,6 +178,67 @@ def check(yaml_config: Path, in_data_file: Optional[Path] = None):
     default=1,
     help="Number of frames per-chunk in intermediate data (0 = write as contiguous)",
 )
+@click.option(
+    "--pipelined",
+    is_flag=True,
+    help="Overlap reading and writing of blocks with the processing of other blocks",
+)
+@click.option(
+    "--incremental-reslice",
+    is_flag=True,
+    help="Send blocks to their destination processes as soon as they are written when reslicing in memory",
+)
+@click.option(
+    "--checkpoint-dir",
+    type=click.Path(file_okay=False, writable=True, path_type=Path),
+    default=None,
+    help="Directory to save the output of each completed section to, for resuming failed runs",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Skip the sections completed by a previous run, using the data saved in --checkpoint-dir",
+)
+@click.option(
+    "--autotune-cpu-slices",
+    is_flag=True,
+    help="Tune the number of slices per block for CPU-only sections by timing their first blocks",
+)
+@click.option(
+    "--tuning-cache",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    default=Path.home() / ".cache" / "httomo" / "cpu_block_sizes.json",
+    help="File to keep the block sizes tuned with --autotune-cpu-slices in, for later runs",
+)
+@click.option(
+    "--cpu-threads",
+    type=click.IntRange(1),
+    default=1,
+    help="Number of blocks to process concurrently in CPU sections with block-parallel methods only (default: 1)",
+)
+@click.option(
+    "--dynamic-load-balancing",
+    is_flag=True,
+    help="Hand out the blocks of the first section to the processes at runtime, if all its methods are block-parallel",
+)
+@click.option(
+    "--min-slices-per-process",
+    type=click.IntRange(0),
+    default=0,
+    help="Run sections after the first on fewer processes, so that each gets at least this many slices (default: 0, i.e. all processes)",
+)
+@click.option(
+    "--file-store",
+    type=click.Choice(list(FILE_STORE_BACKINGS), case_sensitive=False),
+    default="hdf5",
+    help="Format of the temporary file used when the data does not fit into memory (mmap does not need parallel HDF5, hybrid keeps what fits in memory and spills the rest to a file per process, local writes a file per process, e.g. to node-local storage given with --reslice-dir)",
+)
+@click.option(
+    "--compressed-store-ratio",
+    type=click.FloatRange(0),
+    default=0.0,
+    help="Keep data that does not fit into memory compressed in memory instead of in a file, if it would fit when compressed by this ratio (default: 0, i.e. never compress)",
+)
 def run(
     in_data_file: Path,
     yaml_config: Path,
@@ -150,6 +249,10 @@ def run(
     reslice_dir: Union[Path, None],
     max_cpu_slices: int,
     max_memory: str,
+    reslice_buffer: str,
+    hierarchical_reslice: bool,
+    compress_reslice: bool,
+    loader_read_size: str,
     monitor: List[str],
     monitor_output: TextIO,
     intermediate_format: str,
@@ -157,6 +260,17 @@ def run(
     syslog_host: str,
     syslog_port: int,
     frames_per_chunk: int,
+    pipelined: bool,
+    incremental_reslice: bool,
+    checkpoint_dir: Optional[Path],
+    resume: bool,
+    autotune_cpu_slices: bool,
+    tuning_cache: Path,
+    cpu_threads: int,
+    dynamic_load_balancing: bool,
+    min_slices_per_process: int,
+    file_store: str,
+    compressed_store_ratio: float,
 ):
     """Run a pipeline defined in YAML on input data."""
     if compress_intermediate:
@@ -200,6 +314,39 @@ def run(
         if max_cpu_slices < 1:
             raise ValueError("max-cpu-slices must be greater or equal to 1")
         httomo.globals.MAX_CPU_SLICES = max_cpu_slices
+        httomo.globals.RESLICE_BUFFER_BYTES = transform_limit_str_to_bytes(
+            reslice_buffer
+        )
+        httomo.globals.RESLICE_HIERARCHICAL = hierarchical_reslice
+        httomo.globals.RESLICE_COMPRESSION = compress_reslice
+        httomo.globals.LOADER_READ_BYTES = transform_limit_str_to_bytes(
+            loader_read_size
+        )
+
+        if resume and checkpoint_dir is None:
+            raise ValueError("--resume requires a --checkpoint-dir")
+        checkpoint = None
+        if checkpoint_dir is not None:
+            checkpoint = SectionCheckpoint(
+                checkpoint_dir,
+                pipeline_hash(yaml_config),
+                in_data_file,
+                global_comm,
+            )
+        autotuner = None
+        if autotune_cpu_slices:
+            autotuner = CpuBlockSizeTuner(
+                tuning_cache, pipeline_hash(yaml_config), global_comm
+            )
+
+        file_store_backing = FILE_STORE_BACKINGS[file_store.lower()]
+        if file_store_backing is DataSetStoreBacking.File and not h5py.get_config().mpi:
+            # the shared file needs a parallel HDF5 build of h5py
+            log_once(
+                "h5py has no MPI support - using a file per process for data that does not fit into memory",
+                level=logging.WARNING,
+            )
+            file_store_backing = DataSetStoreBacking.LocalFile
 
         _set_gpu_id(gpu_id)
 
@@ -215,6 +362,16 @@ def run(
                 global_comm,
                 monitor=mon,
                 memory_limit_bytes=memory_limit,
+                pipelined=pipelined,
+                incremental_reslice=incremental_reslice,
+                checkpoint=checkpoint,
+                resume=resume,
+                autotuner=autotuner,
+                cpu_threads=cpu_threads,
+                dynamic_load_balancing=dynamic_load_balancing,
+                min_slices_per_process=min_slices_per_process,
+                file_store_backing=file_store_backing,
+                compressed_store_ratio=compressed_store_ratio,
             )
             runner.execute()
             if mon is not None:
@@ -223,6 +380,71 @@ def run(
         ParamSweepRunner(pipeline, global_comm).execute()
 
 
+@main.command()
+@click.argument(
+    "in_data_file", type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+@click.argument(
+    "yaml_config", type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+@click.option(
+    "--nprocs",
+    type=click.IntRange(1),
+    multiple=True,
+    default=[1],
+    help="Number of processes to plan for (can be given multiple times)",
+)
+@click.option(
+    "--gpu-memory",
+    type=click.STRING,
+    default=None,
+    help="Available GPU memory to plan for (supports strings like 3.2G or bytes)",
+)
+@click.option(
+    "--max-cpu-slices",
+    type=click.INT,
+    default=64,
+    help="Maximum number of slices to use for a block for CPU-only sections (default: 64)",
+)
+@click.option(
+    "--max-memory",
+    type=click.STRING,
+    default="0",
+    help="Limit the amount of memory used by the pipeline to the given memory (supports strings like 3.2G or bytes)",
+)
+def plan(
+    in_data_file: Path,
+    yaml_config: Path,
+    nprocs: List[int],
+    gpu_memory: Optional[str],
+    max_cpu_slices: int,
+    max_memory: str,
+):
+    """Print how a pipeline defined in YAML would be executed, without processing any data."""
+    if max_cpu_slices < 1:
+        raise ValueError("max-cpu-slices must be greater or equal to 1")
+    httomo.globals.MAX_CPU_SLICES = max_cpu_slices
+
+    pipeline = UiLayer(yaml_config, in_data_file, comm=MPI.COMM_SELF).build_pipeline()
+    pipeline = TransformLayer(comm=MPI.COMM_SELF).transform(pipeline)
+    if not isinstance(pipeline.loader, StandardLoaderWrapper):
+        raise ValueError("Only the standard_tomo loader is currently supported")
+    global_shape, dtype = loader_global_shape_and_dtype(pipeline.loader)
+
+    plans = plan_pipeline(
+        pipeline,
+        global_shape,
+        dtype,
+        nprocs=list(nprocs),
+        # we use half the memory for blocks since we typically have inputs/output
+        memory_limit_bytes=transform_limit_str_to_bytes(max_memory) // 2,
+        gpu_memory_bytes=(
+            transform_limit_str_to_bytes(gpu_memory) if gpu_memory is not None else None
+        ),
+    )
+    click.echo(format_plan(plans))
+
+
 def _check_yaml(yaml_config: Path, in_data: Path):
     """Check a YAML pipeline file for errors."""
     return validate_yaml_config(yaml_config, in_data)
@@ -0,0 +1,256 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+import itertools
+import zlib
+
+import numpy as np
+from numpy.typing import DTypeLike
+
+blosc2_enabled = False
+try:
+    import blosc2
+
+    blosc2_enabled = True  # shuffle + LZ4 from c-blosc2
+except ImportError:
+    # a dependency, but the (much slower) zlib keeps the compressed store working
+    # where it isn't available
+    pass
+
+
+TileIndex = Tuple[int, int, int]
+
+
+def slice_bounds(key, shape: Tuple[int, ...]) -> List[Tuple[int, int]]:
+    """The (start, stop) bounds of the slices (without steps) indexing an array of the
+    given shape in every dimension"""
+    if not isinstance(key, tuple):
+        key = (key,)
+    key = key + (slice(None),) * (len(shape) - len(key))
+    bounds = []
+    for k, length in zip(key, shape):
+        if not isinstance(k, slice):
+            raise TypeError("Chunks can only be indexed with slices")
+        start, stop, step = k.indices(length)
+        if step != 1:
+            raise ValueError("Chunks cannot be indexed with steps")
+        bounds.append((start, max(start, stop)))
+    return bounds
+
+
+def compress_array(data: np.ndarray) -> bytes:
+    """Losslessly compresses an array, byte-shuffled (so that the bytes of the same
+    significance are next to each other) and fast rather than small"""
+    data = np.ascontiguousarray(data)
+    if blosc2_enabled:
+        return blosc2.compress(
+            data,
+            typesize=data.itemsize,
+            clevel=1,
+            filter=blosc2.Filter.SHUFFLE,
+            codec=blosc2.Codec.LZ4,
+        )
+    shuffled = data.reshape(-1).view(np.uint8).reshape(-1, data.itemsize).T
+    return zlib.compress(shuffled.tobytes(), 1)
+
+
+def decompress_array(
+    buffer: bytes, shape: Tuple[int, ...], dtype: DTypeLike
+) -> np.ndarray:
+    """Inverse of `compress_array` - returns a new, writable array"""
+    dtype = np.dtype(dtype)
+    if blosc2_enabled:
+        return np.frombuffer(blosc2.decompress(buffer), dtype).reshape(shape).copy()
+    shuffled = np.frombuffer(zlib.decompress(buffer), np.uint8)
+    return (
+        np.array(shuffled.reshape(dtype.itemsize, -1).T, order="C")
+        .view(dtype)
+        .reshape(shape)
+    )
+
+
+class CompressedChunk:
+    """A 3D chunk held in memory as independently compressed tiles.
+
+    It can be read and written like a numpy array with slices (without steps), and only
+    the tiles overlapping the slices are (de)compressed, in a thread pool. The tiles
+    have the extents `tile_shape`, aligned to multiples of it in global coordinates,
+    with the chunk starting at `origin`. This way, the tiles of chunks in different
+    slicing dimensions match each other.
+
+    Tiles that are only written partially are kept uncompressed until all of their
+    elements have been written (or `flush` is called), so that blocks which are not
+    aligned to the tiles don't need to decompress them again. Elements which have never
+    been written read as zeros.
+    """
+
+    def __init__(
+        self,
+        shape: Tuple[int, int, int],
+        dtype: DTypeLike,
+        tile_shape: Tuple[int, int, int],
+        origin: Tuple[int, int, int] = (0, 0, 0),
+        max_workers: Optional[int] = None,
+    ):
+        self._shape = (shape[0], shape[1], shape[2])
+        self._dtype = np.dtype(dtype)
+        self._tile_shape = (
+            max(1, tile_shape[0]),
+            max(1, tile_shape[1]),
+            max(1, tile_shape[2]),
+        )
+        self._origin = (origin[0], origin[1], origin[2])
+        self._tiles: Dict[TileIndex, bytes] = {}
+        # tiles that are still being written, with the number of elements written so far
+        self._partial: Dict[TileIndex, Tuple[np.ndarray, int]] = {}
+        self._pool = ThreadPoolExecutor(max_workers)
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self._shape
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._dtype
+
+    @property
+    def ndim(self) -> int:
+        return 3
+
+    @property
+    def tile_shape(self) -> Tuple[int, int, int]:
+        return self._tile_shape
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the uncompressed chunk"""
+        return int(np.prod(self._shape)) * self._dtype.itemsize
+
+    @property
+    def compressed_nbytes(self) -> int:
+        """Memory currently held by the tiles (including the uncompressed ones)"""
+        return sum(len(t) for t in self._tiles.values()) + sum(
+            t.nbytes for t, _ in self._partial.values()
+        )
+
+    def like(
+        self,
+        shape: Tuple[int, int, int],
+        global_index: Tuple[int, int, int],
+        slicing_dim: int,
+    ) -> "CompressedChunk":
+        """Creates an empty chunk with the same tiles, e.g. for the chunk after
+        reslicing"""
+        return CompressedChunk(
+            shape, self._dtype, self._tile_shape, origin=global_index
+        )
+
+    def slab_length(self, dim: int) -> int:
+        """Number of slices along `dim` worth processing at a time - a layer of tiles"""
+        return self._tile_shape[dim]
+
+    def __getitem__(self, key) -> np.ndarray:
+        bounds = slice_bounds(key, self._shape)
+        out = np.empty([stop - start for start, stop in bounds], self._dtype)
+
+        def read_tile(index: TileIndex):
+            tile_bounds = self._tile_bounds(index)
+            src, dst = self._overlap(tile_bounds, bounds)
+            out[dst] = self._load_tile(index, tile_bounds)[src]
+
+        list(self._pool.map(read_tile, self._tiles_in(bounds)))
+        return out
+
+    def __setitem__(self, key, value):
+        bounds = slice_bounds(key, self._shape)
+        value = np.broadcast_to(
+            np.asarray(value, dtype=self._dtype),
+            [stop - start for start, stop in bounds],
+        )
+
+        def write_tile(index: TileIndex):
+            tile_bounds = self._tile_bounds(index)
+            src, dst = self._overlap(tile_bounds, bounds)
+            tile_size = int(np.prod([stop - start for start, stop in tile_bounds]))
+            written = value[dst]
+            if written.size == tile_size:
+                return index, compress_array(written), None
+            if index in self._partial:
+                tile, filled = self._partial[index]
+            else:
+                tile = self._load_tile(index, tile_bounds)
+                filled = tile_size if index in self._tiles else 0
+            tile[src] = written
+            filled += written.size
+            if filled >= tile_size:
+                return index, compress_array(tile), None
+            return index, None, (tile, filled)
+
+        results = list(self._pool.map(write_tile, self._tiles_in(bounds)))
+        # the dictionaries are only updated once all worker threads are done
+        for index, compressed, partial in results:
+            if compressed is not None:
+                self._tiles[index] = compressed
+                self._partial.pop(index, None)
+            else:
+                assert partial is not None
+                self._partial[index] = partial
+                self._tiles.pop(index, None)
+
+    def flush(self):
+        """Compresses the tiles which have only been written partially"""
+
+        def compress_tile(index: TileIndex):
+            return index, compress_array(self._partial[index][0])
+
+        for index, compressed in self._pool.map(compress_tile, list(self._partial)):
+            self._tiles[index] = compressed
+        self._partial = {}
+
+    def close(self):
+        """Releases the tiles and the thread pool"""
+        self._tiles = {}
+        self._partial = {}
+        self._pool.shutdown()
+
+    def _tiles_in(self, bounds: List[Tuple[int, int]]) -> Iterator[TileIndex]:
+        """Indices of the tiles overlapping the given (chunk-relative) bounds"""
+        if any(stop <= start for start, stop in bounds):
+            return iter([])
+        ranges = [
+            range((start + o) // t, (stop - 1 + o) // t + 1)
+            for (start, stop), o, t in zip(bounds, self._origin, self._tile_shape)
+        ]
+        return itertools.product(*ranges)  # type: ignore
+
+    def _tile_bounds(self, index: TileIndex) -> List[Tuple[int, int]]:
+        """Chunk-relative bounds of a tile, clipped to the chunk"""
+        return [
+            (max(0, i * t - o), min(length, (i + 1) * t - o))
+            for i, t, o, length in zip(
+                index, self._tile_shape, self._origin, self._shape
+            )
+        ]
+
+    @staticmethod
+    def _overlap(
+        tile_bounds: List[Tuple[int, int]], bounds: List[Tuple[int, int]]
+    ) -> Tuple[Tuple[slice, ...], Tuple[slice, ...]]:
+        """Slices of the overlap between a tile and the given bounds, relative to the tile
+        and to the bounds respectively"""
+        src = []
+        dst = []
+        for (tile_start, tile_stop), (start, stop) in zip(tile_bounds, bounds):
+            lo, hi = max(tile_start, start), min(tile_stop, stop)
+            src.append(slice(lo - tile_start, hi - tile_start))
+            dst.append(slice(lo - start, hi - start))
+        return tuple(src), tuple(dst)
+
+    def _load_tile(
+        self, index: TileIndex, tile_bounds: List[Tuple[int, int]]
+    ) -> np.ndarray:
+        tile_shape = tuple(stop - start for start, stop in tile_bounds)
+        if index in self._partial:
+            return self._partial[index][0]
+        if index in self._tiles:
+            return decompress_array(self._tiles[index], tile_shape, self._dtype)
+        return np.zeros(tile_shape, self._dtype)
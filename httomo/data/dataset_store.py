@@ -24,9 +24,23 @@ from os import PathLike
 from pathlib import Path
 import time
 import h5py
-from typing import List, Literal, Optional, Tuple, Union
-from httomo.data.hdf._utils.reslice import reslice
-from httomo.data.padding import extrapolate_after, extrapolate_before
+import httomo.globals
+from typing import BinaryIO, List, Literal, Optional, Tuple, Union
+from httomo.data.compressed_chunk import CompressedChunk
+from httomo.data.spilled_chunk import SpilledChunk
+from httomo.data.hdf._utils.chunk import (
+    calculate_chunk_cache,
+    calculate_store_chunks,
+    is_orthogonal_read,
+)
+from httomo.data.hdf._utils.reslice import IncrementalReslicer, reslice
+from httomo.data.mpiutil import alltoallw_regions
+from httomo.data.padding import (
+    Halo,
+    extrapolate_after,
+    extrapolate_before,
+    read_into_block,
+)
 from httomo.runner.auxiliary_data import AuxiliaryData
 from httomo.runner.dataset import DataSetBlock
 from httomo.runner.dataset_store_backing import DataSetStoreBacking
@@ -43,15 +57,51 @@ import weakref
 from httomo.utils import log_once, make_3d_shape_from_shape
 
 
+# containers for the chunk of a process that aren't numpy arrays, but can be indexed
+# with slices like them
+_LOCAL_CHUNK_TYPES = (CompressedChunk, SpilledChunk)
+
+
 class DataSetStoreWriter(ReadableDataSetSink):
     """A DataSetSink that can be used to store block-wise data in the current chunk (for the current process).
 
     It uses memory by default - but if there's a memory allocation error, a temporary h5 file is used
-    to back the dataset's memory.
+    to back the dataset's memory. With `DataSetStoreBacking.Mmap`, a raw memory-mapped file is
+    used instead, leaving the spilling to disk to the OS page cache. With
+    `DataSetStoreBacking.CompressedRAM`, the chunk stays in memory, but is held as
+    compressed tiles (see `CompressedChunk`). With `DataSetStoreBacking.Hybrid`, each
+    process keeps as much of its chunk in memory as `ram_budget_bytes` allows, and
+    spills only the rest to a scratch file of its own (see `SpilledChunk`), and with
+    `DataSetStoreBacking.LocalFile` all of it. Unlike `File`, these files are only
+    accessed by the process writing them, so they can be on node-local storage and don't
+    need parallel HDF5.
 
     The `make_reader` method can be used to create a DataSetStoreReader from this writer.
     It is intended to be used after the writer has finished, to read the data blockwise again.
-    It will use the same underlying data store (h5 file or memory)"""
+    It will use the same underlying data store (h5 file or memory)
+
+    If `next_slicing_dim` is given and differs from `slicing_dim`, a RAM-backed store
+    with multiple processes reslices incrementally: each block is sent to the processes
+    holding it in the next slicing dimension as soon as it is written, rather than
+    reslicing the full chunk when the reader is created. The reader then has to be
+    created for `next_slicing_dim`.
+
+    With `dynamic_chunks`, blocks may be written by any process, for any part of the
+    global data (e.g. when processes pull blocks from a shared work queue). The store
+    still ends up with the usual chunk of each process: blocks are redistributed as they
+    are written for RAM-backed stores (processes that haven't written any blocks join
+    the exchange when the reader is made), and written at their global position for
+    file-backed ones.
+
+    For file-based stores, the chunk layout of the file is chosen for writing in
+    `slicing_dim` and reading in `read_slicing_dim` (by default `next_slicing_dim`, or the
+    same dimension). If a reader is made for a slicing dimension in which blocks would
+    only read thin strips of the file's chunks, the file is first transposed into one
+    chunked for that dimension (see `_transpose_file`).
+
+    With `active_comm`, only the processes in it (the first processes of `comm`) write
+    blocks, and it is `MPI.COMM_NULL` on the others. All processes then have to call
+    `share_chunk_layout` once the blocks have been written, before making a reader."""
 
     def __init__(
         self,
@@ -59,22 +109,54 @@ class DataSetStoreWriter(ReadableDataSetSink):
         comm: MPI.Comm,
         temppath: PathLike,
         store_backing: DataSetStoreBacking = DataSetStoreBacking.RAM,
+        next_slicing_dim: Optional[Literal[0, 1, 2]] = None,
+        dynamic_chunks: bool = False,
+        active_comm: Optional[MPI.Comm] = None,
+        read_slicing_dim: Optional[Literal[0, 1, 2]] = None,
+        ram_budget_bytes: int = 0,
     ):
         self._slicing_dim = slicing_dim
         self._comm = comm
+        if read_slicing_dim is None:
+            read_slicing_dim = (
+                slicing_dim if next_slicing_dim is None else next_slicing_dim
+            )
+        self._read_slicing_dim = read_slicing_dim
+        self._active_comm = active_comm
+        self._active_procs = comm.size
+        self._layout_shared = active_comm is None
+        self._next_slicing_dim = next_slicing_dim
+        self._dynamic_chunks = dynamic_chunks
+        self._reslicer: Optional[IncrementalReslicer] = None
 
         self._temppath = temppath
         self._readonly = False
         self._h5file: Optional[h5py.File] = None
         self._h5filename: Optional[Path] = None
+        self._mmap_filename: Optional[Path] = None
         self._store_backing = store_backing
-
-        self._data: Optional[Union[np.ndarray, h5py.Dataset]] = None
+        self._ram_budget_bytes = ram_budget_bytes
+
+        self._data: Optional[
+            Union[np.ndarray, h5py.Dataset, CompressedChunk, SpilledChunk]
+        ] = None
+        # the dataset of a file-based store can't be used anymore once its file is
+        # closed, so its dtype is kept
+        self._dtype: Optional[np.dtype] = None
+        # the largest block written, in elements, to estimate the length of the blocks
+        # read back
+        self._max_block_size = 0
 
         self._global_shape: Optional[Tuple[int, int, int]] = None
         self._chunk_shape: Optional[Tuple[int, int, int]] = None
         self._global_index: Optional[Tuple[int, int, int]] = None
 
+        # duplicated here, as every process constructs the writer, while not every
+        # process is guaranteed to write a block
+        self._reslice_comm: Optional[MPI.Comm] = (
+            comm.Dup() if self.redistributes_blocks else None
+        )
+
         # make sure finalize is called when this object is garbage-collected
         weakref.finalize(self, weakref.WeakMethod(self.finalize))
 
@@ -82,14 +164,55 @@ class DataSetStoreWriter(ReadableDataSetSink):
     def is_file_based(self) -> bool:
         return self._store_backing is DataSetStoreBacking.File
 
+    @property
+    def is_mmap_based(self) -> bool:
+        return self._store_backing is DataSetStoreBacking.Mmap
+
+    @property
+    def is_compressed(self) -> bool:
+        return self._store_backing is DataSetStoreBacking.CompressedRAM
+
+    @property
+    def holds_global_data(self) -> bool:
+        """Whether the store is a file shared by all processes, holding the global data"""
+        return self.is_file_based or self.is_mmap_based
+
     @property
     def filename(self) -> Optional[Path]:
-        return self._h5filename
+        return self._mmap_filename if self.is_mmap_based else self._h5filename
+
+    @property
+    def is_spilled(self) -> bool:
+        return self._store_backing in (
+            DataSetStoreBacking.Hybrid,
+            DataSetStoreBacking.LocalFile,
+        )
+
+    @property
+    def reslices_incrementally(self) -> bool:
+        return (
+            not self.holds_global_data
+            and self._comm.size > 1
+            and self._next_slicing_dim is not None
+            and self._next_slicing_dim != self._slicing_dim
+        )
+
+    @property
+    def redistributes_blocks(self) -> bool:
+        """Whether blocks are sent to other processes as they are written"""
+        return self.reslices_incrementally or (
+            self._dynamic_chunks and not self.holds_global_data and self._comm.size > 1
+        )
 
     @property
     def comm(self) -> MPI.Comm:
         return self._comm
 
+    @property
+    def active_procs(self) -> int:
+        """Number of processes (the first ones of `comm`) holding the written data"""
+        return self._active_procs
+
     # ??? do we need these properties?
     @property
     def global_shape(self) -> Tuple[int, int, int]:
@@ -119,6 +242,9 @@ class DataSetStoreWriter(ReadableDataSetSink):
             raise ValueError("Cannot write after creating a reader")
         block.to_cpu()
         start = max(block.chunk_index_unpadded)
+        self._max_block_size = max(
+            self._max_block_size, int(np.prod(block.shape_unpadded))
+        )
         if self._data is None:
             # if non-slice dims in block are different, update the shapes here
             self._global_shape = block.global_shape
@@ -128,8 +254,18 @@ class DataSetStoreWriter(ReadableDataSetSink):
                 block.global_index_unpadded[1] - block.chunk_index_unpadded[1],
                 block.global_index_unpadded[2] - block.chunk_index_unpadded[2],
             )
+            if self._dynamic_chunks:
+                self._chunk_shape, self._global_index = self._static_chunk(
+                    block.global_shape
+                )
             self._aux_data = block.aux_data
-            self._create_new_data(block)
+            self._create_new_data(block.data.dtype)
+        elif self._dynamic_chunks:
+            assert self._global_shape is not None
+            if any(self._global_shape[i] != block.global_shape[i] for i in range(3)):
+                raise ValueError(
+                    "Attempt to write a block with inconsistent shape to existing data"
+                )
         else:
             assert self._global_shape is not None
             assert self._chunk_shape is not None
@@ -155,33 +291,117 @@ class DataSetStoreWriter(ReadableDataSetSink):
                     "Attempt to write a block with inconsistent shape to existing data"
                 )
 
+        if self._reslicer is not None:
+            self._reslicer.send_block(
+                block.data_unpadded,
+                block.global_index_unpadded[self._slicing_dim],
+            )
+            # the pieces not received yet are held in send buffers, which are bounded
+            # like the buffers of reslicing in rounds (or by the store's memory budget)
+            self._reslicer.throttle(
+                max_pending_sends=4 * 2 * self._comm.size,
+                max_pending_bytes=httomo.globals.RESLICE_BUFFER_BYTES
+                or self._ram_budget_bytes,
+            )
+            return
+
         # insert the slice here
         assert self._data is not None  # after the above methods, this must be set
         start_idx = [0, 0, 0]
         start_idx[self._slicing_dim] = start
-        if self.is_file_based:
-            start_idx[self._slicing_dim] += self._global_index[self._slicing_dim]
+        if self.holds_global_data:
+            start_idx[self._slicing_dim] = block.global_index_unpadded[
+                self._slicing_dim
+            ]
         self._data[
             start_idx[0] : start_idx[0] + block.shape_unpadded[0],
             start_idx[1] : start_idx[1] + block.shape_unpadded[1],
             start_idx[2] : start_idx[2] + block.shape_unpadded[2],
         ] = block.data_unpadded
 
-    def _get_global_h5_filename(self) -> PathLike:
+    def _get_global_h5_filename(self, comm: MPI.Comm) -> PathLike:
         """Creates a temporary h5 file to back the storage (using nanoseconds timestamp
         for uniqueness).
         """
-        filename = str(Path(self._temppath) / f"httom_tmpstore_{time.time_ns()}.hdf5")
-        filename = self.comm.bcast(filename, root=0)
-
-        self._h5filename = Path(filename)
+        self._h5filename = self._make_global_filename(comm, "hdf5")
         return self._h5filename
 
-    def _create_new_data(self, block: DataSetBlock):
-        if self._store_backing is DataSetStoreBacking.RAM:
+    def _get_global_mmap_filename(self, comm: MPI.Comm) -> PathLike:
+        """Creates a temporary raw file to memory-map for the storage"""
+        self._mmap_filename = self._make_global_filename(comm, "raw")
+        return self._mmap_filename
+
+    def _make_global_filename(self, comm: MPI.Comm, suffix: str) -> Path:
+        # using nanoseconds timestamp for uniqueness
+        filename = str(
+            Path(self._temppath) / f"httom_tmpstore_{time.time_ns()}.{suffix}"
+        )
+        return Path(comm.bcast(filename, root=0))
+
+    def _static_chunk(
+        self, global_shape: Tuple[int, int, int]
+    ) -> Tuple[Tuple[int, int, int], Tuple[int, int, int]]:
+        """Shape and global index of this process' chunk, with the global data split
+        evenly across the processes in the slicing dimension"""
+        length = global_shape[self._slicing_dim]
+        start = round((length / self._comm.size) * self._comm.rank)
+        stop = round((length / self._comm.size) * (self._comm.rank + 1))
+        chunk_shape = list(global_shape)
+        chunk_shape[self._slicing_dim] = stop - start
+        global_index = [0, 0, 0]
+        global_index[self._slicing_dim] = start
+        return (
+            make_3d_shape_from_shape(chunk_shape),
+            make_3d_shape_from_shape(global_index),
+        )
+
+    def _create_new_data(self, dtype: DTypeLike):
+        if self.is_compressed:
+            log_once(
+                "Chunk does not fit in memory - compressing it in memory",
+                level=logging.WARNING,
+            )
+        if self.redistributes_blocks:
+            assert self._reslice_comm is not None
+            # without reslicing, the blocks are redistributed in the same dimension
+            next_slicing_dim = (
+                self._next_slicing_dim
+                if self.reslices_incrementally
+                else self._slicing_dim
+            )
+            assert next_slicing_dim is not None
+            self._reslicer = IncrementalReslicer(
+                self._reslice_comm,
+                self._slicing_dim,
+                next_slicing_dim,
+                self.global_shape,
+                np.dtype(dtype),
+                allocate=lambda shape, global_index, dtype: self._create_local_data(
+                    shape, global_index, dtype, next_slicing_dim
+                ),
+            )
+            # the resliced chunk is stored instead of this process' chunk
+            self._data = self._reslicer.data
+        elif self._store_backing is DataSetStoreBacking.RAM:
             self._data = self._create_numpy_data(
-                unpadded_chunk_shape=block.chunk_shape_unpadded,
-                dtype=block.data.dtype,
+                unpadded_chunk_shape=self.chunk_shape,
+                dtype=dtype,
+            )
+        elif self.is_compressed or self.is_spilled:
+            self._data = self._create_local_data(
+                self.chunk_shape, self.global_index, dtype, self._slicing_dim
+            )
+        elif self._store_backing is DataSetStoreBacking.Mmap:
+            log_once(
+                "Chunk does not fit in memory - using a memory-mapped file store",
+                level=logging.WARNING,
+            )
+            file_comm = self.comm if self._active_comm is None else self._active_comm
+            self._data = self._create_mmap_data(
+                self.global_shape,
+                dtype,
+                self._get_global_mmap_filename(file_comm),
+                file_comm,
             )
         else:
             log_once(
@@ -189,12 +409,14 @@ class DataSetStoreWriter(ReadableDataSetSink):
                 level=logging.WARNING,
             )
             # we create a full file dataset, i.e. file-based,
-            # with the full global shape in it
+            # with the full global shape in it - only the processes writing blocks
+            # take part in creating it
+            file_comm = self.comm if self._active_comm is None else self._active_comm
             self._data = self._create_h5_data(
                 self.global_shape,
-                block.data.dtype,
-                self._get_global_h5_filename(),
-                self.comm,
+                dtype,
+                self._get_global_h5_filename(file_comm),
+                file_comm,
             )
 
     def _create_numpy_data(
@@ -203,6 +425,43 @@ class DataSetStoreWriter(ReadableDataSetSink):
         """Convenience method to enable mocking easily"""
         return np.empty(unpadded_chunk_shape, dtype)
 
+    def _create_local_data(
+        self,
+        chunk_shape: Tuple[int, int, int],
+        global_index: Tuple[int, int, int],
+        dtype: DTypeLike,
+        slicing_dim: int,
+    ) -> Union[np.ndarray, CompressedChunk, SpilledChunk]:
+        """Creates the data of a chunk held by this process only, sliced in
+        `slicing_dim`, for the backings that don't share a file across processes.
+
+        Compressed chunks have tiles shaped like the chunks of a file-based store, and
+        spilled chunks spill slices along `slicing_dim` to a file in the temporary
+        directory."""
+        if self.is_compressed:
+            return CompressedChunk(
+                chunk_shape,
+                dtype,
+                self._file_chunks(self.global_shape, dtype),
+                origin=global_index,
+            )
+        if self.is_spilled:
+            ram_budget_bytes = (
+                0
+                if self._store_backing is DataSetStoreBacking.LocalFile
+                else self._ram_budget_bytes
+            )
+            data = SpilledChunk(
+                chunk_shape, dtype, slicing_dim, ram_budget_bytes, self._temppath
+            )
+            if data.spilled_nbytes > 0:
+                log_once(
+                    "Chunk does not fit in memory - spilling the rest to a file",
+                    level=logging.WARNING,
+                )
+            return data
+        return self._create_numpy_data(chunk_shape, dtype)
+
     def _create_h5_data(
         self,
         global_shape: Tuple[int, int, int],
@@ -216,36 +475,301 @@ class DataSetStoreWriter(ReadableDataSetSink):
 
         self._h5file = h5py.File(file, "w", driver="mpio", comm=comm)
 
-        # set how data should be chunked when saving
-        # chunks = list(global_shape)
-        # chunks[slicing_dim] = 1
-        # TODO: best first measure performance impact
-        # probably good chunk is (4, 4, <detector_x>)
-        h5data = self._h5file.create_dataset("data", global_shape, dtype)
+        # chunked, so that blocks can be read efficiently in the next slicing dimension
+        h5data = self._h5file.create_dataset(
+            "data", global_shape, dtype, chunks=self._file_chunks(global_shape, dtype)
+        )
 
         return h5data
 
+    def _file_chunks(
+        self, global_shape: Tuple[int, int, int], dtype: DTypeLike
+    ) -> Optional[Tuple[int, int, int]]:
+        return calculate_store_chunks(
+            global_shape,
+            np.dtype(dtype).itemsize,
+            self._slicing_dim,
+            self._read_slicing_dim,
+        )
+
+    def share_chunk_layout(self):
+        """Makes the processes outside of `active_comm`, which haven't written any blocks,
+        take over the global shape, auxiliary data and backing file of the processes that
+        have. They hold an empty chunk at the end of the data.
+
+        This is collective across `comm`, and does nothing if the writer has been created
+        without an `active_comm`."""
+        if self._layout_shared:
+            return
+        self._layout_shared = True
+        layout = None
+        if self._comm.rank == 0:
+            assert self._active_comm is not None
+            if self._data is None:
+                raise ValueError(
+                    "Cannot share the layout when no data has been written"
+                )
+            layout = (
+                self._global_shape,
+                self._data.dtype,
+                self._aux_data,
+                self.filename,
+                self._active_comm.size,
+            )
+        global_shape, dtype, aux_data, filename, active_procs = self._comm.bcast(
+            layout, root=0
+        )
+        self._active_procs = active_procs
+        if self._comm.rank < active_procs:
+            return
+
+        self._global_shape = global_shape
+        self._aux_data = aux_data
+        if self.is_mmap_based:
+            self._mmap_filename = filename
+        else:
+            self._h5filename = filename
+        chunk_shape = list(global_shape)
+        chunk_shape[self._slicing_dim] = 0
+        self._chunk_shape = make_3d_shape_from_shape(chunk_shape)
+        global_index = [0, 0, 0]
+        global_index[self._slicing_dim] = global_shape[self._slicing_dim]
+        self._global_index = make_3d_shape_from_shape(global_index)
+        if self.is_mmap_based:
+            # the file holds all of the data, as for the processes that wrote it
+            self._data = np.memmap(filename, dtype=dtype, mode="r", shape=global_shape)
+            return
+        self._data = self._create_local_data(
+            self._chunk_shape, self._global_index, dtype, self._slicing_dim
+        )
+
+    def _join_redistribution(self):
+        """Makes the processes that haven't written any blocks to a store redistributing
+        them (e.g. when there were fewer blocks to hand out dynamically than processes)
+        take over the global shape, dtype and auxiliary data of the processes that have,
+        and create their chunk, so that they receive their part of the data as well.
+
+        This is collective across `comm`."""
+        if not self.redistributes_blocks:
+            return
+        has_data = self._comm.allgather(self._data is not None)
+        if all(has_data) or not any(has_data):
+            return
+        layout = None
+        root = has_data.index(True)
+        if self._comm.rank == root:
+            assert self._data is not None
+            layout = (self._global_shape, self._data.dtype, self._aux_data)
+        global_shape, dtype, aux_data = self._comm.bcast(layout, root=root)
+        if self._data is not None:
+            return
+
+        self._global_shape = global_shape
+        self._chunk_shape, self._global_index = self._static_chunk(global_shape)
+        self._aux_data = aux_data
+        self._create_new_data(dtype)
+
+    def _create_mmap_data(
+        self,
+        global_shape: Tuple[int, int, int],
+        dtype: DTypeLike,
+        file: PathLike,
+        comm: MPI.Comm,
+    ) -> np.memmap:
+        """Creates a raw file of the full global shape, memory-mapped by all processes,
+        which write their chunks into it at their global position"""
+        data: Optional[np.memmap] = None
+        if comm.rank == 0:
+            data = np.memmap(file, dtype=dtype, mode="w+", shape=global_shape)
+        comm.Barrier()
+        if data is None:
+            data = np.memmap(file, dtype=dtype, mode="r+", shape=global_shape)
+        return data
+
     def make_reader(
         self,
         new_slicing_dim: Optional[Literal[0, 1, 2]] = None,
         padding: Optional[Tuple[int, int]] = None,
+        active_comm: Optional[MPI.Comm] = None,
     ) -> DataSetSource:
         """Create a reader from this writer, reading from the same store.
         The optional parameter padding can be used if data should be returned with padding slices,
-        given as a tuple of (before, after)"""
+        given as a tuple of (before, after).
+
+        With `active_comm`, the data is read by the processes in it only (the first ones of
+        `comm`), and it is `MPI.COMM_NULL` on the others."""
+        if not self._layout_shared:
+            raise ValueError(
+                "Cannot make reader before the chunk layout has been shared"
+            )
+        self._join_redistribution()
         if self._data is None:
             raise ValueError("Cannot make reader when no data has been written yet")
         self._readonly = True
+        self._dtype = np.dtype(self._data.dtype)
         if self._h5file is not None:
             self._h5file.close()
             self._h5file = None
-        reader = DataSetStoreReader(self, new_slicing_dim, padding=padding)
+        if self._transposes_file(new_slicing_dim, active_comm):
+            assert new_slicing_dim is not None
+            self._transpose_file(new_slicing_dim)
+        if self.is_mmap_based:
+            # the chunks written by all processes have to be in the file before any of
+            # them maps it for reading
+            if isinstance(self._data, np.memmap):
+                self._data.flush()
+            self._comm.Barrier()
+        if isinstance(self._data, _LOCAL_CHUNK_TYPES):
+            self._data.flush()
+        reader = DataSetStoreReader(
+            self,
+            new_slicing_dim,
+            padding=padding,
+            active_comm=active_comm,
+            source_procs=self._active_procs,
+        )
         # make sure finalize is called when reader object is garbage-collected
         weakref.finalize(reader, weakref.WeakMethod(reader.finalize))
         return reader
 
+    def _transposes_file(
+        self,
+        new_slicing_dim: Optional[Literal[0, 1, 2]],
+        active_comm: Optional[MPI.Comm],
+    ) -> bool:
+        """Whether the file of a file-based store is rewritten for reading in
+        `new_slicing_dim` (see `_transpose_file`), i.e. when that dimension differs from
+        the one written, and blocks in it would read thin strips of the file's chunks.
+
+        The blocks read are assumed to be about as large as the largest one written."""
+        if not self.is_file_based or self._dtype is None:
+            return False
+        if new_slicing_dim is None or new_slicing_dim == self._slicing_dim:
+            return False
+        if active_comm is not None or self._active_procs != self._comm.size:
+            return False
+        global_shape = self.global_shape
+        slice_size = int(np.prod(global_shape)) // max(1, global_shape[new_slicing_dim])
+        max_block_size = self._comm.allreduce(self._max_block_size, MPI.MAX)
+        return is_orthogonal_read(
+            global_shape,
+            self._file_chunks(global_shape, self._dtype),
+            new_slicing_dim,
+            max_block_size // max(1, slice_size),
+        )
+
+    def _transpose_file(self, new_slicing_dim: Literal[0, 1, 2]):
+        """Rewrites the file of a file-based store into a new one, chunked for reading
+        in `new_slicing_dim` only, which becomes the slicing dimension of the store.
+
+        This is a collective two-phase transpose: every process reads its chunk from the
+        old file a slab at a time, the slabs are exchanged with the processes holding
+        the data in `new_slicing_dim` afterwards (see `alltoallw_regions`), and these
+        write them into the new file. The slabs are sized so that the buffers of a
+        process take about `httomo.globals.RESLICE_BUFFER_BYTES` (all of the chunk at
+        once if it is 0)."""
+        assert self._dtype is not None and self._h5filename is not None
+        old_dim = self._slicing_dim
+        global_shape = self.global_shape
+        dtype = self._dtype
+        comm = self._comm
+        old_chunks = self._file_chunks(global_shape, dtype)
+
+        log_once(
+            f"Transposing the file-based store for slicing dimension {new_slicing_dim}",
+            level=logging.DEBUG,
+        )
+        old_start = self.global_index[old_dim]
+        old_ranges = comm.allgather((old_start, old_start + self.chunk_shape[old_dim]))
+        new_length = global_shape[new_slicing_dim]
+        new_bounds = [round(new_length / comm.size * r) for r in range(comm.size + 1)]
+        new_start, new_stop = new_bounds[comm.rank], new_bounds[comm.rank + 1]
+
+        # a slab of the old chunk is sent, and about as much is received
+        slice_bytes = (
+            dtype.itemsize * int(np.prod(global_shape)) // max(1, global_shape[old_dim])
+        )
+        slab = global_shape[old_dim]
+        if httomo.globals.RESLICE_BUFFER_BYTES > 0:
+            slab = httomo.globals.RESLICE_BUFFER_BYTES // 2 // max(1, slice_bytes)
+            if old_chunks is not None:
+                # whole layers of the old file's chunks
+                slab = slab // old_chunks[old_dim] * old_chunks[old_dim]
+                slab = max(old_chunks[old_dim], slab)
+        slab = max(1, comm.allreduce(slab, MPI.MIN))
+        rounds = max(-(-(stop - start) // slab) for start, stop in old_ranges)
+
+        cache_bytes, cache_slots = calculate_chunk_cache(
+            global_shape, old_chunks, dtype.itemsize, old_dim
+        )
+        old_file = h5py.File(
+            self._h5filename, "r", rdcc_nbytes=cache_bytes, rdcc_nslots=cache_slots
+        )
+        old_data = old_file["data"]
+        old_filename = self._h5filename
+        self._slicing_dim = new_slicing_dim
+        self._read_slicing_dim = new_slicing_dim
+        self._h5file = h5py.File(
+            self._get_global_h5_filename(comm), "w", driver="mpio", comm=comm
+        )
+        new_data = self._h5file.create_dataset(
+            "data",
+            global_shape,
+            dtype,
+            chunks=calculate_store_chunks(
+                global_shape, dtype.itemsize, new_slicing_dim, new_slicing_dim
+            ),
+        )
+
+        for i in range(rounds):
+            # the slab of each process' old chunk in this round
+            pieces = [
+                (min(start + i * slab, stop), min(start + (i + 1) * slab, stop))
+                for start, stop in old_ranges
+            ]
+            piece_start, piece_stop = pieces[comm.rank]
+            read_slices = [slice(None), slice(None), slice(None)]
+            read_slices[old_dim] = slice(piece_start, piece_stop)
+            send = np.ascontiguousarray(old_data[tuple(read_slices)])
+            send_regions = []
+            for r in range(comm.size):
+                region = [slice(None), slice(None), slice(None)]
+                region[new_slicing_dim] = slice(new_bounds[r], new_bounds[r + 1])
+                send_regions.append(tuple(region))
+
+            recv_shape = list(global_shape)
+            recv_shape[old_dim] = sum(stop - start for start, stop in pieces)
+            recv_shape[new_slicing_dim] = new_stop - new_start
+            recv = np.empty(recv_shape, dtype)
+            recv_offsets = [0, *np.cumsum([stop - start for start, stop in pieces])]
+            recv_regions = []
+            for r in range(comm.size):
+                region = [slice(None), slice(None), slice(None)]
+                region[old_dim] = slice(recv_offsets[r], recv_offsets[r + 1])
+                recv_regions.append(tuple(region))
+
+            alltoallw_regions(send, send_regions, recv, recv_regions, comm)
+
+            for (start, stop), region in zip(pieces, recv_regions):
+                if stop == start or new_stop == new_start:
+                    continue
+                write_slices = [slice(None), slice(None), slice(None)]
+                write_slices[old_dim] = slice(start, stop)
+                write_slices[new_slicing_dim] = slice(new_start, new_stop)
+                new_data[tuple(write_slices)] = recv[region]
+
+        self._data = new_data
+        self._h5file.close()
+        self._h5file = None
+        old_file.close()
+        comm.Barrier()
+        if comm.rank == 0:
+            old_filename.unlink()
+        self._chunk_shape, self._global_index = self._static_chunk(global_shape)
+
     def finalize(self):
         self._data = None
+        self._reslicer = None
         if self._h5file is not None:
             self._h5file.close()
             self._h5file = None
@@ -254,6 +778,13 @@ class DataSetStoreWriter(ReadableDataSetSink):
 class DataSetStoreReader(DataSetSource):
     """Class to read from a store that has previously been written by DataSetStoreWriter,
     in a block-wise fashion.
+
+    If the data is to be read by a different number of processes (see `active_comm`)
+    than the `source_procs` that wrote it (all of `comm` by default), it is
+    redistributed when the reader is created.
+
+    Compressed and spilled chunks are resliced a slab at a time, and their padding areas
+    are kept separately, so that they never have to be held in memory as a whole.
     """
 
     def __init__(
@@ -261,8 +792,19 @@ class DataSetStoreReader(DataSetSource):
         source: DataSetStoreWriter,
         slicing_dim: Optional[Literal[0, 1, 2]] = None,
         padding: Optional[Tuple[int, int]] = None,
+        active_comm: Optional[MPI.Comm] = None,
+        source_procs: Optional[int] = None,
     ):
         self._comm = source.comm
+        # the processes holding the chunks of the data, which exchange padding areas
+        self._neighbour_comm = self._comm if active_comm is None else active_comm
+        active_procs = self._comm.size
+        if source_procs is None:
+            source_procs = active_procs
+        if active_comm is not None:
+            active_procs = self._comm.allreduce(
+                0 if active_comm == MPI.COMM_NULL else 1
+            )
         self._global_shape = source.global_shape
         self._global_index = source.global_index
         self._chunk_shape = source.chunk_shape
@@ -274,20 +816,76 @@ class DataSetStoreReader(DataSetSource):
 
         self._h5file: Optional[h5py.File] = None
         self._h5filename: Optional[Path] = None
+        self._mmap_filename: Optional[Path] = None
+        self._mmap_file: Optional[BinaryIO] = None
+        # padding areas of compressed and spilled chunks, kept outside of the chunk
+        self._padding_before: Optional[np.ndarray] = None
+        self._padding_after: Optional[np.ndarray] = None
         source_data = source._data
         if source.is_file_based:
             self._h5filename = source.filename
-            self._h5file = h5py.File(source.filename, "r")
+            read_slicing_dim = (
+                source.slicing_dim if slicing_dim is None else slicing_dim
+            )
+            # the writer's file is closed already, so the layout is taken from the file
+            with h5py.File(source.filename, "r") as f:
+                file_chunks = f["data"].chunks
+                itemsize = f["data"].dtype.itemsize
+            cache_bytes, cache_slots = calculate_chunk_cache(
+                self._global_shape, file_chunks, itemsize, read_slicing_dim
+            )
+            self._h5file = h5py.File(
+                source.filename, "r", rdcc_nbytes=cache_bytes, rdcc_nslots=cache_slots
+            )
             source_data = self._h5file["data"]
+        elif isinstance(source._data, np.memmap):
+            assert source.filename is not None
+            self._mmap_filename = source.filename
+            # the blocks are views into maps of their own (see `_read_block_mmap`), all
+            # made from the file opened here - so every process has to have opened it
+            # before rank 0 may unlink it in `finalize`
+            self._mmap_file = open(source.filename, "rb")
+            self._comm.Barrier()
+            source_data = np.memmap(
+                self._mmap_file,
+                dtype=source._data.dtype,
+                mode="r",
+                shape=self._global_shape,
+            )
 
-        if slicing_dim is None or slicing_dim == source.slicing_dim:
+        if source._reslicer is not None:
+            if slicing_dim is None:
+                slicing_dim = source.slicing_dim
+            if slicing_dim != source._reslicer.next_slice_dim:
+                raise ValueError(
+                    "Store has been resliced incrementally to slicing dimension "
+                    f"{source._reslicer.next_slice_dim}, cannot read in dimension {slicing_dim}"
+                )
+            self._data = source._reslicer.finish()
+            self._chunk_shape = source._reslicer.chunk_shape
+            self._global_index = source._reslicer.global_index
+            self._slicing_dim = slicing_dim
+        elif active_procs != source_procs or active_procs != self._comm.size:
+            if slicing_dim is None:
+                slicing_dim = source.slicing_dim
+            self._data = self._redistribute(
+                source.slicing_dim, slicing_dim, source_data, active_procs
+            )
+            self._slicing_dim = slicing_dim
+        elif slicing_dim is None or slicing_dim == source.slicing_dim:
             self._slicing_dim = source.slicing_dim
             self._data = source_data
         else:
             self._data = self._reslice(source.slicing_dim, slicing_dim, source_data)
             self._slicing_dim = slicing_dim
 
+        if isinstance(self._data, _LOCAL_CHUNK_TYPES):
+            # e.g. the tiles of pieces received last may not have been compressed yet
+            self._data.flush()
+
         self._padding = (0, 0) if padding is None else padding
+        # the padded areas shared by consecutive blocks read from files are read once
+        self._halo = Halo(self._slicing_dim, self._padding[0] + self._padding[1])
         if self._padding != (0, 0):
             # correct indices for padding
             global_index_t = list(self._global_index)
@@ -298,8 +896,12 @@ class DataSetStoreReader(DataSetSource):
             chunk_shape_t[self.slicing_dim] += self._padding[0] + self._padding[1]
             self._chunk_shape = make_3d_shape_from_shape(chunk_shape_t)
 
-            if not source.is_file_based:
-                self._exchange_neighbourhoods()
+            holds_global_data = self.is_file_based or self.is_mmap_based
+            if not holds_global_data and self._neighbour_comm != MPI.COMM_NULL:
+                if isinstance(self._data, _LOCAL_CHUNK_TYPES):
+                    self._exchange_separate_neighbourhoods()
+                else:
+                    self._exchange_neighbourhoods()
 
         source.finalize()
 
@@ -315,9 +917,17 @@ class DataSetStoreReader(DataSetSource):
     def is_file_based(self) -> bool:
         return self._h5filename is not None
 
+    @property
+    def is_mmap_based(self) -> bool:
+        return self._mmap_filename is not None
+
+    @property
+    def is_compressed(self) -> bool:
+        return isinstance(self._data, CompressedChunk)
+
     @property
     def filename(self) -> Optional[Path]:
-        return self._h5filename
+        return self._mmap_filename if self.is_mmap_based else self._h5filename
 
     @property
     def global_shape(self) -> Tuple[int, int, int]:
@@ -348,10 +958,20 @@ class DataSetStoreReader(DataSetSource):
             return data
         else:
             assert self._comm.size > 1
-            if isinstance(data, np.ndarray):  # in-memory chunks
+            if isinstance(data, _LOCAL_CHUNK_TYPES):
+                return self._reslice_in_slabs(
+                    old_slicing_dim, new_slicing_dim, data, self._comm.size
+                )
+            if not (self.is_file_based or self.is_mmap_based):  # in-memory chunks
                 # we only see a chunk, so we need to do MPI-based reslicing
                 array, newdim, startidx = reslice(
-                    data, old_slicing_dim + 1, new_slicing_dim + 1, self._comm
+                    data,
+                    old_slicing_dim + 1,
+                    new_slicing_dim + 1,
+                    self._comm,
+                    max_buffer_bytes=httomo.globals.RESLICE_BUFFER_BYTES or None,
+                    hierarchical=httomo.globals.RESLICE_HIERARCHICAL,
+                    compress=httomo.globals.RESLICE_COMPRESSION,
                 )
                 self._chunk_shape = array.shape  #  type: ignore
                 assert newdim == new_slicing_dim + 1
@@ -362,19 +982,104 @@ class DataSetStoreReader(DataSetSource):
             else:
                 # we have a full, file-based dataset - all we have to do
                 # is calculate the new chunk shape and start index
-                rank = self._comm.rank
-                nproc = self._comm.size
-                length = self._global_shape[new_slicing_dim]
-                startidx = round((length / nproc) * rank)
-                stopidx = round((length / nproc) * (rank + 1))
-                chunk_shape = list(self._global_shape)
-                chunk_shape[new_slicing_dim] = stopidx - startidx
-                self._chunk_shape = make_3d_shape_from_shape(chunk_shape)
-                idx = [0, 0, 0]
-                idx[new_slicing_dim] = startidx
-                self._global_index = (idx[0], idx[1], idx[2])
+                self._set_static_chunk(new_slicing_dim, self._comm.size)
                 return data
 
+    def _redistribute(
+        self,
+        old_slicing_dim: Literal[0, 1, 2],
+        new_slicing_dim: Literal[0, 1, 2],
+        data: Union[np.ndarray, h5py.Dataset],
+        active_procs: int,
+    ) -> Union[np.ndarray, h5py.Dataset]:
+        """Splits the data across the first `active_procs` processes in the new slicing
+        dimension, leaving the others with an empty chunk at the end of the data"""
+        if self.is_file_based or self.is_mmap_based:
+            # file-based datasets hold the full data already
+            self._set_static_chunk(new_slicing_dim, active_procs)
+            return data
+        if isinstance(data, _LOCAL_CHUNK_TYPES):
+            return self._reslice_in_slabs(
+                old_slicing_dim, new_slicing_dim, data, active_procs
+            )
+
+        # the whole chunk is sent as a single block, so that the pieces go to the
+        # processes holding them afterwards
+        reslicer = IncrementalReslicer(
+            self._comm.Dup(),
+            old_slicing_dim,
+            new_slicing_dim,
+            self._global_shape,
+            data.dtype,
+            active_procs=active_procs,
+        )
+        reslicer.send_block(data, self._global_index[old_slicing_dim])
+        new_data = reslicer.finish()
+        self._chunk_shape = reslicer.chunk_shape
+        self._global_index = reslicer.global_index
+        return new_data
+
+    def _reslice_in_slabs(
+        self,
+        old_slicing_dim: Literal[0, 1, 2],
+        new_slicing_dim: Literal[0, 1, 2],
+        data: Union[CompressedChunk, SpilledChunk],
+        active_procs: int,
+    ) -> Union[CompressedChunk, SpilledChunk]:
+        """Reslices (or redistributes) a compressed or spilled chunk across the first
+        `active_procs` processes, one slab at a time. The received pieces are put into a
+        new chunk of the same kind as they arrive, so only a few slabs are ever held in
+        memory as plain arrays."""
+        reslicer = IncrementalReslicer(
+            self._comm.Dup(),
+            old_slicing_dim,
+            new_slicing_dim,
+            self._global_shape,
+            data.dtype,
+            active_procs=active_procs,
+            allocate=lambda shape, global_index, dtype: data.like(
+                shape, global_index, new_slicing_dim
+            ),
+        )
+        slab_length = data.slab_length(old_slicing_dim)
+        chunk_start = self._global_index[old_slicing_dim]
+        length = data.shape[old_slicing_dim]
+        start = 0
+        while start < length:
+            # slabs end on global multiples of their length, so that they fill whole
+            # tiles of compressed chunks
+            slab_stop = ((chunk_start + start) // slab_length + 1) * slab_length
+            stop = min(length, slab_stop - chunk_start)
+            slab_slices = [slice(None), slice(None), slice(None)]
+            slab_slices[old_slicing_dim] = slice(start, stop)
+            reslicer.send_block(
+                data[slab_slices[0], slab_slices[1], slab_slices[2]],
+                chunk_start + start,
+            )
+            # at most a few slabs in flight (with a header and a piece for each process)
+            reslicer.throttle(max_pending_sends=4 * 2 * self._comm.size)
+            start = stop
+        new_data = reslicer.finish()
+        new_data.flush()
+        data.close()
+        self._chunk_shape = reslicer.chunk_shape
+        self._global_index = reslicer.global_index
+        return new_data
+
+    def _set_static_chunk(self, slicing_dim: Literal[0, 1, 2], nprocs: int):
+        """Sets the chunk shape and start index of this process, with the data split evenly
+        across the first `nprocs` processes in the given slicing dimension"""
+        length = self._global_shape[slicing_dim]
+        rank = self._comm.rank
+        startidx = round((length / nprocs) * rank) if rank < nprocs else length
+        stopidx = round((length / nprocs) * (rank + 1)) if rank < nprocs else length
+        chunk_shape = list(self._global_shape)
+        chunk_shape[slicing_dim] = stopidx - startidx
+        self._chunk_shape = make_3d_shape_from_shape(chunk_shape)
+        idx = [0, 0, 0]
+        idx[slicing_dim] = startidx
+        self._global_index = (idx[0], idx[1], idx[2])
+
     def _read_block_file(
         self, shape: List[int], dim: int, start_idx: List[int]
     ) -> np.ndarray:
@@ -395,19 +1100,40 @@ class DataSetStoreReader(DataSetSource):
                 dim,
             )
             after_cut = start_idx[dim] + shape[dim] - self._data.shape[dim]
+        # the slices already read for the previous block are taken from the halo
+        read_start = start_idx[dim] + before_cut
+        read_stop = start_idx[dim] + shape[dim] - after_cut
+        halo_stop = self._halo.fill(block_data, start_idx[dim], read_start, read_stop)
         slices_read = [slice(None), slice(None), slice(None)]
-        slices_read[dim] = slice(
-            start_idx[dim] + before_cut, start_idx[dim] + shape[dim] - after_cut
-        )
+        slices_read[dim] = slice(halo_stop, read_stop)
         slices_wrt = [slice(None), slice(None), slice(None)]
-        slices_wrt[dim] = slice(before_cut, shape[dim] - after_cut)
-        block_data[slices_wrt[0], slices_wrt[1], slices_wrt[2]] = self._data[
-            slices_read[0],
-            slices_read[1],
-            slices_read[2],
-        ]
+        slices_wrt[dim] = slice(halo_stop - start_idx[dim], shape[dim] - after_cut)
+        read_into_block(self._data, block_data, tuple(slices_read), tuple(slices_wrt))
+        self._halo.keep(block_data, start_idx[dim], read_start, read_stop)
         return block_data
 
+    def _read_block_mmap(
+        self, shape: List[int], dim: int, start_idx: List[int]
+    ) -> np.ndarray:
+        """Returns a view into a new copy-on-write map of the file, unless the block's
+        padding extends beyond the data and has to be extrapolated. Each block has a map
+        of its own, so that methods modifying a block in-place change neither the file
+        nor the slices read again later (e.g. the padding shared with the next block).
+        """
+        global_start = start_idx[dim] + self._global_index[dim]
+        if global_start < 0 or global_start + shape[dim] > self._data.shape[dim]:
+            return self._read_block_file(shape, dim, start_idx)
+        assert self._mmap_file is not None
+        block_map = np.memmap(
+            self._mmap_file,
+            dtype=self._data.dtype,
+            mode="c",
+            shape=self._data.shape,
+        )
+        read_slices = [slice(None), slice(None), slice(None)]
+        read_slices[dim] = slice(global_start, global_start + shape[dim])
+        return block_map[read_slices[0], read_slices[1], read_slices[2]]
+
     def _mpi_exchange_padding_area_before(self):
         if self._padding[0] == 0:
             return
@@ -415,7 +1141,7 @@ class DataSetStoreReader(DataSetSource):
         mpi_dtype = dtlib.from_numpy_dtype(self._data.dtype)
 
         # sender code to right neighbour
-        if self._comm.rank < self._comm.size - 1:
+        if self._neighbour_comm.rank < self._neighbour_comm.size - 1:
             send_slices = [slice(None), slice(None), slice(None)]
             send_slices[self._slicing_dim] = slice(
                 self._data.shape[self._slicing_dim]
@@ -426,22 +1152,22 @@ class DataSetStoreReader(DataSetSource):
             to_send_right_neighbour = np.ascontiguousarray(
                 self._data[send_slices[0], send_slices[1], send_slices[2]]
             )
-            self._comm.Send(
+            self._neighbour_comm.Send(
                 [to_send_right_neighbour, mpi_dtype],
-                dest=self._comm.rank + 1,
+                dest=self._neighbour_comm.rank + 1,
                 tag=MPI_TAG,
             )
 
         # receiver code from right neighbour
-        if self._comm.rank > 0:
+        if self._neighbour_comm.rank > 0:
             recv_shape = list(self._data.shape)
             recv_shape[self._slicing_dim] = self._padding[0]
             receive_buf_from_left_neighbour = np.empty(
                 tuple(recv_shape), self._data.dtype
             )
-            self._comm.Recv(
+            self._neighbour_comm.Recv(
                 [receive_buf_from_left_neighbour, mpi_dtype],
-                source=self._comm.rank - 1,
+                source=self._neighbour_comm.rank - 1,
                 tag=MPI_TAG,
             )
             pad_slices = [slice(None), slice(None), slice(None)]
@@ -458,7 +1184,7 @@ class DataSetStoreReader(DataSetSource):
         mpi_dtype = dtlib.from_numpy_dtype(self._data.dtype)
 
         # sender code to left neighbour
-        if self._comm.rank > 0:
+        if self._neighbour_comm.rank > 0:
             send_slices = [slice(None), slice(None), slice(None)]
             send_slices[self._slicing_dim] = slice(
                 self._padding[0], self._padding[0] + self._padding[1]
@@ -466,22 +1192,22 @@ class DataSetStoreReader(DataSetSource):
             to_send_left_neighbour = np.ascontiguousarray(
                 self._data[send_slices[0], send_slices[1], send_slices[2]]
             )
-            self._comm.Send(
+            self._neighbour_comm.Send(
                 [to_send_left_neighbour, mpi_dtype],
-                dest=self._comm.rank - 1,
+                dest=self._neighbour_comm.rank - 1,
                 tag=MPI_TAG,
             )
 
         # receiver code from right neighbour
-        if self._comm.rank < self._comm.size - 1:
+        if self._neighbour_comm.rank < self._neighbour_comm.size - 1:
             recv_shape = list(self._data.shape)
             recv_shape[self._slicing_dim] = self._padding[1]
             receive_buf_from_right_neighbour = np.empty(
                 tuple(recv_shape), dtype=self._data.dtype
             )
-            self._comm.Recv(
+            self._neighbour_comm.Recv(
                 [receive_buf_from_right_neighbour, mpi_dtype],
-                source=self._comm.rank + 1,
+                source=self._neighbour_comm.rank + 1,
                 tag=MPI_TAG,
             )
             pad_slices = [slice(None), slice(None), slice(None)]
@@ -510,7 +1236,7 @@ class DataSetStoreReader(DataSetSource):
 
         # before
         self._mpi_exchange_padding_area_before()
-        if self._comm.rank == 0:
+        if self._neighbour_comm.rank == 0:
             extrapolate_before(
                 self._data,
                 self._data,
@@ -521,7 +1247,7 @@ class DataSetStoreReader(DataSetSource):
 
         # after
         self._mpi_exchange_padding_area_after()
-        if self._comm.rank == self._comm.size - 1:
+        if self._neighbour_comm.rank == self._neighbour_comm.size - 1:
             extrapolate_after(
                 self._data,
                 self._data,
@@ -530,6 +1256,90 @@ class DataSetStoreReader(DataSetSource):
                 offset=self._padding[1],
             )
 
+    def _exchange_separate_neighbourhoods(self):
+        """Gets the padding areas of a compressed or spilled chunk from the neighbouring
+        processes (or extrapolates them at the ends of the data). They are kept in
+        separate arrays rather than extending the chunk."""
+        assert isinstance(self._data, _LOCAL_CHUNK_TYPES)
+        dim = self._slicing_dim
+        comm = self._neighbour_comm
+        mpi_dtype = dtlib.from_numpy_dtype(self._data.dtype)
+        length = self._data.shape[dim]
+
+        def core_slab(start: int, stop: int) -> np.ndarray:
+            slices = [slice(None), slice(None), slice(None)]
+            slices[dim] = slice(start, stop)
+            return self._data[slices[0], slices[1], slices[2]]
+
+        def padding_area(slices: int) -> np.ndarray:
+            shape = list(self._data.shape)
+            shape[dim] = slices
+            return np.empty(shape, self._data.dtype)
+
+        self._padding_before = padding_area(self._padding[0])
+        self._padding_after = padding_area(self._padding[1])
+        requests = []
+        if self._padding[0] > 0 and comm.rank < comm.size - 1:
+            to_send_right_neighbour = core_slab(length - self._padding[0], length)
+            requests.append(
+                comm.Isend(
+                    [to_send_right_neighbour, mpi_dtype], dest=comm.rank + 1, tag=33
+                )
+            )
+        if self._padding[1] > 0 and comm.rank > 0:
+            to_send_left_neighbour = core_slab(0, self._padding[1])
+            requests.append(
+                comm.Isend(
+                    [to_send_left_neighbour, mpi_dtype], dest=comm.rank - 1, tag=44
+                )
+            )
+
+        if comm.rank > 0:
+            if self._padding[0] > 0:
+                comm.Recv(
+                    [self._padding_before, mpi_dtype], source=comm.rank - 1, tag=33
+                )
+        else:
+            extrapolate_before(self._data, self._padding_before, self._padding[0], dim)
+        if comm.rank < comm.size - 1:
+            if self._padding[1] > 0:
+                comm.Recv(
+                    [self._padding_after, mpi_dtype], source=comm.rank + 1, tag=44
+                )
+        else:
+            extrapolate_after(self._data, self._padding_after, self._padding[1], dim)
+        MPI.Request.Waitall(requests)
+
+    def _read_block_assembled(
+        self, shape: List[int], dim: int, start_idx: List[int]
+    ) -> np.ndarray:
+        """Assembles the block from the padding areas and the part of the compressed or
+        spilled chunk it overlaps"""
+        block_data = np.empty(shape, dtype=self._data.dtype)
+        # in the coordinates of the chunk without padding
+        begin = start_idx[dim] - self._padding[0]
+        end = begin + shape[dim]
+        parts = [(self._data, 0)]
+        if self._padding_before is not None and self._padding_after is not None:
+            parts = [
+                (self._padding_before, -self._padding[0]),
+                (self._data, 0),
+                (self._padding_after, self._data.shape[dim]),
+            ]
+        for part, part_start in parts:
+            lo = max(begin, part_start)
+            hi = min(end, part_start + part.shape[dim])
+            if lo >= hi:
+                continue
+            slices_read = [slice(None), slice(None), slice(None)]
+            slices_read[dim] = slice(lo - part_start, hi - part_start)
+            slices_wrt = [slice(None), slice(None), slice(None)]
+            slices_wrt[dim] = slice(lo - begin, hi - begin)
+            block_data[slices_wrt[0], slices_wrt[1], slices_wrt[2]] = part[
+                slices_read[0], slices_read[1], slices_read[2]
+            ]
+        return block_data
+
     def _read_block_ram(
         self, shape: List[int], dim: int, start_idx: List[int]
     ) -> np.ndarray:
@@ -549,6 +1359,10 @@ class DataSetStoreReader(DataSetSource):
         start_idx[dim] = start
         if self.is_file_based:
             block_data = self._read_block_file(shape, dim, start_idx)
+        elif self.is_mmap_based:
+            block_data = self._read_block_mmap(shape, dim, start_idx)
+        elif isinstance(self._data, _LOCAL_CHUNK_TYPES):
+            block_data = self._read_block_assembled(shape, dim, start_idx)
         else:
             block_data = self._read_block_ram(shape, dim, start_idx)
 
@@ -564,7 +1378,11 @@ class DataSetStoreReader(DataSetSource):
         )
 
     def finalize(self):
+        if isinstance(self._data, _LOCAL_CHUNK_TYPES):
+            self._data.close()
         self._data = None
+        self._padding_before = None
+        self._padding_after = None
         if self._h5file is not None:
             self._h5file.close()
             self._h5file = None
@@ -572,3 +1390,10 @@ class DataSetStoreReader(DataSetSource):
         if self._h5filename is not None and self._comm.rank == 0:
             self._h5filename.unlink()
             self._h5filename = None
+        if self._mmap_file is not None:
+            # the maps of blocks still in use keep the data accessible
+            self._mmap_file.close()
+            self._mmap_file = None
+        if self._mmap_filename is not None and self._comm.rank == 0:
+            self._mmap_filename.unlink()
+            self._mmap_filename = None
@@ -1,8 +1,10 @@
+import math
 from os import PathLike
 from typing import Optional, Tuple
 
 import h5py as h5
 from mpi4py import MPI
+import numpy as np
 from numpy import ndarray
 
 
@@ -57,3 +59,82 @@ def get_data_shape(data: ndarray, dim: int, comm: MPI.Comm = MPI.COMM_WORLD) ->
         The shape of the given distributed dataset.
     """
     return get_data_shape_and_offset(data, dim, comm)[0]
+
+
+# target size of the chunks of temporary stores - large enough for efficient I/O, small
+# enough for blocks in either slicing dimension to read little more than they need
+_store_chunk_bytes = 1024**2
+# upper bound for the raw-chunk cache when reading temporary stores
+_max_chunk_cache_bytes = 256 * 1024**2
+
+
+def calculate_store_chunks(
+    global_shape: Tuple[int, int, int],
+    itemsize: int,
+    write_slicing_dim: int,
+    read_slicing_dim: int,
+) -> Tuple[int, int, int]:
+    """Chooses the chunk shape of a dataset that is written in blocks along
+    `write_slicing_dim` and read back in blocks along `read_slicing_dim`.
+
+    Both slicing dimensions get the same small extent, while the remaining dimension
+    is kept whole, so that chunks are about `_store_chunk_bytes` in size. A block in
+    either dimension then only reads the chunks it overlaps, rather than a strided strip
+    of the whole file."""
+    sliced_dims = sorted({write_slicing_dim, read_slicing_dim})
+    row_bytes = itemsize * int(
+        np.prod([global_shape[d] for d in range(3) if d not in sliced_dims])
+    )
+    rows = max(1, _store_chunk_bytes // row_bytes)
+    extent = max(1, int(rows ** (1 / len(sliced_dims))))
+    chunks = list(global_shape)
+    for d in sliced_dims:
+        chunks[d] = max(1, min(global_shape[d], extent))
+    return (chunks[0], chunks[1], chunks[2])
+
+
+def is_orthogonal_read(
+    global_shape: Tuple[int, int, int],
+    chunks: Optional[Tuple[int, int, int]],
+    slicing_dim: int,
+    block_length: int,
+) -> bool:
+    """Whether blocks of `block_length` slices along `slicing_dim` gather thin strips
+    from the chunks of a dataset with the given chunks (or from many rows, if `chunks`
+    is None, i.e. the dataset is contiguous), rather than reading whole layers of
+    chunks"""
+    if chunks is None:
+        return any(global_shape[d] > 1 for d in range(slicing_dim))
+    return chunks[slicing_dim] > max(1, block_length)
+
+
+def calculate_chunk_cache(
+    global_shape: Tuple[int, int, int],
+    chunks: Optional[Tuple[int, int, int]],
+    itemsize: int,
+    slicing_dim: int,
+) -> Tuple[int, int]:
+    """Calculates the size in bytes and the number of hash table slots of the raw-chunk
+    cache for reading a chunked dataset in blocks along `slicing_dim` (the HDF5 defaults
+    if `chunks` is None, i.e. the dataset is contiguous).
+
+    The cache holds one layer of chunks across the slicing dimension, so that chunks
+    shared by consecutive blocks are only read from the file once."""
+    if chunks is None:
+        return 1024**2, 521
+    chunk_bytes = int(np.prod(chunks)) * itemsize
+    layer_chunks = int(
+        np.prod(
+            [
+                math.ceil(global_shape[d] / chunks[d])
+                for d in range(3)
+                if d != slicing_dim
+            ]
+        )
+    )
+    nbytes = min(layer_chunks * chunk_bytes, _max_chunk_cache_bytes)
+    # never less than the HDF5 default of 1MB
+    nbytes = max(nbytes, 1024**2)
+    # HDF5 recommends about 100 times as many slots as chunks in the cache
+    nslots = max(521, 100 * (nbytes // chunk_bytes)) | 1
+    return nbytes, nslots
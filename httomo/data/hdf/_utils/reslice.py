@@ -1,10 +1,15 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
-from typing import Tuple
+import time
+from typing import Any, Callable, List, Literal, Optional, Tuple
 
 import numpy
+from mpi4py import MPI
 from mpi4py.MPI import Comm
+from mpi4py.util import dtlib
 
-from httomo.data.mpiutil import alltoall
+from httomo.data.compressed_chunk import compress_array, decompress_array
+from httomo.data.mpiutil import alltoallw_regions
 from httomo.data.hdf._utils import chunk
 from httomo.utils import log_once
 
@@ -14,9 +19,30 @@ def reslice(
     current_slice_dim: int,
     next_slice_dim: int,
     comm: Comm,
+    max_buffer_bytes: Optional[int] = None,
+    hierarchical: bool = False,
+    compress: bool = False,
 ) -> Tuple[numpy.ndarray, int, int]:
     """Reslice data by using in-memory MPI directives.
 
+    The regions sent to and received from every process are described as MPI subarray
+    datatypes, so that the data is moved between the chunks without being split and
+    concatenated in Python. With `max_buffer_bytes`, the data is exchanged in rounds,
+    each covering a slab of the dimension that is neither the current nor the next
+    slicing dimension, which bounds any packing the MPI implementation does internally
+    (unless a single slice of that dimension exceeds it).
+
+    With `hierarchical`, only one process per node takes part in the exchange over the
+    interconnect: the processes of a node put their data into a shared-memory window,
+    the node leaders exchange one aggregated message per pair of nodes, and every
+    process takes its part of the new chunk from the shared window the leader has
+    received into.
+    This needs the processes of each node to be consecutive ranks in `comm`, and falls
+    back to the flat exchange otherwise.
+
+    With `compress`, the pieces of the flat exchange are compressed for the wire (see
+    `_CompressionTrial`), as long as that turns out to be faster.
+
     Parameters
     ----------
     data : numpy.ndarray
@@ -28,6 +54,13 @@ def reslice(
         and saving.
     comm : Comm
         The MPI communicator to be used.
+    max_buffer_bytes : Optional[int]
+        The size of the data sent and received per round together, if the data
+        should be exchanged in rounds.
+    hierarchical : bool
+        Whether to exchange the data between nodes rather than between processes.
+    compress : bool
+        Whether to try compressing the pieces sent between processes.
 
     Returns:
     tuple[numpy.ndarray, int, int]:
@@ -55,11 +88,564 @@ def reslice(
     nprocs = comm.size
     length = data_shape[next_slice_dim - 1]
     split_indices = [round((length / nprocs) * r) for r in range(1, nprocs)]
-    to_scatter = numpy.split(data, split_indices, axis=next_slice_dim - 1)
-
-    # all-to-all MPI call distributes every processes list to every other process,
-    # and we concatenate them again across the resliced dimension
-    new_data = numpy.concatenate(alltoall(to_scatter, comm), axis=current_slice_dim - 1)
-
     start_idx = 0 if comm.rank == 0 else split_indices[comm.rank - 1]
+
+    new_data = _exchange_in_rounds(
+        numpy.ascontiguousarray(data),
+        current_slice_dim - 1,
+        next_slice_dim - 1,
+        [0, *split_indices, length],
+        comm,
+        max_buffer_bytes,
+        hierarchical,
+        compress,
+    )
     return new_data, next_slice_dim, start_idx
+
+
+def _exchange_in_rounds(
+    data: numpy.ndarray,
+    current_slice_dim: int,
+    next_slice_dim: int,
+    next_bounds: List[int],
+    comm: Comm,
+    max_buffer_bytes: Optional[int],
+    hierarchical: bool = False,
+    compress: bool = False,
+) -> numpy.ndarray:
+    """Reslices the chunk with an `Alltoallw` per slab of the untouched dimension (or a
+    single one without `max_buffer_bytes`), sending the regions of the chunk and
+    receiving into the regions of the new chunk directly (0-based dimensions,
+    `next_bounds` are the chunk boundaries in the next slicing dimension). With
+    `hierarchical`, the slabs are exchanged between nodes (see `_NodeExchange`), and
+    with `compress` as compressed pieces (see `_CompressionTrial`)."""
+    untouched_dim = 3 - current_slice_dim - next_slice_dim
+    current_lengths = comm.allgather(data.shape[current_slice_dim])
+    current_bounds = [0, *numpy.cumsum(current_lengths).tolist()]
+
+    new_shape = list(data.shape)
+    new_shape[current_slice_dim] = current_bounds[-1]
+    new_shape[next_slice_dim] = next_bounds[comm.rank + 1] - next_bounds[comm.rank]
+    new_data = numpy.empty(new_shape, data.dtype)
+
+    untouched_length = data.shape[untouched_dim]
+    slab = untouched_length
+    if max_buffer_bytes is not None:
+        # elements per slice of the untouched dim that are sent and received, which
+        # the MPI implementation may need to pack
+        send_slice = data.shape[current_slice_dim] * data.shape[next_slice_dim]
+        recv_slice = new_shape[current_slice_dim] * new_shape[next_slice_dim]
+        buffer_elements = max_buffer_bytes // 2 // data.itemsize
+        slab = max(1, buffer_elements // max(1, send_slice, recv_slice))
+    # every process has to take part in the same number of rounds
+    slab = max(1, min(comm.allreduce(slab, MPI.MIN), untouched_length))
+    log_once(
+        f"Reslicing in {-(-untouched_length // slab)} rounds of {slab} slices",
+        level=logging.DEBUG,
+    )
+
+    if hierarchical and _NodeExchange.is_supported(comm):
+        exchange = _NodeExchange(
+            comm,
+            data,
+            current_bounds,
+            next_bounds,
+            current_slice_dim,
+            next_slice_dim,
+            slab,
+        )
+        try:
+            for slab_start in range(0, untouched_length, slab):
+                slab_stop = min(slab_start + slab, untouched_length)
+                exchange.exchange(data, new_data, slab_start, slab_stop)
+        finally:
+            exchange.free()
+        return new_data
+
+    trial = _CompressionTrial(comm) if compress else None
+    for round_index, slab_start in enumerate(range(0, untouched_length, slab)):
+        slab_stop = min(slab_start + slab, untouched_length)
+        send_regions = []
+        recv_regions = []
+        for rank in range(comm.size):
+            region = [slice(None), slice(None), slice(None)]
+            region[untouched_dim] = slice(slab_start, slab_stop)
+            region[next_slice_dim] = slice(next_bounds[rank], next_bounds[rank + 1])
+            send_regions.append(tuple(region))
+            region[next_slice_dim] = slice(None)
+            region[current_slice_dim] = slice(
+                current_bounds[rank], current_bounds[rank + 1]
+            )
+            recv_regions.append(tuple(region))
+        if trial is None:
+            alltoallw_regions(data, send_regions, new_data, recv_regions, comm)
+            continue
+
+        compressed = trial.compresses_next_round()
+        round_start = time.perf_counter()
+        if compressed:
+            wire_bytes = _exchange_compressed(
+                data,
+                send_regions,
+                new_data,
+                recv_regions,
+                comm,
+                trial.pool,
+                _compressed_tag + round_index % 1000,
+            )
+        else:
+            alltoallw_regions(data, send_regions, new_data, recv_regions, comm)
+        raw_bytes = sum(data[region].nbytes for region in send_regions)
+        if not compressed:
+            wire_bytes = raw_bytes
+        seconds = time.perf_counter() - round_start
+        trial.record(compressed, raw_bytes, wire_bytes, seconds)
+
+    if trial is not None:
+        trial.close()
+    return new_data
+
+
+# tags of the compressed pieces, with the round index added so that pieces sent by a
+# process that is a round ahead can't be mistaken for the ones of the current round
+_compressed_tag = 7000
+# below this ratio of raw to compressed size, pieces aren't worth compressing
+_min_compression_ratio = 1.3
+
+
+def _exchange_compressed(
+    data: numpy.ndarray,
+    send_regions: List[Tuple[slice, ...]],
+    new_data: numpy.ndarray,
+    recv_regions: List[Tuple[slice, ...]],
+    comm: Comm,
+    pool: ThreadPoolExecutor,
+    tag: int,
+) -> int:
+    """Exchanges the regions like `alltoallw_regions`, but compressing every piece in a
+    thread pool and sending it as soon as it is compressed, while the received pieces
+    are decompressed into `new_data` in the pool as they arrive. Returns the number of
+    compressed bytes sent."""
+    rank = comm.rank
+    new_data[recv_regions[rank]] = data[send_regions[rank]]
+
+    def compress(dest: int) -> Tuple[int, bytes]:
+        return dest, compress_array(data[send_regions[dest]])
+
+    def decompress(source: int, buffer: bytearray):
+        target = new_data[recv_regions[source]]
+        target[...] = decompress_array(buffer, target.shape, new_data.dtype)
+
+    # the pieces are empty in both directions, or in neither
+    sends = [
+        r for r in range(comm.size) if r != rank and data[send_regions[r]].size > 0
+    ]
+    recvs = [
+        r for r in range(comm.size) if r != rank and new_data[recv_regions[r]].size > 0
+    ]
+
+    wire_bytes = 0
+    requests = []
+    buffers = []  # kept alive until the sends have completed
+    for future in as_completed([pool.submit(compress, r) for r in sends]):
+        dest, buffer = future.result()
+        buffers.append(buffer)
+        requests.append(comm.Isend([buffer, MPI.BYTE], dest=dest, tag=tag))
+        wire_bytes += len(buffer)
+
+    decompressed = []
+    for _ in recvs:
+        status = MPI.Status()
+        message = comm.Mprobe(MPI.ANY_SOURCE, tag, status)
+        buffer = bytearray(status.Get_count(MPI.BYTE))
+        message.Recv([buffer, MPI.BYTE])
+        decompressed.append(pool.submit(decompress, status.Get_source(), buffer))
+
+    MPI.Request.Waitall(requests)
+    for future in decompressed:
+        future.result()
+    return wire_bytes
+
+
+class _CompressionTrial:
+    """Decides whether the rounds of a reslice are exchanged as compressed pieces.
+
+    The first round is exchanged raw and the second one compressed, timing both. The
+    remaining rounds are compressed only if the compressed round exchanged the data
+    faster and the pieces compressed by at least `_min_compression_ratio`, so that
+    compression switches itself off for data that doesn't compress well, or when the
+    interconnect is faster than the compression. All processes take the same decision,
+    based on the totals across processes.
+    """
+
+    def __init__(self, comm: Comm):
+        self._comm = comm
+        self._raw_rate: Optional[float] = None
+        self._decision: Optional[bool] = None
+        self.pool = ThreadPoolExecutor()
+
+    def compresses_next_round(self) -> bool:
+        if self._decision is not None:
+            return self._decision
+        return self._raw_rate is not None
+
+    def record(self, compressed: bool, raw_bytes: int, wire_bytes: int, seconds: float):
+        """Records the bytes a process exchanged in a round, and the time it took
+        (collective until the decision has been taken)"""
+        if self._decision is not None:
+            return
+        raw_total = float(self._comm.allreduce(raw_bytes, MPI.SUM))
+        wire_total = float(self._comm.allreduce(wire_bytes, MPI.SUM))
+        seconds = max(self._comm.allreduce(seconds, MPI.MAX), 1e-9)
+        rate = raw_total / seconds
+        if not compressed:
+            self._raw_rate = rate
+            return
+        assert self._raw_rate is not None
+        ratio = raw_total / max(wire_total, 1.0)
+        self._decision = bool(ratio >= _min_compression_ratio and rate > self._raw_rate)
+        log_once(
+            f"Reslice compression ratio {ratio:.2f}, {rate / 1e6:.0f} MB/s compressed "
+            f"vs {self._raw_rate / 1e6:.0f} MB/s raw - "
+            + ("compressing" if self._decision else "not compressing"),
+            level=logging.DEBUG,
+        )
+
+    def close(self):
+        self.pool.shutdown()
+
+
+class _NodeExchange:
+    """Exchanges slabs of the untouched dimension for `reslice` between nodes.
+
+    The processes of a node copy their slab into a shared-memory window, which holds the
+    node's part of the data in the current slicing dimension. The node leaders (the
+    first process of each node) send the regions of it to the other leaders, receiving
+    into a second shared-memory window, which holds the node's part of the data in the
+    next slicing dimension. The processes of the node then copy their part of the new
+    chunk out of it. Only the leaders use the interconnect, with one message per pair of
+    nodes rather than per pair of processes.
+    """
+
+    def __init__(
+        self,
+        comm: Comm,
+        data: numpy.ndarray,
+        current_bounds: List[int],
+        next_bounds: List[int],
+        current_slice_dim: int,
+        next_slice_dim: int,
+        slab: int,
+    ):
+        self._current_dim = current_slice_dim
+        self._next_dim = next_slice_dim
+        self._untouched_dim = 3 - current_slice_dim - next_slice_dim
+        self._node_comm = comm.Split_type(MPI.COMM_TYPE_SHARED, key=comm.rank)
+        is_leader = self._node_comm.rank == 0
+        self._leader_comm = comm.Split(0 if is_leader else MPI.UNDEFINED, comm.rank)
+
+        # the ranks of each node are consecutive, so nodes hold contiguous ranges in
+        # both slicing dimensions
+        first = self._node_comm.bcast(comm.rank, root=0)
+        last = first + self._node_comm.size
+        self._current_range = (current_bounds[first], current_bounds[last])
+        self._next_range = (next_bounds[first], next_bounds[last])
+        self._current_offset = current_bounds[comm.rank] - current_bounds[first]
+        self._next_offset = next_bounds[comm.rank] - next_bounds[first]
+        self._current_length = current_bounds[comm.rank + 1] - current_bounds[comm.rank]
+        self._next_length = next_bounds[comm.rank + 1] - next_bounds[comm.rank]
+        self._node_ranges: List[Tuple[Tuple[int, int], Tuple[int, int]]] = []
+        if is_leader:
+            self._node_ranges = self._leader_comm.allgather(
+                (self._current_range, self._next_range)
+            )
+
+        # the windows hold a slab of the untouched dimension
+        send_shape = list(data.shape)
+        send_shape[current_slice_dim] = self._current_range[1] - self._current_range[0]
+        send_shape[self._untouched_dim] = slab
+        recv_shape = list(data.shape)
+        recv_shape[current_slice_dim] = current_bounds[-1]
+        recv_shape[next_slice_dim] = self._next_range[1] - self._next_range[0]
+        recv_shape[self._untouched_dim] = slab
+        self._send_win, self._send = self._allocate(send_shape, data.dtype)
+        self._recv_win, self._recv = self._allocate(recv_shape, data.dtype)
+
+    @staticmethod
+    def is_supported(comm: Comm) -> bool:
+        """Whether the processes of each node are consecutive ranks in `comm`"""
+        node_comm = comm.Split_type(MPI.COMM_TYPE_SHARED, key=comm.rank)
+        ranks = node_comm.allgather(comm.rank)
+        node_comm.Free()
+        consecutive = ranks == list(range(ranks[0], ranks[0] + len(ranks)))
+        return comm.allreduce(consecutive, MPI.LAND)
+
+    def _allocate(
+        self, shape: List[int], dtype: numpy.dtype
+    ) -> Tuple[MPI.Win, numpy.ndarray]:
+        """A shared-memory window of the given shape, held by the node leader, and the
+        numpy array on it"""
+        nbytes = int(numpy.prod(shape)) * dtype.itemsize
+        win = MPI.Win.Allocate_shared(
+            nbytes if self._node_comm.rank == 0 else 0,
+            dtype.itemsize,
+            comm=self._node_comm,
+        )
+        buffer, _ = win.Shared_query(0)
+        return win, numpy.ndarray(shape, dtype, buffer=buffer)
+
+    def exchange(
+        self,
+        data: numpy.ndarray,
+        new_data: numpy.ndarray,
+        slab_start: int,
+        slab_stop: int,
+    ):
+        """Exchanges the slab [slab_start, slab_stop) of the untouched dimension, as the
+        first slices of the windows"""
+        window_slab = slice(0, slab_stop - slab_start)
+
+        own = [slice(None), slice(None), slice(None)]
+        own[self._untouched_dim] = slice(slab_start, slab_stop)
+        target = [slice(None), slice(None), slice(None)]
+        target[self._current_dim] = slice(
+            self._current_offset, self._current_offset + self._current_length
+        )
+        target[self._untouched_dim] = window_slab
+        self._send[tuple(target)] = data[tuple(own)]
+        self._send_win.Fence()
+
+        if self._leader_comm != MPI.COMM_NULL:
+            send_regions = []
+            recv_regions = []
+            for current_range, next_range in self._node_ranges:
+                region = [slice(None), slice(None), slice(None)]
+                region[self._untouched_dim] = window_slab
+                region[self._next_dim] = slice(*next_range)
+                send_regions.append(tuple(region))
+                region[self._next_dim] = slice(None)
+                region[self._current_dim] = slice(*current_range)
+                recv_regions.append(tuple(region))
+            alltoallw_regions(
+                self._send, send_regions, self._recv, recv_regions, self._leader_comm
+            )
+        self._recv_win.Fence()
+
+        source = [slice(None), slice(None), slice(None)]
+        source[self._next_dim] = slice(
+            self._next_offset, self._next_offset + self._next_length
+        )
+        source[self._untouched_dim] = window_slab
+        new_data[tuple(own)] = self._recv[tuple(source)]
+        # nothing is written into the windows for the next slab before all processes
+        # of the node have taken their part of this one
+        self._recv_win.Fence()
+
+    def free(self):
+        self._send_win.Free()
+        self._recv_win.Free()
+        if self._leader_comm != MPI.COMM_NULL:
+            self._leader_comm.Free()
+        self._node_comm.Free()
+
+
+class IncrementalReslicer:
+    """Reslices data block by block while it is being produced, as an alternative to
+    calling `reslice` on the full chunk once it is complete.
+
+    Every block given to `send_block` is split into the pieces that the other
+    processes hold after reslicing, and these are sent with non-blocking MPI calls
+    straight away. Pieces arriving from other processes are received whenever a block
+    is sent, and `finish` waits for the remaining ones. This way, most of the
+    data exchange overlaps with the computation of the blocks that follow.
+
+    Dimensions are 0-based here (unlike in `reslice`), and the chunks in the new
+    slicing dimension follow the same layout as `reslice`.
+
+    Blocks may be sent by any process, for any part of the data in the current slicing
+    dimension. With the same current and next slicing dimension, this redistributes
+    blocks written by arbitrary processes into the usual chunks of that dimension.
+
+    With `active_procs`, the data is split across the first `active_procs` processes
+    only, and the others end up with an empty chunk at the end of the data.
+
+    The resliced chunk is created with `allocate`, given its shape, global index and
+    dtype (a numpy array by default, but anything that can be assigned to with slices
+    will do).
+
+    The given communicator is used exclusively for the exchange (so that its
+    messages cannot be mixed up with any others) and is freed by `finish`.
+    """
+
+    HEADER_TAG = 55
+    DATA_TAG = 66
+
+    def __init__(
+        self,
+        comm: Comm,
+        current_slice_dim: Literal[0, 1, 2],
+        next_slice_dim: Literal[0, 1, 2],
+        global_shape: Tuple[int, int, int],
+        dtype: numpy.dtype,
+        active_procs: Optional[int] = None,
+        allocate: Optional[
+            Callable[[Tuple[int, int, int], Tuple[int, int, int], numpy.dtype], Any]
+        ] = None,
+    ):
+        self._comm = comm
+        self._current_slice_dim = current_slice_dim
+        self._next_slice_dim = next_slice_dim
+        self._mpi_dtype = dtlib.from_numpy_dtype(dtype)
+
+        nprocs = comm.size if active_procs is None else active_procs
+        length = global_shape[next_slice_dim]
+        self._split_indices = [round((length / nprocs) * r) for r in range(nprocs + 1)]
+        self._split_indices += [length] * (comm.size - nprocs)
+        start = self._split_indices[comm.rank]
+        stop = self._split_indices[comm.rank + 1]
+
+        chunk_shape = list(global_shape)
+        chunk_shape[next_slice_dim] = stop - start
+        self._chunk_shape = (chunk_shape[0], chunk_shape[1], chunk_shape[2])
+        global_index = [0, 0, 0]
+        global_index[next_slice_dim] = start
+        self._global_index = (global_index[0], global_index[1], global_index[2])
+        if allocate is None:
+            self._data = numpy.empty(self._chunk_shape, dtype)
+        else:
+            self._data = allocate(self._chunk_shape, self._global_index, dtype)
+
+        # we are done once every slice in the current slicing dim has arrived
+        self._expected = chunk_shape[current_slice_dim] if stop > start else 0
+        self._received = 0
+        self._sends: List[Tuple[MPI.Request, numpy.ndarray]] = []
+
+    @property
+    def next_slice_dim(self) -> Literal[0, 1, 2]:
+        return self._next_slice_dim
+
+    @property
+    def chunk_shape(self) -> Tuple[int, int, int]:
+        """Shape of this process' chunk after reslicing"""
+        return self._chunk_shape
+
+    @property
+    def global_index(self) -> Tuple[int, int, int]:
+        """Global start index of this process' chunk after reslicing"""
+        return self._global_index
+
+    @property
+    def data(self) -> numpy.ndarray:
+        """The resliced chunk - only complete after `finish` has been called"""
+        return self._data
+
+    def send_block(self, data: numpy.ndarray, global_start: int):
+        """Send the pieces of a block to the processes that hold them after reslicing.
+
+        Parameters
+        ----------
+        data : numpy.ndarray
+            The (unpadded) block, spanning the full global shape in all dimensions
+            apart from the current slicing dimension.
+        global_start : int
+            Global index of the block's first slice in the current slicing dimension.
+        """
+        length = data.shape[self._current_slice_dim]
+        if length == 0:
+            return
+        for rank in range(self._comm.size):
+            start = self._split_indices[rank]
+            stop = self._split_indices[rank + 1]
+            piece_start = global_start
+            if self._current_slice_dim == self._next_slice_dim:
+                # only the part of the block within the rank's chunk
+                piece_start = max(start, global_start)
+                start = piece_start - global_start
+                stop = min(stop, global_start + length) - global_start
+            if stop <= start:
+                continue
+            piece_slices = [slice(None), slice(None), slice(None)]
+            piece_slices[self._next_slice_dim] = slice(start, stop)
+            piece = data[piece_slices[0], piece_slices[1], piece_slices[2]]
+            if rank == self._comm.rank:
+                self._insert(piece, piece_start)
+                continue
+            # copy, as the block's data may be re-used before the send completes
+            piece = numpy.array(piece, order="C", copy=True)
+            header = numpy.array(
+                [piece_start, piece.shape[self._current_slice_dim]],
+                dtype=numpy.int64,
+            )
+            self._sends.append(
+                (
+                    self._comm.Isend(
+                        [header, MPI.INT64_T], dest=rank, tag=self.HEADER_TAG
+                    ),
+                    header,
+                )
+            )
+            self._sends.append(
+                (
+                    self._comm.Isend(
+                        [piece, self._mpi_dtype], dest=rank, tag=self.DATA_TAG
+                    ),
+                    piece,
+                )
+            )
+
+        self._receive(blocking=False)
+        # release the buffers of the sends that have completed already
+        self._sends = [(req, buf) for req, buf in self._sends if not req.Test()]
+
+    def throttle(self, max_pending_sends: int, max_pending_bytes: int = 0):
+        """Keep receiving pieces until at most `max_pending_sends` of the sends of this
+        process are outstanding, and their buffers take at most `max_pending_bytes`
+        (if not 0), bounding the memory held by them"""
+        while True:
+            self._sends = [(req, buf) for req, buf in self._sends if not req.Test()]
+            if len(self._sends) <= max_pending_sends and (
+                max_pending_bytes <= 0
+                or sum(buf.nbytes for _, buf in self._sends) <= max_pending_bytes
+            ):
+                return
+            self._receive(blocking=False)
+
+    def finish(self) -> numpy.ndarray:
+        """Wait for all outstanding pieces to be exchanged and return the resliced
+        chunk of this process"""
+        self._receive(blocking=True)
+        MPI.Request.Waitall([req for req, _ in self._sends])
+        self._sends = []
+        self._comm.Free()
+        return self._data
+
+    def _receive(self, blocking: bool):
+        status = MPI.Status()
+        while self._received < self._expected:
+            if blocking:
+                self._comm.Probe(
+                    source=MPI.ANY_SOURCE, tag=self.HEADER_TAG, status=status
+                )
+            elif not self._comm.Iprobe(
+                source=MPI.ANY_SOURCE, tag=self.HEADER_TAG, status=status
+            ):
+                return
+            source = status.Get_source()
+            header = numpy.empty(2, dtype=numpy.int64)
+            self._comm.Recv([header, MPI.INT64_T], source=source, tag=self.HEADER_TAG)
+            global_start, length = int(header[0]), int(header[1])
+            piece_shape = list(self._chunk_shape)
+            piece_shape[self._current_slice_dim] = length
+            piece = numpy.empty(piece_shape, dtype=self._data.dtype)
+            # messages from the same source are non-overtaking, so this is the data
+            # belonging to the header just received
+            self._comm.Recv([piece, self._mpi_dtype], source=source, tag=self.DATA_TAG)
+            self._insert(piece, global_start)
+
+    def _insert(self, piece: numpy.ndarray, global_start: int):
+        length = piece.shape[self._current_slice_dim]
+        insert_slices = [slice(None), slice(None), slice(None)]
+        start = global_start - self._global_index[self._current_slice_dim]
+        insert_slices[self._current_slice_dim] = slice(start, start + length)
+        self._data[insert_slices[0], insert_slices[1], insert_slices[2]] = piece
+        self._received += length
@@ -24,6 +24,7 @@ def standard_tomo(
     flats: Optional[Dict] = None,
     ignore_darks: Optional[Union[bool, Dict]] = False,
     ignore_flats: Optional[Union[bool, Dict]] = False,
+    collective_reads: Optional[Union[bool, Dict]] = False,
 ):
     """Loader for standard tomography data.
 
@@ -64,6 +65,10 @@ def standard_tomo(
     ignore_flats : optional, Union[bool, Dict]
         If bool, specifies ignoring all or none of flats. If dict, specifies
         individual and batch flats to ignore.
+    collective_reads : optional, Union[bool, Dict]
+        If True or a dict, the data is read with collective parallel HDF5 reads
+        across all processes. A dict gives the MPI-IO hints to use for them, e.g.
+        `romio_cb_read`, `cb_buffer_size` or `cb_nodes`.
     """
     # Note: this function is just here to define the interface for the yaml
     # TODO: remove this completely
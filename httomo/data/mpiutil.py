@@ -1,113 +1,143 @@
-from typing import List
+from typing import List, Optional, Tuple
 
 import numpy as np
 from mpi4py import MPI
+from mpi4py.util import dtlib
 
 
-__all__ = ["alltoall"]
+__all__ = ["alltoallw_regions", "bcast_shared"]
 
 
 # add this here so that we can mock it in the tests
 _mpi_max_elements = 2**31
 
+# the shared-memory windows of the arrays from `bcast_shared`, which are kept until MPI
+# is finalized (freeing them is collective, and the arrays may live anywhere)
+_shared_windows: List[MPI.Win] = []
 
-def alltoall(arrays: List[np.ndarray], comm: MPI.Comm) -> List[np.ndarray]:
-    """Distributes a list of contiguous numpy arrays from each rank to every other rank.
 
-    It also handles the case where the array sizes are larger than the max allowed by MPI
-    (INT_MAX elements, i.e. 2*31), since all MPI calls use the C int data type for representing
-    sizes.
-    It fixes this with reslice in mind, so the input arrays in the list must:
+def alltoallw_regions(
+    send: np.ndarray,
+    send_regions: List[Tuple[slice, ...]],
+    recv: np.ndarray,
+    recv_regions: List[Tuple[slice, ...]],
+    comm: MPI.Comm,
+):
+    """Sends a region of `send` to every rank and receives a region of `recv` from every
+    rank, without packing the regions into intermediate buffers.
 
-    - be 3-dimensional
-    - One of these dimensions must be the same lengths for all arrays across sent/received arrays
-      (reslice maps from current slice dim to next slice dim and leaves the third dimension
-      untouched)
+    The regions are described as MPI subarray datatypes over the full arrays, so that
+    `Alltoallw` reads and writes the data in place. The offsets of the regions are part
+    of the datatypes, so the (C int) byte displacements are all zero and arrays larger
+    than 2GB can be exchanged too.
 
-    It picks this consistently-sized dimension and creates a new contiguous MPI data type
-    of that length. Then the sizes are divided by this length, which should make it fit in all
-    practical cases. If not, MPI will raise an exception.
+    Parameters
+    ----------
+    send : np.ndarray
+        C-contiguous array to send the regions of.
+    send_regions : List[Tuple[slice, ...]]
+        For every rank, the slices (without steps) of the region of `send` sent to it.
+    recv : np.ndarray
+        C-contiguous array to receive into, of the same dtype as `send`.
+    recv_regions : List[Tuple[slice, ...]]
+        For every rank, the slices (without steps) of the region of `recv` received
+        from it.
+    """
+    if len(send_regions) != comm.size or len(recv_regions) != comm.size:
+        err_str = "list of regions for MPI alltoallw call must match communicator size"
+        raise ValueError(err_str)
+    assert send.dtype == recv.dtype, "Both arrays must be of the same type"
+    assert send.flags.c_contiguous, "C-contigous array is required"
+    assert recv.flags.c_contiguous, "C-contigous array is required"
+
+    dtype = dtlib.from_numpy_dtype(send.dtype)
+    send_types = [_subarray_type(dtype, send.shape, r) for r in send_regions]
+    recv_types = [_subarray_type(dtype, recv.shape, r) for r in recv_regions]
+    # empty regions are sent as 0 elements of the plain type
+    send_counts = [0 if t is None else 1 for t in send_types]
+    recv_counts = [0 if t is None else 1 for t in recv_types]
+    displacements = [0] * comm.size
+    try:
+        comm.Alltoallw(
+            [send, (send_counts, displacements), _or_plain(send_types, dtype)],
+            [recv, (recv_counts, displacements), _or_plain(recv_types, dtype)],
+        )
+    finally:
+        for t in send_types + recv_types:
+            if t is not None:
+                t.Free()
+
+
+def _or_plain(
+    types: List[Optional[MPI.Datatype]], dtype: MPI.Datatype
+) -> List[MPI.Datatype]:
+    return [dtype if t is None else t for t in types]
+
+
+def _subarray_type(
+    dtype: MPI.Datatype, shape: Tuple[int, ...], region: Tuple[slice, ...]
+) -> Optional[MPI.Datatype]:
+    """A committed subarray datatype for the region of an array of the given shape
+    (missing trailing slices covering the full dimension), or None if it is empty"""
+    region = region + (slice(None),) * (len(shape) - len(region))
+    bounds = [s.indices(length)[:2] for s, length in zip(region, shape)]
+    subsizes = [max(0, stop - start) for start, stop in bounds]
+    if 0 in subsizes:
+        return None
+    return dtype.Create_subarray(
+        list(shape), subsizes, [start for start, _ in bounds]
+    ).Commit()
+
+
+def bcast_shared(array: Optional[np.ndarray], comm: MPI.Comm) -> np.ndarray:
+    """Broadcasts an array from rank 0 to all ranks of `comm`, holding a single copy of
+    it per node in shared memory.
+
+    Rank 0 of each node allocates the array in an MPI shared-memory window, and these
+    node leaders receive the data from rank 0. The other ranks of the node get an array
+    on the same memory. As the memory is shared, the returned array is read-only.
 
     Parameters
     ----------
-    arrays : List[np.ndarray]
-        List of 3D numpy arrays to be distributed. Length must be the full size of the given
-        communicator.
+    array : Optional[np.ndarray]
+        The array to broadcast on rank 0 - ignored on the other ranks.
 
     Returns
     -------
-    List[np.ndarray]
-        List of the numpy arrays received. Length is the full size of the given communicator.
+    np.ndarray
+        The (read-only) array on every rank.
     """
-
-    if len(arrays) != comm.size:
-        err_str = "list of arrays for MPI alltoall call must match communicator size"
-        raise ValueError(err_str)
-
-    assert all(type(a) == np.ndarray for a in arrays), "All arrays must be numpy arrays"
-    assert all(
-        a.dtype == arrays[0].dtype for a in arrays
-    ), "All arrays must be of the same type"
-    assert arrays[0].dtype in [
-        np.float32,
-        np.uint16,
-    ], "Only 16bit unsigned ints or single precision floats are implemented"
-    assert all(a.ndim == 3 for a in arrays), "Only 3D arrays are supported"
-
-    # no MPI or only one process
-    if comm.size == 1:
-        return arrays
-
-    sizes_send = [a.size for a in arrays]
-    shapes_send = [a.shape for a in arrays]
-
-    # create a single contiguous array with all the arrays flattened and stacked up,
-    # so that we can use MPI's Alltoallv (with buffer pointer + offsets)
-    # Note: the returned array from concatenate appears to always be C-contiguous
-    fullinput = np.concatenate([a.reshape(a.size) for a in arrays])
-    assert fullinput.flags.c_contiguous, "C-contigous array is required"
-    dtype = MPI.FLOAT if arrays[0].dtype == np.float32 else MPI.UINT16_T
-
-    # let everyone know the shapes / sizes they are going to receive + create an output buffer
-    shapes_rec = comm.alltoall(shapes_send)
-    sizes_rec = [np.prod(sh) for sh in shapes_rec]
-    fulloutput = np.empty((np.sum(sizes_rec),), dtype=arrays[0].dtype)
-
-    # NOTE: The custom MPI data type is being used below even when the number of elements
-    # doesn't exceed the limit which can be sent in a single MPI operation. See issue #274.
-
-    # find the dim which is equal in all arrays to send/receive
-    dim0s = [s[0] for s in shapes_send] + [s[0] for s in shapes_rec]
-    dim1s = [s[1] for s in shapes_send] + [s[1] for s in shapes_rec]
-    dim2s = [s[2] for s in shapes_send] + [s[2] for s in shapes_rec]
-    dim0equal = all(s == dim0s[0] for s in dim0s)
-    dim1equal = all(s == dim1s[1] for s in dim1s)
-    dim2equal = all(s == dim2s[2] for s in dim2s)
-    assert (
-        dim0equal or dim1equal or dim2equal
-    ), "At least one dimension of the input arrays must be of same size"
-
-    # create a new contiguous MPI datatype by repeating the input type by this common length
-    factor = (
-        arrays[0].shape[0]
-        if dim0equal
-        else arrays[0].shape[1] if dim1equal else arrays[0].shape[2]
+    header = (array.shape, array.dtype.str) if comm.rank == 0 else None
+    shape, dtype_str = comm.bcast(header, root=0)
+    dtype = np.dtype(dtype_str)
+    nbytes = int(np.prod(shape)) * dtype.itemsize
+    if comm.size == 1 or nbytes == 0:
+        shared = array.view() if array is not None else np.empty(shape, dtype)
+        shared.flags.writeable = False
+        return shared
+
+    node_comm = comm.Split_type(MPI.COMM_TYPE_SHARED, key=comm.rank)
+    is_leader = node_comm.rank == 0
+    leader_comm = comm.Split(0 if is_leader else MPI.UNDEFINED, comm.rank)
+    win = MPI.Win.Allocate_shared(
+        nbytes if is_leader else 0, dtype.itemsize, comm=node_comm
     )
-    dtype1 = dtype.Create_contiguous(factor).Commit()
-    # sanity check - this should always pass
-    assert all(s % factor == 0 for s in sizes_send), "Size does not divide evenly"
-    assert all(s % factor == 0 for s in sizes_rec), "Size does not divide evenly"
-    sizes_send1 = [s // factor for s in sizes_send]
-    sizes_rec1 = [s // factor for s in sizes_rec]
-
-    # now send the same data, but with the adjusted size+datatype (output is identical)
-    comm.Alltoallv((fullinput, sizes_send1, dtype1), (fulloutput, sizes_rec1, dtype1))
-
-    # build list of output arrays
-    cumsizes = np.cumsum(sizes_rec)
-    cumsizes = [0, *cumsizes[:-1]]
-    ret = list()
-    for i, s in enumerate(cumsizes):
-        ret.append(fulloutput[s : s + sizes_rec[i]].reshape(shapes_rec[i]))
-
-    return ret
+    _shared_windows.append(win)
+    buffer, _ = win.Shared_query(0)
+    shared = np.ndarray(shape, dtype, buffer=buffer)
+
+    if is_leader:
+        # rank 0 of `comm` is the leader of its node, and rank 0 of the leaders
+        if comm.rank == 0:
+            shared[...] = array
+        # the element counts of MPI are C ints
+        step = _mpi_max_elements - 1
+        flat = shared.reshape(-1)
+        for start in range(0, flat.size, step):
+            leader_comm.Bcast(flat[start : start + step], root=0)
+        leader_comm.Free()
+    win.Fence()
+    node_comm.Free()
+
+    shared.flags.writeable = False
+    return shared
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional, Tuple
 
 import h5py
 import numpy as np
@@ -87,3 +87,153 @@ def extrapolate_after(
     block_data[slices_wrt[0], slices_wrt[1], slices_wrt[2]] = global_data[
         slices_read[0], slices_read[1], slices_read[2]
     ]
+
+
+def read_into_block(
+    global_data: h5py.Dataset | np.ndarray,
+    block_data: np.ndarray,
+    slices_read: Tuple[slice, ...],
+    slices_wrt: Tuple[slice, ...],
+    collective: bool = False,
+) -> None:
+    """
+    Read a part of the global data into the given numpy array that represents the block,
+    directly (without an intermediate array) if the global data is an h5py dataset
+
+    If `collective` is set, the dataset must have been opened with the mpio driver and
+    this is a collective read across the communicator of the file - every process has
+    to call it, with empty slices if it has nothing to read.
+    """
+    if collective:
+        assert isinstance(global_data, h5py.Dataset)
+        _read_selection(global_data, block_data, [slices_read], slices_wrt, True)
+        return
+    if block_data[slices_wrt].size == 0:
+        return
+    if isinstance(global_data, h5py.Dataset):
+        global_data.read_direct(block_data, source_sel=slices_read, dest_sel=slices_wrt)
+    else:
+        block_data[slices_wrt] = global_data[slices_read]
+
+
+def read_runs_into_block(
+    global_data: h5py.Dataset | np.ndarray,
+    block_data: np.ndarray,
+    dim: int,
+    runs: List[Tuple[int, int]],
+    slices_read: Tuple[slice, ...],
+    slices_wrt: Tuple[slice, ...],
+    collective: bool = False,
+) -> None:
+    """
+    Read the runs `[start, stop)` of consecutive indices along `dim` of the global data
+    (with `slices_read` in the other dimensions), one after the other, into the part of
+    the given numpy array that represents the block given by `slices_wrt`
+
+    The runs must be in increasing order, and are read with a single selection of all
+    of them if the global data is an h5py dataset - collectively if `collective` is set,
+    as for `read_into_block`.
+    """
+    run_slices = []
+    for start, stop in runs:
+        run_read = list(slices_read)
+        run_read[dim] = slice(start, stop)
+        run_slices.append(tuple(run_read))
+    if isinstance(global_data, h5py.Dataset):
+        _read_selection(global_data, block_data, run_slices, slices_wrt, collective)
+    elif block_data[slices_wrt].size > 0:
+        block_data[slices_wrt] = np.concatenate(
+            [global_data[run] for run in run_slices], axis=dim
+        )
+
+
+def _read_selection(
+    global_data: h5py.Dataset,
+    block_data: np.ndarray,
+    slices_read: List[Tuple[slice, ...]],
+    slices_wrt: Tuple[slice, ...],
+    collective: bool,
+) -> None:
+    # the low-level API is used as h5py neither reads unions of hyperslabs, nor takes
+    # part in collective reads with empty selections (which would leave the other
+    # processes waiting)
+    file_space = global_data.id.get_space()
+    file_space.select_none()
+    for slices in slices_read:
+        start, count = _hyperslab(slices, global_data.shape)
+        if 0 not in count:
+            file_space.select_hyperslab(start, count, op=h5py.h5s.SELECT_OR)
+    mem_space = h5py.h5s.create_simple(block_data.shape)
+    start, count = _hyperslab(slices_wrt, block_data.shape)
+    if 0 in count:
+        mem_space.select_none()
+    else:
+        mem_space.select_hyperslab(start, count)
+    if not collective and mem_space.get_select_npoints() == 0:
+        return
+    dxpl = h5py.h5p.create(h5py.h5p.DATASET_XFER)
+    if collective:
+        dxpl.set_dxpl_mpio(h5py.h5fd.MPIO_COLLECTIVE)
+    global_data.id.read(mem_space, file_space, block_data, dxpl=dxpl)
+
+
+def _hyperslab(
+    slices: Tuple[slice, ...], shape: Tuple[int, ...]
+) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """The start and count of the hyperslab given by slices (without steps)"""
+    bounds = [s.indices(length)[:2] for s, length in zip(slices, shape)]
+    start = tuple(start for start, _ in bounds)
+    count = tuple(max(0, stop - start) for start, stop in bounds)
+    return start, count
+
+
+class Halo:
+    """
+    The last slices of the data read for a block along the slicing dimension, which are
+    the first slices (the "before" padded area, and as many core slices as there is
+    "after" padding) of the next block if blocks are read in order.
+
+    Sources keep it to read these slices only once, copied out of the block as methods
+    may modify blocks in-place. Indices are global indices in the slicing dimension.
+    """
+
+    def __init__(self, dim: int, slices: int):
+        self._dim = dim
+        self._slices = slices
+        self._data: Optional[np.ndarray] = None
+        self._start = 0
+
+    def fill(
+        self, block_data: np.ndarray, block_start: int, start: int, stop: int
+    ) -> int:
+        """
+        Copy the slices at the start of the range [start, stop) which the halo holds
+        into the block (which starts at `block_start`), and return the index the rest of
+        the range starts at
+        """
+        if self._data is None:
+            return start
+        halo_stop = min(stop, self._start + self._data.shape[self._dim])
+        if not self._start <= start < halo_stop:
+            return start
+        slices_wrt = [slice(None), slice(None), slice(None)]
+        slices_wrt[self._dim] = slice(start - block_start, halo_stop - block_start)
+        slices_read = [slice(None), slice(None), slice(None)]
+        slices_read[self._dim] = slice(start - self._start, halo_stop - self._start)
+        block_data[slices_wrt[0], slices_wrt[1], slices_wrt[2]] = self._data[
+            slices_read[0], slices_read[1], slices_read[2]
+        ]
+        return halo_stop
+
+    def keep(self, block_data: np.ndarray, block_start: int, start: int, stop: int):
+        """
+        Keep the last slices of the range [start, stop) that has been read into the
+        block (which starts at `block_start`)
+        """
+        if self._slices == 0 or stop <= start:
+            return
+        keep_start = max(start, stop - self._slices)
+        slices_keep = [slice(None), slice(None), slice(None)]
+        slices_keep[self._dim] = slice(keep_start - block_start, stop - block_start)
+        self._data = block_data[slices_keep[0], slices_keep[1], slices_keep[2]].copy()
+        self._start = keep_start
@@ -0,0 +1,164 @@
+import os
+from os import PathLike
+from pathlib import Path
+import tempfile
+from typing import List, Optional, Tuple
+import weakref
+
+import numpy as np
+from numpy.typing import DTypeLike
+
+from httomo.data.compressed_chunk import slice_bounds
+
+# size of the slabs a spilled chunk is resliced in
+_slab_bytes = 64 * 1024**2
+
+
+def _remove_file(filename: Path):
+    filename.unlink(missing_ok=True)
+
+
+class SpilledChunk:
+    """A 3D chunk of which as many slices along `split_dim` as fit into
+    `ram_budget_bytes` are held in memory, and only the remaining ones are spilled to a
+    scratch file of this process (memory-mapped, created in `scratch_dir`).
+
+    It can be read and written like a numpy array with slices (without steps), and reads
+    always return a copy. The scratch file is deleted by `close`, or when the chunk is
+    garbage-collected.
+    """
+
+    def __init__(
+        self,
+        shape: Tuple[int, int, int],
+        dtype: DTypeLike,
+        split_dim: int,
+        ram_budget_bytes: int,
+        scratch_dir: PathLike,
+    ):
+        self._shape = (shape[0], shape[1], shape[2])
+        self._dtype = np.dtype(dtype)
+        self._split_dim = split_dim
+        self._ram_budget_bytes = ram_budget_bytes
+        self._scratch_dir = scratch_dir
+
+        length = self._shape[split_dim]
+        slice_bytes = self._slice_bytes(split_dim)
+        self._ram_slices = (
+            length
+            if slice_bytes == 0
+            else min(length, max(0, ram_budget_bytes) // slice_bytes)
+        )
+        ram_shape = list(self._shape)
+        ram_shape[split_dim] = self._ram_slices
+        self._ram: Optional[np.ndarray] = np.empty(ram_shape, self._dtype)
+
+        self._filename: Optional[Path] = None
+        self._file: Optional[np.memmap] = None
+        if self._ram_slices < length:
+            fd, filename = tempfile.mkstemp(
+                prefix="httom_spill_", suffix=".raw", dir=scratch_dir
+            )
+            os.close(fd)
+            self._filename = Path(filename)
+            file_shape = list(self._shape)
+            file_shape[split_dim] = length - self._ram_slices
+            self._file = np.memmap(
+                self._filename, dtype=self._dtype, mode="w+", shape=tuple(file_shape)
+            )
+        self._finalizer = weakref.finalize(self, _remove_file, self._filename)
+        if self._filename is None:
+            self._finalizer.detach()
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self._shape
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._dtype
+
+    @property
+    def ndim(self) -> int:
+        return 3
+
+    @property
+    def nbytes(self) -> int:
+        return int(np.prod(self._shape)) * self._dtype.itemsize
+
+    @property
+    def spilled_nbytes(self) -> int:
+        """Size of the part of the chunk in the scratch file"""
+        return 0 if self._file is None else self._file.nbytes
+
+    @property
+    def filename(self) -> Optional[Path]:
+        return self._filename
+
+    def like(
+        self,
+        shape: Tuple[int, int, int],
+        global_index: Tuple[int, int, int],
+        slicing_dim: int,
+    ) -> "SpilledChunk":
+        """Creates an empty chunk with the same memory budget, split along
+        `slicing_dim`, e.g. for the chunk after reslicing"""
+        return SpilledChunk(
+            shape, self._dtype, slicing_dim, self._ram_budget_bytes, self._scratch_dir
+        )
+
+    def slab_length(self, dim: int) -> int:
+        """Number of slices along `dim` worth processing at a time"""
+        slice_bytes = self._slice_bytes(dim)
+        return max(1, _slab_bytes // slice_bytes) if slice_bytes > 0 else 1
+
+    def __getitem__(self, key) -> np.ndarray:
+        bounds = slice_bounds(key, self._shape)
+        out = np.empty([stop - start for start, stop in bounds], self._dtype)
+        for part, src, dst in self._parts(bounds):
+            out[dst] = part[src]
+        return out
+
+    def __setitem__(self, key, value):
+        bounds = slice_bounds(key, self._shape)
+        value = np.broadcast_to(
+            np.asarray(value, dtype=self._dtype),
+            [stop - start for start, stop in bounds],
+        )
+        for part, src, dst in self._parts(bounds):
+            part[src] = value[dst]
+
+    def flush(self):
+        """Writes the spilled part out to the scratch file"""
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        """Releases the memory and deletes the scratch file"""
+        self._ram = None
+        self._file = None
+        self._finalizer()
+
+    def _slice_bytes(self, dim: int) -> int:
+        return (
+            int(np.prod([self._shape[d] for d in range(3) if d != dim]))
+            * self._dtype.itemsize
+        )
+
+    def _parts(self, bounds: List[Tuple[int, int]]):
+        """The parts of the chunk (in memory and in the file) overlapping the bounds,
+        with the slices of the overlap relative to the part and to the bounds"""
+        dim = self._split_dim
+        start, stop = bounds[dim]
+        for part, part_start in [(self._ram, 0), (self._file, self._ram_slices)]:
+            if part is None:
+                continue
+            lo = max(start, part_start)
+            hi = min(stop, part_start + part.shape[dim])
+            if lo >= hi:
+                continue
+            src = [slice(b0, b1) for b0, b1 in bounds]
+            src[dim] = slice(lo - part_start, hi - part_start)
+            dst = [slice(0, b1 - b0) for b0, b1 in bounds]
+            dst[dim] = slice(lo - start, hi - start)
+            yield part, tuple(src), tuple(dst)
@@ -10,5 +10,16 @@ MAX_CPU_SLICES: int = (
 FRAMES_PER_CHUNK: int = 1  # if given as 0, then write contiguous (no chunking)
 INTERMEDIATE_FORMAT: str = "hdf5"
 COMPRESS_INTERMEDIATE: bool = False
+# memory for the buffers of in-memory reslicing, which then exchanges the data in rounds
+# (0 to exchange it all at once, as by default)
+RESLICE_BUFFER_BYTES: int = 0
+# whether in-memory reslicing exchanges the data between nodes (through shared memory
+# within each node), rather than between all processes
+RESLICE_HIERARCHICAL: bool = False
+# whether in-memory reslicing tries compressing the data sent between processes
+RESLICE_COMPRESSION: bool = False
+# size of the super-blocks the loader reads from the input file at a time, which the
+# blocks are copied from (0 to read each block on its own)
+LOADER_READ_BYTES: int = 0
 SYSLOG_SERVER = "localhost"
 SYSLOG_PORT = 514
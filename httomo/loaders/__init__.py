@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 from mpi4py import MPI
 
 from httomo.darks_flats import DarksFlatsFileConfig
@@ -22,6 +22,7 @@ def make_loader(
     flats: DarksFlatsFileConfig,
     preview: PreviewConfig,
     comm: MPI.Comm,
+    collective_reads: Optional[Dict[str, str]] = None,
 ) -> LoaderInterface:
     """Produces a loader interface. Only StandardTomoWrapper is supported right now,
     and this method has been added for backwards compatibility. Supporting other loaders
@@ -41,4 +42,5 @@ def make_loader(
         flats=flats,
         angles=angles,
         preview=preview,
+        collective_reads=collective_reads,
     )
@@ -1,14 +1,24 @@
+import bisect
 import logging
 import weakref
 from pathlib import Path
-from typing import Literal, Optional, Tuple
+from typing import Dict, List, Literal, Optional, Tuple
 
 import h5py
 import numpy as np
 from mpi4py import MPI
 
+import httomo.globals
 from httomo.darks_flats import DarksFlatsFileConfig, get_darks_flats
-from httomo.data.padding import extrapolate_after, extrapolate_before
+from httomo.data.hdf._utils.chunk import calculate_chunk_cache
+from httomo.data.mpiutil import bcast_shared
+from httomo.data.padding import (
+    Halo,
+    extrapolate_after,
+    extrapolate_before,
+    read_into_block,
+    read_runs_into_block,
+)
 from httomo.loaders.types import AnglesConfig, UserDefinedAngles
 from httomo.preview import Preview, PreviewConfig
 from httomo.runner.auxiliary_data import AuxiliaryData
@@ -21,6 +31,17 @@ from httomo.utils import Pattern, log_once, make_3d_shape_from_shape
 class StandardTomoLoader(DataSetSource):
     """
     Loads an individual block at a time from raw data instead of an entire chunk.
+
+    If `collective_reads` is given, the file is opened with the mpio driver (with the
+    given MPI-IO hints) and the blocks are read with collective reads across `comm`, so
+    that the MPI library can aggregate the requests of the processes. As processes may
+    read different numbers of blocks, every process has to call `finish_reads` once it
+    has read all of its blocks, which takes part in the remaining reads of the others.
+
+    If `super_block_bytes` is given, the chunk is read from the file in super-blocks of
+    (up to) that size rather than block by block, and the blocks are copied out of them.
+    This way, the size of the requests to the filesystem doesn't depend on the block
+    size.
     """
 
     def __init__(
@@ -35,10 +56,10 @@ class StandardTomoLoader(DataSetSource):
         slicing_dim: Literal[0, 1, 2],
         comm: MPI.Comm,
         padding: Tuple[int, int] = (0, 0),
+        collective_reads: Optional[Dict[str, str]] = None,
+        super_block_bytes: int = 0,
+        aux_comm: Optional[MPI.Comm] = None,
     ) -> None:
-        if slicing_dim != 0:
-            raise NotImplementedError("Only slicing dim 0 is currently supported")
-
         self._in_file = in_file
         self._data_path = data_path
         self._image_key_path = image_key_path
@@ -46,7 +67,22 @@ class StandardTomoLoader(DataSetSource):
         self._slicing_dim: Literal[0, 1, 2] = slicing_dim
         self._comm = comm
         self._padding = padding
-        self._h5file = h5py.File(in_file, "r")
+        # the padded areas shared by consecutive blocks are only read once
+        self._halo = Halo(slicing_dim, padding[0] + padding[1])
+        # collective reads need all processes of `comm` to take part in every read,
+        # they are coordinated on a communicator of their own
+        self._read_comm: Optional[MPI.Comm] = None
+        if collective_reads is not None and comm.size > 1:
+            self._read_comm = comm.Dup()
+            info = MPI.Info.Create()
+            for key, value in collective_reads.items():
+                info.Set(key, value)
+            self._h5file = h5py.File(
+                in_file, "r", driver="mpio", comm=self._read_comm, info=info
+            )
+            info.Free()
+        else:
+            self._h5file = h5py.File(in_file, "r")
         self._data: h5py.Dataset = self._get_data()
         self._preview = Preview(
             preview_config=preview_config,
@@ -63,6 +99,13 @@ class StandardTomoLoader(DataSetSource):
             self._preview.config.detector_y.start,
             self._preview.config.detector_x.start,
         )
+        # The projections may not be consecutive frames in the file (e.g. with flats
+        # taken in the middle of the scan). Reads index the projections as if they were,
+        # starting at `self._data_offset[0]`, and are mapped to the runs of consecutive
+        # frames, given by the index of their first projection.
+        self._run_starts: List[int] = [0] + (
+            np.flatnonzero(np.diff(self._data_indices) != 1) + 1
+        ).tolist()
 
         chunk_index_slicing_dim = self._calculate_chunk_index_slicing_dim(
             comm.rank,
@@ -79,7 +122,26 @@ class StandardTomoLoader(DataSetSource):
             next_process_chunk_index_slicing_dim,
         )
 
-        self._aux_data = self._setup_aux_data(darks, flats)
+        # the super-block last read, starting at `self._super_block_start` (a global
+        # index in the dataset), and the number of slices to read for one
+        self._super_block: Optional[np.ndarray] = None
+        self._super_block_start = 0
+        slice_bytes = (
+            int(np.prod(self._global_shape)) // max(1, self._global_shape[slicing_dim])
+        ) * self._data.dtype.itemsize
+        self._super_block_slices = super_block_bytes // max(1, slice_bytes)
+        # the super-blocks don't go beyond the slices the blocks of the chunk read
+        self._chunk_read_stop = self._data_offset[slicing_dim] + min(
+            self._global_shape[slicing_dim],
+            self._chunk_index[slicing_dim]
+            + padding[0]
+            + self._chunk_shape[slicing_dim]
+            + padding[1],
+        )
+
+        self._aux_data = self._setup_aux_data(
+            darks, flats, comm if aux_comm is None else aux_comm
+        )
         self._log_info()
         weakref.finalize(self, self.finalize)
 
@@ -116,10 +178,8 @@ class StandardTomoLoader(DataSetSource):
         Calculate the index of the chunk that is associated with the given MPI process in the
         slicing dimension, not including padding
         """
-        return round((len(self._data_indices) / nprocs) * rank)
+        return round((self._global_shape[self._slicing_dim] / nprocs) * rank)
 
-    # TODO: Assume projection slice dim for now, and therefore assume chunk index element
-    # ordering
     def _calculate_chunk_index(
         self,
         chunk_index_slicing_dim: int,
@@ -127,15 +187,14 @@ class StandardTomoLoader(DataSetSource):
         """
         Calculates index of chunk relative to the previewed data, including padding
         """
-        return (chunk_index_slicing_dim - self._padding[0], 0, 0)
+        chunk_index = [0, 0, 0]
+        chunk_index[self._slicing_dim] = chunk_index_slicing_dim - self._padding[0]
+        return make_3d_shape_from_shape(chunk_index)
 
     @property
     def chunk_shape(self) -> Tuple[int, int, int]:
         return self._chunk_shape
 
-    # TODO: Assume projection slice dim for now, and therefore assume chunk shape element
-    # ordering
-    # TODO: Assume no previewing/cropping in angles dimension
     def _calculate_chunk_shape(
         self,
         current_proc_chunk_index: int,
@@ -145,11 +204,11 @@ class StandardTomoLoader(DataSetSource):
         Calculate shape of the chunk that is associated with the given MPI process, excluding
         padding
         """
-        return (
-            next_proc_chunk_index - current_proc_chunk_index,
-            self._global_shape[1],
-            self._global_shape[2],
+        chunk_shape = list(self._global_shape)
+        chunk_shape[self._slicing_dim] = (
+            next_proc_chunk_index - current_proc_chunk_index
         )
+        return make_3d_shape_from_shape(chunk_shape)
 
     def read_block(self, start: int, length: int) -> DataSetBlock:
         start_idx = [0, 0, 0]
@@ -173,26 +232,14 @@ class StandardTomoLoader(DataSetSource):
 
         # Fill in numpy array with "before" and "after" padded areas needed for block
         if start_idx[self._slicing_dim] < 0:
-            extrapolate_before(
-                self._data,
-                block_data,
-                self._padding[0],
-                self._slicing_dim,
-                preview_config=self._preview.config,
-            )
+            self._extrapolate(block_data, before=True)
             before_extended_read = False
 
         if (
             start_idx[self._slicing_dim] + block_shape[self._slicing_dim]
             > self.global_shape[self._slicing_dim]
         ):
-            extrapolate_after(
-                self._data,
-                block_data,
-                self._padding[1],
-                self._slicing_dim,
-                preview_config=self._preview.config,
-            )
+            self._extrapolate(block_data, before=False)
             after_extended_read = False
 
         # Define slicing required to read the necessary parts from the h5py dataset (the core
@@ -279,10 +326,17 @@ class StandardTomoLoader(DataSetSource):
         )
         slices_write[self._slicing_dim] = slice(start_write_idx, stop_write_idx)
 
-        # Fill in numpy array with the core part of block + any padding from extended reads
-        block_data[slices_write[0], slices_write[1], slices_write[2]] = self._data[
-            slices_read[0], slices_read[1], slices_read[2]
-        ]
+        # Fill in numpy array with the core part of block + any padding from extended
+        # reads. The slices at the start that have already been read for the previous
+        # block are copied from the halo, and only the rest is read from the dataset.
+        dim = self._slicing_dim
+        block_start_read_idx = slices_read[dim].start - start_write_idx
+        range_read = (slices_read[dim].start, slices_read[dim].stop)
+        halo_stop = self._halo.fill(block_data, block_start_read_idx, *range_read)
+        slices_read[dim] = slice(halo_stop, range_read[1])
+        slices_write[dim] = slice(halo_stop - block_start_read_idx, stop_write_idx)
+        self._read_into_block(block_data, tuple(slices_read), tuple(slices_write))
+        self._halo.keep(block_data, block_start_read_idx, *range_read)
 
         padded_chunk_shape_list = list(self._chunk_shape)
         padded_chunk_shape_list[self._slicing_dim] += (
@@ -300,6 +354,134 @@ class StandardTomoLoader(DataSetSource):
             padding=self._padding,
         )
 
+    def _extrapolate(self, block_data: np.ndarray, before: bool):
+        """Fills the "before" or "after" padded area of the block with the first or last
+        slice of the previewed data respectively"""
+        dim = self._slicing_dim
+        padding = self._padding[0] if before else self._padding[1]
+        if dim == 0:
+            # the slice is a single frame of the file
+            extrapolate = extrapolate_before if before else extrapolate_after
+            extrapolate(
+                self._data,
+                block_data,
+                padding,
+                dim,
+                preview_config=self._preview.config,
+            )
+            return
+
+        # the slice spans all projections, which may be in several runs of frames
+        index = 0 if before else self._global_shape[dim] - 1
+        slices_read = [
+            slice(offset, offset + length)
+            for offset, length in zip(self._data_offset, self._global_shape)
+        ]
+        slices_read[dim] = slice(
+            self._data_offset[dim] + index, self._data_offset[dim] + index + 1
+        )
+        boundary_shape = list(block_data.shape)
+        boundary_shape[dim] = 1
+        boundary = np.empty(boundary_shape, dtype=block_data.dtype)
+        self._read_from_file(boundary, tuple(slices_read), (slice(None),) * 3)
+        slices_write: List[slice] = [slice(None)] * 3
+        if before:
+            slices_write[dim] = slice(0, padding)
+        else:
+            slices_write[dim] = slice(block_data.shape[dim] - padding, None)
+        block_data[tuple(slices_write)] = boundary
+
+    def _read_into_block(
+        self,
+        block_data: np.ndarray,
+        slices_read: Tuple[slice, ...],
+        slices_write: Tuple[slice, ...],
+    ):
+        """Reads a part of the dataset into the block - copied from the super-block if
+        super-blocks are read, otherwise directly"""
+        dim = self._slicing_dim
+        start, stop = slices_read[dim].start, slices_read[dim].stop
+        if stop - start >= self._super_block_slices or stop <= start:
+            self._read_from_file(block_data, slices_read, slices_write)
+            return
+
+        if (
+            self._super_block is None
+            or start < self._super_block_start
+            or stop > self._super_block_start + self._super_block.shape[dim]
+        ):
+            super_block_stop = max(
+                stop, min(start + self._super_block_slices, self._chunk_read_stop)
+            )
+            super_block_shape = list(block_data.shape)
+            super_block_shape[dim] = super_block_stop - start
+            # the previous super-block is released before the next one is allocated
+            self._super_block = None
+            super_block = np.empty(super_block_shape, dtype=block_data.dtype)
+            super_block_read = list(slices_read)
+            super_block_read[dim] = slice(start, super_block_stop)
+            self._read_from_file(
+                super_block, tuple(super_block_read), (slice(None),) * 3
+            )
+            self._super_block = super_block
+            self._super_block_start = start
+
+        slices_copy = [slice(None)] * 3
+        slices_copy[dim] = slice(
+            start - self._super_block_start, stop - self._super_block_start
+        )
+        block_data[slices_write] = self._super_block[tuple(slices_copy)]
+
+    def _read_from_file(
+        self,
+        block_data: np.ndarray,
+        slices_read: Tuple[slice, ...],
+        slices_write: Tuple[slice, ...],
+    ):
+        if self._read_comm is not None:
+            # tells the processes in `finish_reads` that there's another read
+            self._read_comm.allreduce(1)
+        collective = self._read_comm is not None
+        runs = self._file_runs(slices_read[0].start, slices_read[0].stop)
+        if len(runs) > 1:
+            read_runs_into_block(
+                self._data,
+                block_data,
+                0,
+                runs,
+                slices_read,
+                slices_write,
+                collective=collective,
+            )
+            return
+        if len(runs) == 1:
+            slices_read = (slice(*runs[0]),) + slices_read[1:]
+        read_into_block(
+            self._data, block_data, slices_read, slices_write, collective=collective
+        )
+
+    def _file_runs(self, start: int, stop: int) -> List[Tuple[int, int]]:
+        """The runs of consecutive frames in the file holding the projections in the
+        range [start, stop) (indexed from `self._data_offset[0]` as if they were
+        consecutive)"""
+        start -= self._data_offset[0]
+        stop -= self._data_offset[0]
+        runs: List[Tuple[int, int]] = []
+        if stop <= start:
+            return runs
+        run_starts = self._run_starts + [len(self._data_indices)]
+        first_run = bisect.bisect_right(run_starts, start) - 1
+        for run_start, run_stop in zip(
+            run_starts[first_run:], run_starts[first_run + 1 :]
+        ):
+            if run_start >= stop:
+                break
+            lo = max(start, run_start)
+            hi = min(stop, run_stop)
+            frame_offset = self._data_indices[run_start] - run_start
+            runs.append((lo + frame_offset, hi + frame_offset))
+        return runs
+
     def _get_angles(self) -> np.ndarray:
         if isinstance(self._angles, UserDefinedAngles):
             return np.linspace(
@@ -310,11 +492,57 @@ class StandardTomoLoader(DataSetSource):
 
         return self._h5file[self._angles.data_path][...]
 
+    def finish_reads(self):
+        """
+        To be called by every process after it has read all of its blocks. This releases
+        the last super-block and, with collective reads, takes part in the reads of the
+        processes which have blocks left (reading nothing) until all processes are done,
+        and then closes the file.
+
+        With collective reads, every read from the file is collective as well, and the
+        processes count them with an allreduce. So until they all get here, processes
+        must not enter any other collective operation between their reads that the
+        others may not reach in between the same reads (e.g. stopping to read after a
+        different number of blocks before a collective call), or they deadlock.
+        """
+        self._super_block = None
+        if self._read_comm is None:
+            return
+        empty_block = np.empty((1, 1, 1), dtype=self._data.dtype)
+        empty_slices = (slice(0, 0),) * 3
+        while self._read_comm.allreduce(0) > 0:
+            read_into_block(
+                self._data, empty_block, empty_slices, empty_slices, collective=True
+            )
+        # closing a file opened with the mpio driver is collective as well
+        self._h5file.close()
+        self._read_comm.Free()
+        self._read_comm = None
+
     def finalize(self):
         self._h5file.close()
 
     def _get_data(self) -> h5py.Dataset:
-        return self._h5file[self._data_path]
+        dataset: h5py.Dataset = self._h5file[self._data_path]
+        if self._slicing_dim == 0 or dataset.chunks is None:
+            return dataset
+
+        # The chunks of raw data typically hold (a part of) a frame each, so the blocks
+        # of other slicing dimensions read a bit of every chunk. The chunk cache is made
+        # to hold a layer of the chunks along the slicing dimension (if not too large),
+        # so that consecutive blocks sharing the same chunks only read and decompress
+        # them once.
+        cache_bytes, cache_slots = calculate_chunk_cache(
+            dataset.shape, dataset.chunks, dataset.dtype.itemsize, self._slicing_dim
+        )
+        # HDF5 ignores the access properties when opening a dataset which is open
+        # already, so the first handle has to be closed before reopening it
+        del dataset
+        dapl = h5py.h5p.create(h5py.h5p.DATASET_ACCESS)
+        dapl.set_chunk_cache(cache_slots, cache_bytes, 1.0)
+        return h5py.Dataset(
+            h5py.h5d.open(self._h5file.id, self._data_path.encode(), dapl=dapl)
+        )
 
     @property
     def aux_data(self) -> AuxiliaryData:
@@ -324,14 +552,31 @@ class StandardTomoLoader(DataSetSource):
         self,
         darks_config: DarksFlatsFileConfig,
         flats_config: DarksFlatsFileConfig,
+        aux_comm: MPI.Comm,
     ) -> AuxiliaryData:
-        angles_arr = np.deg2rad(self._get_angles())
-        darks_arr, flats_arr = get_darks_flats(
-            darks_config,
-            flats_config,
-            self._preview.config,
+        """
+        Reads the angles, darks and flats - with several processes, only the first one
+        reads them, and they are shared with the others through a single (read-only)
+        copy per node
+        """
+        angles_arr: Optional[np.ndarray] = None
+        darks_arr: Optional[np.ndarray] = None
+        flats_arr: Optional[np.ndarray] = None
+        if aux_comm.rank == 0:
+            angles_arr = np.deg2rad(self._get_angles())
+            darks_arr, flats_arr = get_darks_flats(
+                darks_config,
+                flats_config,
+                self._preview.config,
+            )
+        if aux_comm.size == 1:
+            assert angles_arr is not None
+            return AuxiliaryData(angles=angles_arr, darks=darks_arr, flats=flats_arr)
+        return AuxiliaryData(
+            angles=bcast_shared(angles_arr, aux_comm),
+            darks=bcast_shared(darks_arr, aux_comm),
+            flats=bcast_shared(flats_arr, aux_comm),
         )
-        return AuxiliaryData(angles=angles_arr, darks=darks_arr, flats=flats_arr)
 
     def _log_info(self) -> None:
         log_once(
@@ -374,8 +619,11 @@ class StandardLoaderWrapper(LoaderInterface):
         flats: DarksFlatsFileConfig,
         angles: AnglesConfig,
         preview: PreviewConfig,
+        collective_reads: Optional[Dict[str, str]] = None,
     ):
-        self.pattern = Pattern.projection
+        # the data can be loaded as projections or sinograms, whichever the first
+        # section needs (see `sectionize`)
+        self.pattern = Pattern.all
         self.method_name = "standard_tomo"
         self.package_name = "httomo"
         self._detector_x: int = 0
@@ -389,9 +637,12 @@ class StandardLoaderWrapper(LoaderInterface):
         self.flats = flats
         self.angles = angles
         self.preview = preview
+        self.collective_reads = collective_reads
 
-    def make_data_source(self, padding: Tuple[int, int] = (0, 0)) -> DataSetSource:
-        assert self.pattern in [Pattern.sinogram, Pattern.projection]
+    def make_data_source(
+        self, padding: Tuple[int, int] = (0, 0), comm: Optional[MPI.Comm] = None
+    ) -> DataSetSource:
+        # projections are loaded if no pattern has been set by sectionizing
         loader = StandardTomoLoader(
             in_file=self.in_file,
             data_path=self.data_path,
@@ -401,8 +652,11 @@ class StandardLoaderWrapper(LoaderInterface):
             angles=self.angles,
             preview_config=self.preview,
             slicing_dim=1 if self.pattern == Pattern.sinogram else 0,
-            comm=self.comm,
+            comm=self.comm if comm is None else comm,
             padding=padding,
+            collective_reads=self.collective_reads,
+            super_block_bytes=httomo.globals.LOADER_READ_BYTES,
+            aux_comm=self.comm,
         )
         (self._angles_total, self._detector_y, self._detector_x) = loader.global_shape
         return loader
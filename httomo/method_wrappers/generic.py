@@ -119,6 +119,7 @@ class GenericMethodWrapper(MethodWrapper):
         self._implementation = self._query.get_implementation()
         self._memory_gpu = self._query.get_memory_gpu_params()
         self._padding = self._query.padding()
+        self._block_parallel = self._query.block_parallel()
         self._save_result = (
             self._query.save_result_default() if save_result is None else save_result
         )
@@ -138,6 +139,10 @@ class GenericMethodWrapper(MethodWrapper):
     def comm(self) -> Comm:
         return self._comm
 
+    @comm.setter
+    def comm(self, comm: Comm):
+        self._comm = comm
+
     @property
     def method(self) -> Callable:
         return self._method
@@ -228,6 +233,10 @@ class GenericMethodWrapper(MethodWrapper):
     def padding(self) -> bool:
         return self._padding
 
+    @property
+    def block_parallel(self) -> bool:
+        return self._block_parallel
+
     @property
     def sweep(self) -> bool:
         return self._sweep
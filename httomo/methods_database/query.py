@@ -101,6 +101,15 @@ class MethodsDatabaseQuery(MethodQuery):
     def padding(self) -> bool:
         return get_method_info(self.module_path, self.method_name, "padding")
 
+    def block_parallel(self) -> bool:
+        # optional in the database - methods are only run concurrently if flagged
+        try:
+            return bool(
+                get_method_info(self.module_path, self.method_name, "block_parallel")
+            )
+        except KeyError:
+            return False
+
     def get_memory_gpu_params(
         self,
     ) -> Optional[GpuMemoryRequirement]:
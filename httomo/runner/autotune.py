@@ -0,0 +1,112 @@
+import json
+import logging
+from os import PathLike
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from mpi4py import MPI
+
+from httomo.utils import log_once
+
+
+class CpuBlockSizeTuner:
+    """Tunes the number of slices per block for CPU-only sections.
+
+    The first blocks of a section are processed with each of the candidate sizes in turn
+    and timed, and the size with the best throughput (slices per second, over all
+    processes) is used for the rest of the section. The chosen sizes are kept in a JSON
+    cache, keyed by pipeline, section and data shape, so that later runs of the same
+    pipeline on data of the same shape start with the tuned size straight away.
+    """
+
+    def __init__(
+        self,
+        cache_file: Optional[PathLike],
+        pipeline_hash: str,
+        comm: MPI.Comm,
+        factors: Tuple[float, ...] = (0.25, 0.5, 1, 2, 4),
+    ):
+        self._cache_file = Path(cache_file) if cache_file is not None else None
+        self._pipeline_hash = pipeline_hash
+        self._comm = comm
+        self._factors = factors
+        cache: Dict[str, int] = {}
+        if comm.rank == 0 and self._cache_file is not None:
+            if self._cache_file.exists():
+                with open(self._cache_file, "r") as f:
+                    cache = json.load(f)
+        self._cache: Dict[str, int] = comm.bcast(cache, root=0)
+
+    def key(
+        self,
+        section_index: int,
+        global_shape: Tuple[int, int, int],
+        dtype: np.dtype,
+    ) -> str:
+        # the global shape, as the chunk shape may differ between processes
+        shape = "x".join(str(s) for s in global_shape)
+        return (
+            f"{self._pipeline_hash}/section_{section_index}/{shape}/"
+            f"{np.dtype(dtype).name}/nprocs_{self._comm.size}"
+        )
+
+    def cached_slices(self, key: str) -> Optional[int]:
+        """The block size tuned by a previous run, if any"""
+        return self._cache.get(key)
+
+    def candidate_slices(self, max_slices: int, upper_bound: int) -> List[int]:
+        """Block sizes to try, around the given default and capped by `upper_bound`
+        (e.g. the chunk size or the memory limit)"""
+        candidates = {
+            max(1, min(upper_bound, int(max_slices * factor)))
+            for factor in self._factors
+        }
+        return sorted(candidates)
+
+    def select(
+        self, slices: List[int], elapsed: List[Optional[float]]
+    ) -> Optional[int]:
+        """Selects the size with the best throughput across all processes, from the sizes
+        tried and the time each took (None if it couldn't be tried, e.g. because the
+        chunk was too small). Only sizes every process has tried are considered.
+
+        This is collective - all processes get the same result."""
+        local = np.zeros((3, len(slices)), dtype=np.float64)
+        for i, (n, t) in enumerate(zip(slices, elapsed)):
+            if t is not None:
+                local[:, i] = (n, t, 1)
+        total = np.zeros_like(local)
+        self._comm.Allreduce(local, total, MPI.SUM)
+
+        tried_by_all = total[2] == self._comm.size
+        if not np.any(tried_by_all):
+            return None
+        throughput = np.full(len(slices), -1.0)
+        throughput[tried_by_all] = total[0][tried_by_all] / np.maximum(
+            total[1][tried_by_all], 1e-9
+        )
+        best = slices[int(np.argmax(throughput))]
+        log_once(
+            "Block size throughputs (slices/s): "
+            + ", ".join(f"{n}: {t:.1f}" for n, t in zip(slices, throughput) if t >= 0),
+            level=logging.DEBUG,
+        )
+        return best
+
+    def store(self, key: str, slices: int):
+        """Saves the tuned block size in the cache"""
+        self._cache[key] = slices
+        if self._comm.rank != 0 or self._cache_file is None:
+            return
+        # other runs may have added to the cache since we read it
+        cache: Dict[str, int] = {}
+        if self._cache_file.exists():
+            with open(self._cache_file, "r") as f:
+                cache = json.load(f)
+        cache[key] = slices
+        self._cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._cache_file.with_name(f"{self._cache_file.name}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(cache, f, indent=2)
+        tmp_path.replace(self._cache_file)
@@ -1,5 +1,9 @@
 import math
-from typing import Iterator
+from typing import Iterator, Optional
+
+import numpy as np
+from mpi4py import MPI
+
 from httomo.runner.dataset import DataSetBlock
 from httomo.runner.dataset_store_interfaces import DataSetSource
 import logging
@@ -18,13 +22,16 @@ class BlockSplitter:
     Where a block is a DataSet instance.
 
     Note that a slice of the data is returned and no copy is made.
+
+    If a `start` is given, the blocks only cover the chunk from that slice onwards.
     """
 
-    def __init__(self, source: DataSetSource, max_slices: int):
+    def __init__(self, source: DataSetSource, max_slices: int, start: int = 0):
         self._source = source
         self._chunk_size = source.chunk_shape[source.slicing_dim]
-        self._max_slices = int(min(max_slices, self._chunk_size))
-        self._num_blocks = math.ceil(self._chunk_size / self._max_slices)
+        self._start = start
+        self._max_slices = int(min(max_slices, max(self._chunk_size - start, 1)))
+        self._num_blocks = math.ceil((self._chunk_size - start) / self._max_slices)
         assert self._source.slicing_dim in [
             0,
             1,
@@ -38,7 +45,7 @@ class BlockSplitter:
         return self._num_blocks
 
     def __getitem__(self, idx: int) -> DataSetBlock:
-        start = idx * self.slices_per_block
+        start = self._start + idx * self.slices_per_block
         if start >= self._chunk_size:
             raise IndexError("Index out of bounds")
         len = min(self.slices_per_block, self._chunk_size - start)
@@ -61,3 +68,70 @@ class BlockSplitter:
                 return v
 
         return BlockIterator(self)
+
+
+class DynamicBlockSplitter:
+    """Produces blocks from a DataSetSource covering the whole global data (e.g. a
+    loader created for a single process), handing the blocks out to the processes of the
+    communicator at runtime rather than splitting the data statically.
+
+    Each process starts with the block of its own rank, and then pulls the index of its
+    next block from a shared counter (an MPI one-sided window on rank 0) until all blocks
+    have been handed out, so faster processes end up processing more blocks. It can be
+    iterated like a BlockSplitter, but the length is the total number of blocks across
+    all processes. With fewer blocks than processes, the last processes get none.
+
+    `finalize` must be called by all processes once they have finished iterating.
+    """
+
+    def __init__(self, source: DataSetSource, max_slices: int, comm: MPI.Comm):
+        self._source = source
+        self._comm = comm
+        self._chunk_size = source.chunk_shape[source.slicing_dim]
+        self._max_slices = int(min(max_slices, self._chunk_size))
+        self._num_blocks = math.ceil(self._chunk_size / self._max_slices)
+        assert self._source.slicing_dim in [
+            0,
+            1,
+        ], "Only supporting slicing in projection and sinogram dimension"
+        # the first block of every process is handed out statically
+        self._counter = np.array([comm.size] if comm.rank == 0 else [], dtype=np.int64)
+        self._win: Optional[MPI.Win] = MPI.Win.Create(
+            self._counter, disp_unit=self._counter.itemsize, comm=comm
+        )
+
+    @property
+    def slices_per_block(self) -> int:
+        return self._max_slices
+
+    def __len__(self):
+        return self._num_blocks
+
+    def __getitem__(self, idx: int) -> DataSetBlock:
+        start = idx * self.slices_per_block
+        if start >= self._chunk_size:
+            raise IndexError("Index out of bounds")
+        len = min(self.slices_per_block, self._chunk_size - start)
+        return self._source.read_block(start, len)
+
+    def __iter__(self) -> Iterator[DataSetBlock]:
+        idx = self._comm.rank
+        while idx < self._num_blocks:
+            yield self[idx]
+            idx = self._next_index()
+
+    def _next_index(self) -> int:
+        assert self._win is not None, "Splitter has been finalized"
+        increment = np.ones(1, dtype=np.int64)
+        result = np.empty(1, dtype=np.int64)
+        self._win.Lock(0, MPI.LOCK_SHARED)
+        self._win.Fetch_and_op(
+            [increment, MPI.INT64_T], [result, MPI.INT64_T], 0, 0, MPI.SUM
+        )
+        self._win.Unlock(0)
+        return int(result[0])
+
+    def finalize(self):
+        if self._win is not None:
+            self._win.Free()
+            self._win = None
@@ -0,0 +1,271 @@
+import hashlib
+import json
+import logging
+import pickle
+from os import PathLike
+from pathlib import Path
+from typing import Any, Dict, Literal, Optional, Tuple
+
+import h5py
+import numpy as np
+from mpi4py import MPI
+
+from httomo.runner.auxiliary_data import AuxiliaryData
+from httomo.runner.dataset import DataSetBlock
+from httomo.runner.dataset_store_interfaces import (
+    DataSetSink,
+    DataSetSource,
+    ReadableDataSetSink,
+)
+from httomo.utils import log_once, make_3d_shape_from_shape
+
+
+def pipeline_hash(yaml_config: PathLike) -> str:
+    """Hash of a pipeline configuration file, to identify checkpoints written for it"""
+    with open(yaml_config, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class SectionCheckpoint:
+    """Persists the output of completed pipeline sections, so that a failed run can be
+    resumed from the last completed section rather than from the loader.
+
+    For every checkpointed section, each process writes its chunk of the section's
+    output to its own hdf5 file (block by block, while the section is running), and
+    pickles the side outputs and auxiliary data it holds once the section has
+    finished. A manifest in the checkpoint directory records how many sections have
+    been completed, together with the pipeline hash, input file and number of processes
+    it is valid for - a checkpoint is only used to resume a run with the same key.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(
+        self,
+        directory: PathLike,
+        pipeline_hash: str,
+        input_file: PathLike,
+        comm: MPI.Comm,
+    ):
+        self._directory = Path(directory)
+        self._comm = comm
+        self._key = {
+            "pipeline_hash": pipeline_hash,
+            "input_file": str(Path(input_file).resolve()),
+            "nprocs": comm.size,
+        }
+        if comm.rank == 0:
+            self._directory.mkdir(parents=True, exist_ok=True)
+        comm.barrier()
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    def completed_sections(self) -> int:
+        """Number of sections that have been completed by a previous run with the same
+        pipeline, input file and number of processes (0 if there is no such run)"""
+        manifest: Optional[Dict[str, Any]] = None
+        if self._comm.rank == 0:
+            manifest_path = self._directory / self.MANIFEST
+            if manifest_path.exists():
+                with open(manifest_path, "r") as f:
+                    manifest = json.load(f)
+        manifest = self._comm.bcast(manifest, root=0)
+        if manifest is None:
+            return 0
+        if manifest["key"] != self._key:
+            log_once(
+                f"Checkpoint in {self._directory} was written for a different pipeline, "
+                "input file or number of processes - ignoring it",
+                level=logging.WARNING,
+            )
+            return 0
+        return manifest["completed_sections"]
+
+    def make_sink(self, sink: ReadableDataSetSink, section_index: int) -> DataSetSink:
+        """Wraps the sink of a section so that the blocks written to it are also
+        written to the checkpoint"""
+        return CheckpointingSink(sink, self._chunk_file(section_index))
+
+    def commit(
+        self,
+        section_index: int,
+        sink: DataSetSink,
+        side_outputs: Dict[str, Any],
+        method_side_outputs: Dict[str, Dict[str, Any]],
+    ):
+        """Marks a section as completed, once all of its blocks have been written to
+        the given sink (as returned by `make_sink`).
+
+        The side outputs of the runner and of the individual methods (by task id) are
+        saved along with the auxiliary data, for the sections that follow."""
+        assert isinstance(sink, CheckpointingSink)
+        sink.close()
+        state = {
+            "side_outputs": side_outputs,
+            "method_side_outputs": method_side_outputs,
+            "angles": sink.aux_data.get_angles(),
+            "darks": sink.aux_data.get_darks(),
+            "flats": sink.aux_data.get_flats(),
+        }
+        with open(self._state_file(section_index), "wb") as f:
+            pickle.dump(state, f)
+
+        # only update the manifest once every process has written its files
+        self._comm.barrier()
+        if self._comm.rank == 0:
+            manifest = {"key": self._key, "completed_sections": section_index + 1}
+            tmp_path = self._directory / f"{self.MANIFEST}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(manifest, f, indent=2)
+            tmp_path.replace(self._directory / self.MANIFEST)
+        log_once(
+            f"Checkpoint for section {section_index} written to {self._directory}",
+            level=logging.DEBUG,
+        )
+
+    def stored_shape_and_dtype(
+        self, section_index: int
+    ) -> Tuple[Tuple[int, int, int], np.dtype]:
+        """Global shape and data type of the data checkpointed for the given section"""
+        with h5py.File(self._chunk_file(section_index), "r") as f:
+            dataset = f["data"]
+            return (
+                make_3d_shape_from_shape(list(dataset.attrs["global_shape"])),
+                dataset.dtype,
+            )
+
+    def restore(
+        self, section_index: int, sink: DataSetSink, max_slices: int
+    ) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """Writes the data checkpointed for the given section into the sink, in blocks of
+        at most `max_slices` slices, and returns the saved side outputs of the runner
+        and of the individual methods (by task id)"""
+        with open(self._state_file(section_index), "rb") as f:
+            state = pickle.load(f)
+        aux_data = AuxiliaryData(
+            angles=state["angles"], darks=state["darks"], flats=state["flats"]
+        )
+
+        with h5py.File(self._chunk_file(section_index), "r") as f:
+            dataset = f["data"]
+            slicing_dim: Literal[0, 1, 2] = int(dataset.attrs["slicing_dim"])  # type: ignore
+            global_shape = make_3d_shape_from_shape(list(dataset.attrs["global_shape"]))
+            chunk_start = int(dataset.attrs["global_index"][slicing_dim])
+            chunk_shape = make_3d_shape_from_shape(list(dataset.shape))
+            chunk_length = chunk_shape[slicing_dim]
+            for start in range(0, chunk_length, max_slices):
+                slices = [slice(None), slice(None), slice(None)]
+                slices[slicing_dim] = slice(
+                    start, min(start + max_slices, chunk_length)
+                )
+                sink.write_block(
+                    DataSetBlock(
+                        data=dataset[slices[0], slices[1], slices[2]],
+                        aux_data=aux_data,
+                        slicing_dim=slicing_dim,
+                        block_start=start,
+                        chunk_start=chunk_start,
+                        global_shape=global_shape,
+                        chunk_shape=chunk_shape,
+                    )
+                )
+
+        log_once(
+            f"Restored the output of section {section_index} from {self._directory}",
+            level=logging.INFO,
+        )
+        return state["side_outputs"], state["method_side_outputs"]
+
+    def _chunk_file(self, section_index: int) -> Path:
+        return (
+            self._directory
+            / f"section_{section_index:02d}_rank_{self._comm.rank:04d}.hdf5"
+        )
+
+    def _state_file(self, section_index: int) -> Path:
+        return (
+            self._directory
+            / f"section_{section_index:02d}_rank_{self._comm.rank:04d}.pickle"
+        )
+
+
+class CheckpointingSink(ReadableDataSetSink):
+    """Sink that passes blocks on to another sink, and also writes them to this
+    process' checkpoint file"""
+
+    def __init__(self, sink: ReadableDataSetSink, filename: Path):
+        self._sink = sink
+        self._filename = filename
+        self._h5file: Optional[h5py.File] = None
+        self._dataset: Optional[h5py.Dataset] = None
+        self._aux_data: Optional[AuxiliaryData] = None
+
+    @property
+    def global_shape(self) -> Tuple[int, int, int]:
+        return self._sink.global_shape
+
+    @property
+    def chunk_shape(self) -> Tuple[int, int, int]:
+        return self._sink.chunk_shape
+
+    @property
+    def global_index(self) -> Tuple[int, int, int]:
+        return self._sink.global_index
+
+    @property
+    def slicing_dim(self) -> Literal[0, 1, 2]:
+        return self._sink.slicing_dim
+
+    @property
+    def aux_data(self) -> AuxiliaryData:
+        assert self._aux_data is not None, "No blocks have been written yet"
+        return self._aux_data
+
+    @property
+    def filename(self) -> Path:
+        return self._filename
+
+    def write_block(self, block: DataSetBlock):
+        self._sink.write_block(block)
+        block.to_cpu()
+        if self._dataset is None:
+            self._aux_data = block.aux_data
+            self._h5file = h5py.File(self._filename, "w")
+            self._dataset = self._h5file.create_dataset(
+                "data", block.chunk_shape_unpadded, block.data.dtype
+            )
+            chunk_start = list(block.global_index_unpadded)
+            chunk_start[block.slicing_dim] -= block.chunk_index_unpadded[
+                block.slicing_dim
+            ]
+            self._dataset.attrs["global_shape"] = block.global_shape
+            self._dataset.attrs["global_index"] = chunk_start
+            self._dataset.attrs["slicing_dim"] = block.slicing_dim
+
+        slices = [slice(None), slice(None), slice(None)]
+        start = block.chunk_index_unpadded[block.slicing_dim]
+        slices[block.slicing_dim] = slice(
+            start, start + block.shape_unpadded[block.slicing_dim]
+        )
+        self._dataset[slices[0], slices[1], slices[2]] = block.data_unpadded
+
+    def close(self):
+        if self._h5file is not None:
+            self._h5file.close()
+            self._h5file = None
+            self._dataset = None
+
+    def finalize(self):
+        self.close()
+        self._sink.finalize()
+
+    def make_reader(
+        self,
+        new_slicing_dim: Optional[Literal[0, 1, 2]] = None,
+        padding: Optional[Tuple[int, int]] = None,
+        active_comm: Optional[MPI.Comm] = None,
+    ) -> DataSetSource:
+        self.close()
+        return self._sink.make_reader(new_slicing_dim, padding, active_comm)
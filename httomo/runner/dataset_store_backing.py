@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Callable, List, ParamSpec, Tuple
+from typing import Callable, List, Optional, ParamSpec, Tuple
 
 import numpy as np
 from numpy.typing import DTypeLike
@@ -18,8 +18,23 @@ def calculate_section_chunk_shape(
     """
     Calculate chunk shape (w/ or w/o padding) for a section.
     """
-    start = round((global_shape[slicing_dim] / comm.size) * comm.rank)
-    stop = round((global_shape[slicing_dim] / comm.size) * (comm.rank + 1))
+    return calculate_chunk_shape(
+        global_shape, slicing_dim, padding, nprocs=comm.size, rank=comm.rank
+    )
+
+
+def calculate_chunk_shape(
+    global_shape: Tuple[int, int, int],
+    slicing_dim: int,
+    padding: Tuple[int, int],
+    nprocs: int,
+    rank: int,
+) -> Tuple[int, int, int]:
+    """
+    Calculate chunk shape (w/ or w/o padding) of the given rank, out of `nprocs` processes.
+    """
+    start = round((global_shape[slicing_dim] / nprocs) * rank)
+    stop = round((global_shape[slicing_dim] / nprocs) * (rank + 1))
     section_slicing_dim_len = stop - start
     shape = list(global_shape)
     shape[slicing_dim] = section_slicing_dim_len + padding[0] + padding[1]
@@ -36,8 +51,20 @@ def calculate_section_chunk_bytes(
     accounts for data's non-slicing dims changing during processing, which changes the chunk
     shape for the section and thus affects the number of bytes in the chunk.
     """
+    output_shape = calculate_section_output_shape(chunk_shape, section)
+    return int(np.prod(output_shape) * np.dtype(dtype).itemsize)
+
+
+def calculate_section_output_shape(
+    shape: Tuple[int, int, int],
+    section: Section,
+) -> Tuple[int, int, int]:
+    """
+    Calculate the shape of the data output by a section for the given input shape, taking
+    into account the changes to the non-slicing dims made by the methods in the section.
+    """
     slicing_dim = _get_slicing_dim(section.pattern) - 1
-    non_slice_dims_list = list(chunk_shape)
+    non_slice_dims_list = list(shape)
     non_slice_dims_list.pop(slicing_dim)
     non_slice_dims = (non_slice_dims_list[0], non_slice_dims_list[1])
 
@@ -46,14 +73,41 @@ def calculate_section_chunk_bytes(
             continue
         non_slice_dims = method.calculate_output_dims(non_slice_dims)
 
-    return int(
-        np.prod(non_slice_dims) * chunk_shape[slicing_dim] * np.dtype(dtype).itemsize
-    )
+    output_shape = list(non_slice_dims)
+    output_shape.insert(slicing_dim, shape[slicing_dim])
+    return make_3d_shape_from_shape(output_shape)
 
 
 class DataSetStoreBacking(Enum):
     RAM = 1
     File = 2
+    # raw memory-mapped file, an alternative to `File` that doesn't need parallel HDF5
+    Mmap = 3
+    # chunk held in memory as compressed tiles
+    CompressedRAM = 4
+    # as much of the chunk in memory as fits, with the rest in a scratch file of the
+    # process - an alternative to `File` that only spills what doesn't fit
+    Hybrid = 5
+    # the chunk in a scratch file of the process - an alternative to `File` that doesn't
+    # share the file, so that it can be on node-local storage
+    LocalFile = 6
+
+
+# store backings in the order of preference when they are reduced across processes - if
+# any process needs a file, all use one, and otherwise all compress if any has to
+_BACKING_SEVERITY = [
+    DataSetStoreBacking.RAM,
+    DataSetStoreBacking.CompressedRAM,
+    DataSetStoreBacking.File,
+]
+
+
+def reduce_store_backings(backings: List[DataSetStoreBacking]) -> DataSetStoreBacking:
+    """
+    Reduce the store backings needed by the individual processes to the one they all
+    use.
+    """
+    return max(backings, key=_BACKING_SEVERITY.index)
 
 
 P = ParamSpec("P")
@@ -79,21 +133,18 @@ def _reduce_decorator_factory(
             Perform store-backing calculation across all MPI processes and reduce.
             """
             # reduce store backing enum variant across all processes - if any has
-            # `File` variant, all should use a file
-            send_buffer = np.zeros(1, dtype=bool)
-            recv_buffer = np.zeros(1, dtype=bool)
+            # `File` variant, all should use a file (see `reduce_store_backings`)
+            send_buffer = np.zeros(1, dtype=np.int32)
+            recv_buffer = np.zeros(1, dtype=np.int32)
             store_backing = func(*args, **kwargs)
+            send_buffer[0] = _BACKING_SEVERITY.index(store_backing)
 
-            if store_backing is DataSetStoreBacking.File:
-                send_buffer[0] = True
+            # take the most severe of the enum variants across the processes
+            comm.Allreduce(
+                [send_buffer, MPI.INT32_T], [recv_buffer, MPI.INT32_T], MPI.MAX
+            )
 
-            # do a logical or of all the enum variants across the processes
-            comm.Allreduce([send_buffer, MPI.BOOL], [recv_buffer, MPI.BOOL], MPI.LOR)
-
-            if bool(recv_buffer[0]) is True:
-                return DataSetStoreBacking.File
-
-            return DataSetStoreBacking.RAM
+            return _BACKING_SEVERITY[int(recv_buffer[0])]
 
         return wrapper
 
@@ -104,14 +155,23 @@ def _non_last_section_in_pipeline(
     memory_limit_bytes: int,
     write_chunk_bytes: int,
     read_chunk_bytes: int,
+    compression_ratio: float = 0.0,
 ) -> DataSetStoreBacking:
     """
-    Calculate backing of dataset store for non-last sections in pipeline
+    Calculate backing of dataset store for non-last sections in pipeline. If the chunks
+    don't fit into memory, but would once compressed by `compression_ratio` (if
+    non-zero), they are kept in memory compressed rather than in a file.
     """
     if (
         memory_limit_bytes > 0
         and write_chunk_bytes + read_chunk_bytes >= memory_limit_bytes
     ):
+        if (
+            compression_ratio > 0
+            and (write_chunk_bytes + read_chunk_bytes) / compression_ratio
+            < memory_limit_bytes
+        ):
+            return DataSetStoreBacking.CompressedRAM
         return DataSetStoreBacking.File
 
     return DataSetStoreBacking.RAM
@@ -137,15 +197,51 @@ def determine_store_backing(
     dtype: DTypeLike,
     global_shape: Tuple[int, int, int],
     section_idx: int,
+    nprocs: Optional[int] = None,
+    compression_ratio: float = 0.0,
 ) -> DataSetStoreBacking:
+    """
+    Determine the store backing for the output of a section, reduced across the processes
+    of `comm`. If the section runs on the first `nprocs` processes only, the chunk
+    shapes are calculated for these (the others predict the backing of process 0).
+    """
+    if nprocs is None:
+        nprocs = comm.size
     reduce_decorator = _reduce_decorator_factory(comm)
+    return reduce_decorator(calculate_store_backing)(
+        nprocs=nprocs,
+        rank=comm.rank if comm.rank < nprocs else 0,
+        sections=sections,
+        memory_limit_bytes=memory_limit_bytes,
+        dtype=dtype,
+        global_shape=global_shape,
+        section_idx=section_idx,
+        compression_ratio=compression_ratio,
+    )
+
 
+def calculate_store_backing(
+    nprocs: int,
+    rank: int,
+    sections: List[Section],
+    memory_limit_bytes: int,
+    dtype: DTypeLike,
+    global_shape: Tuple[int, int, int],
+    section_idx: int,
+    compression_ratio: float = 0.0,
+) -> DataSetStoreBacking:
+    """
+    Calculate the store backing the given rank (out of `nprocs` processes) needs for the
+    output of a section. Unlike `determine_store_backing`, this does not reduce across
+    the processes, so it can be used to predict the backing without running under MPI.
+    """
     # Get chunk shape input to section
-    current_chunk_shape = calculate_section_chunk_shape(
-        comm=comm,
+    current_chunk_shape = calculate_chunk_shape(
         global_shape=global_shape,
         slicing_dim=_get_slicing_dim(sections[section_idx].pattern) - 1,
         padding=(0, 0),
+        nprocs=nprocs,
+        rank=rank,
     )
 
     # Get the number of bytes in the input chunk to the section w/ potential modifications to
@@ -157,22 +253,24 @@ def determine_store_backing(
     )
 
     if section_idx == len(sections) - 1:
-        return reduce_decorator(_last_section_in_pipeline)(
+        return _last_section_in_pipeline(
             memory_limit_bytes=memory_limit_bytes,
             write_chunk_bytes=current_chunk_bytes,
         )
 
     # Get chunk shape created by reader of section `n+1`, that will add padding to the
     # chunk shape written by the writer of section `n`
-    next_chunk_shape = calculate_section_chunk_shape(
-        comm=comm,
+    next_chunk_shape = calculate_chunk_shape(
         global_shape=global_shape,
         slicing_dim=_get_slicing_dim(sections[section_idx + 1].pattern) - 1,
         padding=determine_section_padding(sections[section_idx + 1]),
+        nprocs=nprocs,
+        rank=rank,
     )
     next_chunk_bytes = int(np.prod(next_chunk_shape) * np.dtype(dtype).itemsize)
-    return reduce_decorator(_non_last_section_in_pipeline)(
+    return _non_last_section_in_pipeline(
         memory_limit_bytes=memory_limit_bytes,
         write_chunk_bytes=current_chunk_bytes,
         read_chunk_bytes=next_chunk_bytes,
+        compression_ratio=compression_ratio,
     )
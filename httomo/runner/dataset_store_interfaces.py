@@ -1,5 +1,6 @@
 import abc
 from typing import Literal, Optional, Protocol, Tuple
+from mpi4py import MPI
 import numpy as np
 
 from httomo.runner.dataset import DataSetBlock
@@ -135,10 +136,14 @@ class ReadableDataSetSink(DataSetSink):
 
     @abc.abstractmethod
     def make_reader(
-        self, new_slicing_dim: Optional[Literal[0, 1, 2]] = None
+        self,
+        new_slicing_dim: Optional[Literal[0, 1, 2]] = None,
+        padding: Optional[Tuple[int, int]] = None,
+        active_comm: Optional[MPI.Comm] = None,
     ) -> DataSetSource:
         """Method to make a source from this sink, which will read the data that was written,
-        possibly in a new slicing dimension"""
+        possibly in a new slicing dimension and with padding slices around each block,
+        and possibly by a subset of the processes only (`active_comm`)"""
         ...  # pragma: no cover
 
 
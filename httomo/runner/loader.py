@@ -1,4 +1,6 @@
-from typing import Protocol, Tuple
+from typing import Optional, Protocol, Tuple
+
+from mpi4py import MPI
 
 from httomo.runner.dataset_store_interfaces import DataSetSource
 from httomo.utils import Pattern
@@ -13,11 +15,17 @@ class LoaderInterface(Protocol):
     method_name: str
     package_name: str = "httomo"
 
-    def make_data_source(self, padding: Tuple[int, int]) -> DataSetSource:
+    def make_data_source(
+        self, padding: Tuple[int, int], comm: Optional[MPI.Comm] = None
+    ) -> DataSetSource:
         """Create a dataset source that can produce padded blocks of data from the file.
 
         This will be called after the patterns and sections have been determined,
-        just before the execution of the first section starts."""
+        just before the execution of the first section starts.
+
+        The data is split into chunks across the processes of `comm` (by default, the
+        communicator the loader has been created with) - given `MPI.COMM_SELF`, the
+        source can read blocks from anywhere in the data."""
         ...  # pragma: no cover
 
     @property
@@ -45,12 +45,18 @@ class MethodWrapper(Protocol):
     task_id: str
     pattern: Pattern
 
-    # read-only properties
     @property
     def comm(self) -> MPI.Comm:
         """The MPI communicator used"""
         ...  # pragma: no cover
 
+    @comm.setter
+    def comm(self, comm: MPI.Comm):
+        """Set the MPI communicator, e.g. to run the method on a subset of the processes"""
+        ...  # pragma: no cover
+
+    # read-only properties
+
     @property
     def method(self) -> Callable:
         """The actual method underlying this wrapper"""
@@ -132,6 +138,11 @@ class MethodWrapper(Protocol):
         """Determine if the method needs padding"""
         ...  # pragma: nocover
 
+    @property
+    def block_parallel(self) -> bool:
+        """Determine if the method can process several blocks concurrently"""
+        ...  # pragma: nocover
+
     @property
     def sweep(self) -> bool:
         """Determine if the method performs sweep"""
@@ -50,6 +50,11 @@ class MethodQuery(Protocol):
         regions in slicing dimension)"""
         ...  # pragma: no cover
 
+    def block_parallel(self) -> bool:
+        """Check if several blocks can be processed by the method concurrently (i.e. it
+        runs on the CPU, keeps no state between blocks and doesn't use MPI)"""
+        ...  # pragma: no cover
+
     def calculate_memory_bytes(
         self, non_slice_dims_shape: Tuple[int, int], dtype: np.dtype, **kwargs
     ) -> Tuple[int, int]:
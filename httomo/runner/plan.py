@@ -0,0 +1,246 @@
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import h5py
+import numpy as np
+from numpy.typing import DTypeLike
+
+from httomo.loaders.standard_tomo_loader import StandardLoaderWrapper
+from httomo.preview import Preview
+from httomo.runner.dataset_store_backing import (
+    DataSetStoreBacking,
+    calculate_chunk_shape,
+    calculate_section_chunk_bytes,
+    calculate_section_output_shape,
+    calculate_store_backing,
+    reduce_store_backings,
+)
+from httomo.runner.pipeline import Pipeline
+from httomo.runner.section import (
+    calculate_section_max_slices,
+    determine_section_padding,
+    section_has_gpu_methods,
+    sectionize,
+)
+from httomo.utils import Pattern, _get_slicing_dim
+
+# the data is converted to float32 by the methods of the first section, so this is what
+# the stores of all following sections hold
+STORE_DTYPE = np.dtype("float32")
+
+
+class RankCountPlan(NamedTuple):
+    """Predictions for a section when running with a given number of processes"""
+
+    nprocs: int
+    max_slices: Optional[int]
+    """Slices per block (excluding padding), or None if the GPU memory is unknown"""
+    chunk_bytes: int
+    """Largest output chunk of a single process in the section, in bytes"""
+    store_backing: Optional[DataSetStoreBacking]
+    """Backing of the store the section writes to (None for the last section)"""
+    reslice_bytes: int
+    """Bytes moved to reslice the output for the next section - between processes for
+    RAM-backed stores, or written to and read from the file for file-backed stores"""
+
+
+class SectionPlan(NamedTuple):
+    index: int
+    pattern: Pattern
+    methods: List[str]
+    padding: Tuple[int, int]
+    global_shape: Tuple[int, int, int]
+    """Global shape of the data input to the section"""
+    dtype: np.dtype
+    """Data type of the data input to the section"""
+    rank_counts: Dict[int, RankCountPlan]
+
+
+def loader_global_shape_and_dtype(
+    loader: StandardLoaderWrapper,
+) -> Tuple[Tuple[int, int, int], np.dtype]:
+    """Determines the global shape (after previewing) and the data type of the data the
+    loader would load, without loading it"""
+    with h5py.File(loader.in_file, "r") as f:
+        dataset = f[loader.data_path]
+        preview = Preview(
+            preview_config=loader.preview,
+            dataset=dataset,
+            image_key=(
+                f[loader.image_key_path] if loader.image_key_path is not None else None
+            ),
+        )
+        return preview.global_shape, dataset.dtype
+
+
+def plan_pipeline(
+    pipeline: Pipeline,
+    global_shape: Tuple[int, int, int],
+    dtype: DTypeLike,
+    nprocs: List[int],
+    memory_limit_bytes: int = 0,
+    gpu_memory_bytes: Optional[int] = None,
+    compression_ratio: float = 0.0,
+) -> List[SectionPlan]:
+    """Predicts how the task runner would execute the pipeline on data of the given
+    global shape and type, for each of the given numbers of processes.
+
+    This mirrors the decisions of the runner (sections, block sizes, store backing) without
+    processing any data. The available GPU memory is taken from `gpu_memory_bytes`, as
+    for the runner it's limited by the memory limit - if it's not given, the block size of
+    GPU sections can't be predicted."""
+    sections = sectionize(pipeline)
+    plans: List[SectionPlan] = []
+    for idx, section in enumerate(sections):
+        slicing_dim = _get_slicing_dim(section.pattern) - 1
+        padding = determine_section_padding(section)
+        output_shape = calculate_section_output_shape(global_shape, section)
+
+        available_memory = gpu_memory_bytes
+        if available_memory is not None and memory_limit_bytes != 0:
+            available_memory = min(available_memory, memory_limit_bytes)
+
+        rank_counts: Dict[int, RankCountPlan] = {}
+        for n in nprocs:
+            max_slices: Optional[int] = None
+            if available_memory is not None or not section_has_gpu_methods(section):
+                chunk_shape = calculate_chunk_shape(
+                    global_shape, slicing_dim, padding, nprocs=n, rank=0
+                )
+                max_slices = calculate_section_max_slices(
+                    section, chunk_shape, slicing_dim, available_memory or 0
+                )
+                max_slices -= padding[0] + padding[1]
+
+            chunk_bytes = max(
+                calculate_section_chunk_bytes(
+                    calculate_chunk_shape(
+                        global_shape, slicing_dim, (0, 0), nprocs=n, rank=rank
+                    ),
+                    dtype,
+                    section,
+                )
+                for rank in range(n)
+            )
+
+            store_backing: Optional[DataSetStoreBacking] = None
+            reslice_bytes = 0
+            if not section.is_last:
+                backings = [
+                    calculate_store_backing(
+                        nprocs=n,
+                        rank=rank,
+                        sections=sections,
+                        memory_limit_bytes=memory_limit_bytes,
+                        dtype=dtype,
+                        global_shape=global_shape,
+                        section_idx=idx,
+                        compression_ratio=compression_ratio,
+                    )
+                    for rank in range(n)
+                ]
+                store_backing = reduce_store_backings(backings)
+                next_slicing_dim = _get_slicing_dim(sections[idx + 1].pattern) - 1
+                reslice_bytes = calculate_reslice_bytes(
+                    output_shape,
+                    STORE_DTYPE,
+                    slicing_dim,
+                    next_slicing_dim,
+                    n,
+                    store_backing,
+                )
+
+            rank_counts[n] = RankCountPlan(
+                nprocs=n,
+                max_slices=max_slices,
+                chunk_bytes=chunk_bytes,
+                store_backing=store_backing,
+                reslice_bytes=reslice_bytes,
+            )
+
+        plans.append(
+            SectionPlan(
+                index=idx,
+                pattern=section.pattern,
+                methods=[m.method_name for m in section],
+                padding=padding,
+                global_shape=global_shape,
+                dtype=np.dtype(dtype),
+                rank_counts=rank_counts,
+            )
+        )
+        global_shape = output_shape
+        dtype = STORE_DTYPE
+
+    return plans
+
+
+def calculate_reslice_bytes(
+    global_shape: Tuple[int, int, int],
+    dtype: DTypeLike,
+    slicing_dim: int,
+    next_slicing_dim: int,
+    nprocs: int,
+    store_backing: DataSetStoreBacking,
+) -> int:
+    """Calculates the bytes moved when the data is resliced from `slicing_dim` to
+    `next_slicing_dim`.
+
+    With a file-backed store, all data is written to the file and read back. In memory,
+    each process keeps the part of its chunk that is also in its next chunk, and sends
+    the rest to the other processes."""
+    if slicing_dim == next_slicing_dim:
+        return 0
+    total_bytes = int(np.prod(global_shape)) * np.dtype(dtype).itemsize
+    if store_backing in [DataSetStoreBacking.File, DataSetStoreBacking.Mmap]:
+        return 2 * total_bytes
+
+    kept_bytes = 0
+    for rank in range(nprocs):
+        chunk_shape = calculate_chunk_shape(
+            global_shape, slicing_dim, (0, 0), nprocs=nprocs, rank=rank
+        )
+        next_chunk_shape = calculate_chunk_shape(
+            global_shape, next_slicing_dim, (0, 0), nprocs=nprocs, rank=rank
+        )
+        kept_shape = [min(a, b) for a, b in zip(chunk_shape, next_chunk_shape)]
+        kept_bytes += int(np.prod(kept_shape)) * np.dtype(dtype).itemsize
+    return total_bytes - kept_bytes
+
+
+def format_plan(plans: List[SectionPlan]) -> str:
+    """Formats the plan of a pipeline as a human readable report"""
+    lines: List[str] = []
+    for plan in plans:
+        lines.append(
+            f"Section {plan.index} (pattern={plan.pattern.name}, "
+            f"padding={plan.padding}, input={plan.global_shape} {plan.dtype})"
+        )
+        for method in plan.methods:
+            lines.append(f"    {method}")
+        lines.append(
+            f"    {'nprocs':>8} {'max_slices':>12} {'chunk':>12} "
+            f"{'store':>8} {'reslice':>12}"
+        )
+        for rank_count in plan.rank_counts.values():
+            max_slices = (
+                str(rank_count.max_slices) if rank_count.max_slices is not None else "?"
+            )
+            store = (
+                rank_count.store_backing.name
+                if rank_count.store_backing is not None
+                else "-"
+            )
+            lines.append(
+                f"    {rank_count.nprocs:>8} {max_slices:>12} "
+                f"{_format_bytes(rank_count.chunk_bytes):>12} {store:>8} "
+                f"{_format_bytes(rank_count.reslice_bytes):>12}"
+            )
+    return "\n".join(lines)
+
+
+def _format_bytes(nbytes: int) -> str:
+    for unit in ["B", "KB", "MB", "GB"]:
+        if nbytes < 1024:
+            return f"{nbytes:.1f}{unit}" if unit != "B" else f"{nbytes}{unit}"
+        nbytes /= 1024  # type: ignore
+    return f"{nbytes:.1f}TB"
@@ -1,9 +1,12 @@
 import logging
 from typing import Iterator, List, Optional, Tuple
 
+import numpy as np
+
+import httomo.globals
 from httomo.runner.output_ref import OutputRef
 from httomo.runner.pipeline import Pipeline
-from httomo.utils import Pattern, log_once
+from httomo.utils import Pattern, _get_slicing_dim, log_once
 from httomo.runner.method_wrapper import MethodWrapper
 
 
@@ -14,7 +17,9 @@ class Section:
     A new section is added in with the following conditions:
     - the pattern changed (sino->proj or vice versa)
     - a side output of a previous method in the same section is referenced
-    - a more than one padding method is included"""
+
+    A section may contain several padding methods - the block is then read with the
+    combined padding of all of them, and trimmed after each padding method"""
 
     def __init__(
         self,
@@ -67,20 +72,14 @@ def sectionize(pipeline: Pipeline) -> List[Section]:
                 return True
         return False
 
-    def is_second_padded_method(method: MethodWrapper) -> bool:
-        return has_padding_method and method.padding
-
     def finish_section():
         sections.append(Section(current_pattern, 0, current_methods))
         if has_padding_method:
             sections[-1].padding = True
 
     for method in pipeline:
-        if (
-            not is_pattern_compatible(current_pattern, method.pattern)
-            or references_previous_method(method)
-            or is_second_padded_method(method)
-        ):
+        pattern_changed = not is_pattern_compatible(current_pattern, method.pattern)
+        if pattern_changed or references_previous_method(method):
             finish_section()
             has_padding_method = False
             if method.pattern != Pattern.all:
@@ -145,9 +144,120 @@ def _set_method_patterns(sections: List[Section]):
 
 
 def determine_section_padding(section: Section) -> Tuple[int, int]:
-    # NOTE: Assumes that only one method with padding will be in a section, which is
-    # consistent with the assumptions made by `sectionize()`
+    """Determines the padding the blocks of a section need to be read with.
+
+    The padding of all methods in the section is accumulated: every padding method needs
+    its own neighbourhood around the output of the padding methods that follow it, and
+    the runner trims each method's padding off the block after it has been executed."""
+    padding = (0, 0)
     for method in section.methods:
         if method.padding:
-            return method.calculate_padding()
-    return (0, 0)
+            method_padding = method.calculate_padding()
+            padding = (padding[0] + method_padding[0], padding[1] + method_padding[1])
+    return padding
+
+
+def section_has_gpu_methods(section: Section) -> bool:
+    """Whether any of the methods in the section runs on the GPU"""
+    return any(m.implementation in ["gpu", "gpu_cupy"] or m.is_gpu for m in section)
+
+
+def section_is_block_parallel(section: Section) -> bool:
+    """Whether several blocks of the section can be processed concurrently, i.e. all of
+    its methods are CPU methods that are flagged as block-parallel"""
+    return not section_has_gpu_methods(section) and all(
+        m.block_parallel for m in section
+    )
+
+
+def determine_section_nprocs(
+    section: Section,
+    global_shape: Tuple[int, int, int],
+    nprocs: int,
+    min_slices_per_process: int,
+) -> int:
+    """Determines how many processes the section should run with, so that each of them
+    gets at least `min_slices_per_process` slices of the data in the section's slicing
+    dimension (0 means that all `nprocs` processes are used).
+
+    Sections saving intermediate files always run with all processes, as the file they
+    write to is shared by all of them."""
+    if min_slices_per_process <= 0 or any(
+        m.method_name == "save_intermediate_data" for m in section
+    ):
+        return nprocs
+    slicing_dim = _get_slicing_dim(section.pattern) - 1
+    return max(1, min(nprocs, global_shape[slicing_dim] // min_slices_per_process))
+
+
+def calculate_section_max_slices(
+    section: Section,
+    chunk_shape: Tuple[int, int, int],
+    slicing_dim: int,
+    available_memory: int,
+) -> int:
+    """Calculates the maximum number of slices in a block of the section, for a chunk of
+    the given shape and the given amount of available GPU memory (in bytes).
+
+    Sections consisting of CPU methods only are limited by MAX_CPU_SLICES instead."""
+    max_slices = chunk_shape[slicing_dim]
+    if not section_has_gpu_methods(section):
+        return min(httomo.globals.MAX_CPU_SLICES, max_slices)
+
+    nsl_dim_l = list(chunk_shape)
+    nsl_dim_l.pop(slicing_dim)
+    non_slice_dims_shape = (nsl_dim_l[0], nsl_dim_l[1])
+
+    max_slices_methods = [max_slices] * len(section)
+
+    SOURCE_DTYPE = np.dtype("float32")
+    # NOTE: as the convertion of the raw data from uint16 to float32 happens after the data gets loaded,
+    # we should consider self.source.dtype to be float for memory estimators.
+    # see https://github.com/DiamondLightSource/httomo/issues/440
+
+    # loop over all methods in section
+    for idx, m in enumerate(section):
+        if m.memory_gpu is None:
+            max_slices_methods[idx] = max_slices
+            continue
+
+        output_dims = m.calculate_output_dims(non_slice_dims_shape)
+        (slices_estimated, available_memory) = m.calculate_max_slices(
+            SOURCE_DTYPE,  # self.source.dtype,
+            non_slice_dims_shape,
+            available_memory,
+        )
+        max_slices_methods[idx] = min(max_slices, slices_estimated)
+        non_slice_dims_shape = output_dims
+
+    return min(max_slices_methods)
+
+
+def calculate_section_cpu_max_slices(
+    section: Section,
+    chunk_shape: Tuple[int, int, int],
+    slicing_dim: int,
+    available_memory: int,
+) -> int:
+    """Calculates the maximum number of slices in a block of a CPU-only section that fit
+    in the given amount of host memory (in bytes).
+
+    As for the GPU estimate in `calculate_section_max_slices`, the methods are walked in
+    order with the shape of the data they get, and each of them is assumed to hold its
+    input and its output block (as float32) at the same time."""
+    max_slices = chunk_shape[slicing_dim]
+
+    nsl_dim_l = list(chunk_shape)
+    nsl_dim_l.pop(slicing_dim)
+    non_slice_dims_shape = (nsl_dim_l[0], nsl_dim_l[1])
+
+    itemsize = np.dtype("float32").itemsize
+    for m in section:
+        output_dims = m.calculate_output_dims(non_slice_dims_shape)
+        slice_bytes = (
+            int(np.prod(non_slice_dims_shape)) + int(np.prod(output_dims))
+        ) * itemsize
+        max_slices = min(max_slices, available_memory // slice_bytes)
+        non_slice_dims_shape = output_dims
+
+    return max_slices
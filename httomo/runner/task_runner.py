@@ -1,7 +1,9 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from itertools import islice
 import logging
 import time
-from typing import Any, Dict, Literal, Optional, List, Tuple, Union
+from typing import Any, Deque, Dict, Literal, Optional, List, Tuple, Union
 import os
 
 import tqdm
@@ -9,9 +11,15 @@ from mpi4py import MPI
 
 import httomo.globals
 from httomo.data.dataset_store import DataSetStoreWriter
-from httomo.runner.dataset_store_backing import determine_store_backing
+from httomo.loaders.standard_tomo_loader import StandardTomoLoader
+from httomo.runner.autotune import CpuBlockSizeTuner
+from httomo.runner.checkpoint import SectionCheckpoint
+from httomo.runner.dataset_store_backing import (
+    DataSetStoreBacking,
+    determine_store_backing,
+)
 from httomo.runner.method_wrapper import MethodWrapper
-from httomo.runner.block_split import BlockSplitter
+from httomo.runner.block_split import BlockSplitter, DynamicBlockSplitter
 from httomo.runner.dataset import DataSetBlock
 from httomo.runner.dataset_store_interfaces import (
     DataSetSink,
@@ -21,8 +29,18 @@ from httomo.runner.dataset_store_interfaces import (
 )
 from httomo.runner.gpu_utils import get_available_gpu_memory, gpumem_cleanup
 from httomo.runner.monitoring_interface import MonitoringInterface
+from httomo.runner.output_ref import OutputRef
 from httomo.runner.pipeline import Pipeline
-from httomo.runner.section import Section, determine_section_padding, sectionize
+from httomo.runner.section import (
+    Section,
+    calculate_section_cpu_max_slices,
+    calculate_section_max_slices,
+    determine_section_nprocs,
+    determine_section_padding,
+    section_has_gpu_methods,
+    section_is_block_parallel,
+    sectionize,
+)
 from httomo.utils import (
     Pattern,
     _get_slicing_dim,
@@ -30,6 +48,7 @@ from httomo.utils import (
     log_exception,
     log_once,
     log_rank,
+    make_3d_shape_from_shape,
 )
 import numpy as np
 
@@ -44,6 +63,16 @@ class TaskRunner:
         comm: MPI.Comm,
         memory_limit_bytes: int = 0,
         monitor: Optional[MonitoringInterface] = None,
+        pipelined: bool = False,
+        incremental_reslice: bool = False,
+        checkpoint: Optional[SectionCheckpoint] = None,
+        resume: bool = False,
+        autotuner: Optional[CpuBlockSizeTuner] = None,
+        cpu_threads: int = 1,
+        dynamic_load_balancing: bool = False,
+        min_slices_per_process: int = 0,
+        file_store_backing: DataSetStoreBacking = DataSetStoreBacking.File,
+        compressed_store_ratio: float = 0.0,
     ):
         self.pipeline = pipeline
         self.reslice_dir = reslice_dir
@@ -55,6 +84,27 @@ class TaskRunner:
         self.sink: Optional[Union[DataSetSink, ReadableDataSetSink]] = None
 
         self._memory_limit_bytes = memory_limit_bytes
+        self._pipelined = pipelined
+        self._incremental_reslice = incremental_reslice
+        self._checkpoint = checkpoint
+        self._resume = resume
+        self._autotuner = autotuner
+        self._cpu_threads = cpu_threads
+        self._dynamic_load_balancing = dynamic_load_balancing
+        self._min_slices_per_process = min_slices_per_process
+        # the backing used for stores that don't fit into memory
+        self._file_store_backing = file_store_backing
+        # the compression ratio expected for stores kept compressed in memory when they
+        # don't fit otherwise (0 to never compress them)
+        self._compressed_store_ratio = compressed_store_ratio
+        # the processes the current section runs on, if not all of them (MPI.COMM_NULL
+        # on the others)
+        self._section_comm: Optional[MPI.Comm] = None
+        self._section_nprocs = comm.size
+        # side outputs of the methods in the completed sections, by task id
+        self._method_side_outputs: Dict[str, Dict[str, Any]] = dict()
+        # reader prefetch + compute + writer drain
+        self._default_blocks_in_flight = 3
 
         self._sections = self._sectionize()
 
@@ -62,9 +112,11 @@ class TaskRunner:
         with catchtime() as t:
 
             self._prepare()
-            for i, section in enumerate(self._sections):
-                self._execute_section(section, i)
+            first_section = self._restore_checkpoint() if self._resume else 0
+            for i in range(first_section, len(self._sections)):
+                self._execute_section(self._sections[i], i)
                 gpumem_cleanup()
+            self._free_section_comm()
 
         self._log_pipeline(f"Pipeline finished. Took {t.elapsed:.3f}s")
         if self.monitor is not None:
@@ -97,6 +149,27 @@ class TaskRunner:
         methods_info[-1] = methods_info[-1].rstrip("\n")
         self._log_pipeline(methods_info, level=logging.INFO)
 
+        if self._section_comm == MPI.COMM_NULL:
+            log_rank(
+                f"    Not taking part in section {section_index}",
+                comm=self.comm,
+            )
+        else:
+            self._execute_section_chunk(section, section_index)
+        self._share_section_results()
+
+        if self._checkpoint is not None and not section.is_last:
+            for method in section:
+                self._method_side_outputs[method.task_id] = method.get_side_output()
+            self._checkpoint.commit(
+                section_index,
+                self.sink,
+                self.side_outputs,
+                self._method_side_outputs,
+            )
+
+    def _execute_section_chunk(self, section: Section, section_index: int):
+        assert self.source is not None, "Dataset has not been loaded yet"
         slicing_dim_section: Literal[0, 1] = _get_slicing_dim(section.pattern) - 1  # type: ignore
         self.determine_max_slices(section, slicing_dim_section)
 
@@ -109,7 +182,65 @@ class TaskRunner:
             level=logging.DEBUG,
         )
 
-        splitter = BlockSplitter(self.source, section.max_slices)
+        if self._balances_dynamically(section_index):
+            # all processes have to agree on the blocks handed out, and each of them
+            # gets one to start with if there are enough slices
+            section.max_slices = self.comm.allreduce(section.max_slices, op=MPI.MIN)
+            chunk_size = self.source.chunk_shape[self.source.slicing_dim]
+            section.max_slices = max(
+                1, min(section.max_slices, chunk_size // self.comm.size)
+            )
+            dynamic_splitter = DynamicBlockSplitter(
+                self.source, section.max_slices, self.comm
+            )
+            self._execute_section_blocks(section, section_index, dynamic_splitter)
+            dynamic_splitter.finalize()
+        else:
+            tuned_slices = 0
+            if (
+                self._autotuner is not None
+                and self._section_comm is None
+                and not section_has_gpu_methods(section)
+            ):
+                tuned_slices = self._autotune_block_size(section, section_index)
+
+            splitter = BlockSplitter(
+                self.source, section.max_slices, start=tuned_slices
+            )
+            if self._cpu_threads > 1 and section_is_block_parallel(section):
+                self._execute_section_blocks_threaded(section, section_index, splitter)
+            elif self._pipelined and self._can_pipeline():
+                self._execute_section_blocks_pipelined(section, section_index, splitter)
+            else:
+                self._execute_section_blocks(section, section_index, splitter)
+
+        if isinstance(self.source, StandardTomoLoader):
+            # releases the read buffers - with collective reads, the other processes may
+            # still be reading blocks
+            self.source.finish_reads()
+
+        self._log_pipeline(
+            "    Finished processing last block",
+            level=logging.INFO,
+        )
+
+    def _share_section_results(self):
+        """After a section that ran on a subset of the processes, makes its side outputs
+        and the layout of its output store known to the processes that didn't take part
+        """
+        if self._section_comm is None:
+            return
+        self.side_outputs = self.comm.bcast(self.side_outputs, root=0)
+        if isinstance(self.sink, DataSetStoreWriter):
+            self.sink.share_chunk_layout()
+
+    def _execute_section_blocks(
+        self,
+        section: Section,
+        section_index: int,
+        splitter: Union[BlockSplitter, DynamicBlockSplitter],
+    ):
+        assert self.sink is not None, "Sink setup failed"
         start_source = time.perf_counter_ns()
         no_of_blocks = len(splitter)
 
@@ -121,18 +252,11 @@ class TaskRunner:
             unit="block",
             ascii=True,
         )
-        for idx, (block, _) in enumerate(zip(splitter, progress)):
+        for idx, block in enumerate(progress):
             end_source = time.perf_counter_ns()
-            if self.monitor is not None:
-                self.monitor.report_source_block(
-                    f"sec_{section_index}",
-                    section.methods[0].task_id if len(section) > 0 else "",
-                    _get_slicing_dim(section.pattern) - 1,
-                    block.shape,
-                    block.chunk_index,
-                    block.global_index,
-                    (end_source - start_source) * 1e-9,
-                )
+            self._report_source_block(
+                section, section_index, block, (end_source - start_source) * 1e-9
+            )
 
             log_once(f"   {str(progress)}", level=logging.INFO)
             block = self._execute_section_block(section, block)
@@ -144,16 +268,9 @@ class TaskRunner:
             start_sink = time.perf_counter_ns()
             self.sink.write_block(block)
             end_sink = time.perf_counter_ns()
-            if self.monitor is not None:
-                self.monitor.report_sink_block(
-                    f"sec_{section_index}",
-                    section.methods[-1].task_id if len(section) > 0 else "",
-                    _get_slicing_dim(section.pattern) - 1,
-                    block.shape,
-                    block.chunk_index,
-                    block.global_index,
-                    (end_sink - start_sink) * 1e-9,
-                )
+            self._report_sink_block(
+                section, section_index, block, (end_sink - start_sink) * 1e-9
+            )
 
             # remove the reference pointing to the CuPy array before
             # calling the clean-up rountine
@@ -162,11 +279,365 @@ class TaskRunner:
 
             start_source = time.perf_counter_ns()
 
+    def _autotune_block_size(self, section: Section, section_index: int) -> int:
+        """Sets the block size of a CPU-only section to the one with the best throughput,
+        taking it from the tuning cache, or by processing the first blocks of the chunk
+        with each of the candidate sizes and timing them.
+
+        Returns the number of slices of the chunk that have been processed while tuning.
+        """
+        assert self.source is not None, "Dataset has not been loaded yet"
+        assert self.sink is not None, "Sink setup failed"
+        assert self._autotuner is not None
+        key = self._autotuner.key(
+            section_index, self.source.global_shape, self.source.dtype
+        )
+        cached = self._autotuner.cached_slices(key)
+        if cached is not None:
+            section.max_slices = cached
+            self._log_pipeline(
+                f"Using tuned block size of {cached} slices for section {section_index}",
+                level=logging.DEBUG,
+            )
+            return 0
+
+        slicing_dim = self.source.slicing_dim
+        # all processes have to try the same candidates and stop at the same one, as
+        # `select` is collective, and so are the reads of a loader reading collectively
+        # (see `StandardTomoLoader.finish_reads`) - the chunks may differ by a slice
+        chunk_size = self.comm.allreduce(
+            self.source.chunk_shape[slicing_dim], op=MPI.MIN
+        )
+        max_slices = self.comm.allreduce(section.max_slices, op=MPI.MIN)
+        upper_bound = chunk_size
+        if self._memory_limit_bytes != 0:
+            # the methods may change the shape of the data, so the bound comes from
+            # walking them, like the block size of GPU sections
+            padding = determine_section_padding(section)
+            memory_slices = calculate_section_cpu_max_slices(
+                section,
+                self.source.chunk_shape,
+                slicing_dim,
+                self._memory_limit_bytes,
+            )
+            upper_bound = min(
+                upper_bound, max(1, memory_slices - padding[0] - padding[1])
+            )
+
+        candidates = self._autotuner.candidate_slices(max_slices, upper_bound)
+        elapsed: List[Optional[float]] = [None] * len(candidates)
+        start = 0
+        # the smallest candidate is run twice and its first timing is discarded, as the
+        # first block pays for warming up (imports, allocations, caches)
+        for i, slices in [(-1, candidates[0])] + list(enumerate(candidates)):
+            if start + slices > chunk_size:
+                # only full blocks give comparable timings
+                break
+            with catchtime() as t:
+                block = self.source.read_block(start, slices)
+            self._report_source_block(section, section_index, block, t.elapsed)
+
+            with catchtime() as t:
+                block = self._execute_section_block(section, block)
+            if i >= 0:
+                elapsed[i] = t.elapsed
+
+            with catchtime() as t:
+                self.sink.write_block(block)
+            self._report_sink_block(section, section_index, block, t.elapsed)
+            del block.data
+            gpumem_cleanup()
+            start += slices
+
+        best = self._autotuner.select(candidates, elapsed)
+        if best is not None:
+            section.max_slices = best
+            self._autotuner.store(key, best)
         self._log_pipeline(
-            "    Finished processing last block",
-            level=logging.INFO,
+            f"Tuned block size is {section.max_slices} slices for section {section_index}",
+            level=logging.DEBUG,
+        )
+        return start
+
+    def _execute_section_blocks_pipelined(
+        self, section: Section, section_index: int, splitter: BlockSplitter
+    ):
+        """Processes the blocks of a section with reading, computing and writing
+        overlapped: while block N is being computed on the main thread, block N+1 is
+        prefetched from the source by a reader thread and block N-1 is written to the
+        sink by a writer thread.
+
+        The number of blocks alive at any one time (prefetched, in compute and waiting
+        to be written) is bounded by `_max_blocks_in_flight`. Blocks are written in
+        the same order as they are read, and the monitor is only reported to from the
+        main thread.
+        """
+        assert self.source is not None, "Dataset has not been loaded yet"
+        assert self.sink is not None, "Sink setup failed"
+        source = self.source
+        sink = self.sink
+        no_of_blocks = len(splitter)
+        max_in_flight = self._max_blocks_in_flight(splitter)
+        self._log_pipeline(
+            f"Pipelined execution with at most {max_in_flight} blocks in flight",
+            level=logging.DEBUG,
+        )
+
+        def read_block(idx: int) -> Tuple[DataSetBlock, float]:
+            with catchtime() as t:
+                block = splitter[idx]
+            return block, t.elapsed
+
+        def write_block(block: DataSetBlock) -> Tuple[DataSetBlock, float]:
+            with catchtime() as t:
+                sink.write_block(block)
+            return block, t.elapsed
+
+        reads: Deque["Future[Tuple[DataSetBlock, float]]"] = deque()
+        writes: Deque["Future[Tuple[DataSetBlock, float]]"] = deque()
+
+        def finish_write():
+            written, elapsed = writes.popleft().result()
+            self._report_sink_block(section, section_index, written, elapsed)
+            del written.data
+
+        progress = tqdm.tqdm(
+            total=no_of_blocks,
+            file=open(os.devnull, "w"),
+            unit="block",
+            ascii=True,
+        )
+        with ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="httomo-reader"
+        ) as reader, ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="httomo-writer"
+        ) as writer:
+            next_read = 0
+            for idx in range(no_of_blocks):
+                while writes and writes[0].done():
+                    finish_write()
+                if not reads:
+                    # the block to compute next has to be read, so wait for writes
+                    # to drain until there is room for it
+                    while writes and len(writes) >= max_in_flight:
+                        finish_write()
+                    reads.append(reader.submit(read_block, next_read))
+                    next_read += 1
+                while (
+                    next_read < no_of_blocks
+                    and len(reads) + len(writes) < max_in_flight
+                ):
+                    reads.append(reader.submit(read_block, next_read))
+                    next_read += 1
+
+                block, elapsed = reads.popleft().result()
+                self._report_source_block(section, section_index, block, elapsed)
+
+                progress.update()
+                log_once(f"   {str(progress)}", level=logging.INFO)
+                block = self._execute_section_block(section, block)
+                log_rank(
+                    f"    Finished processing block {idx + 1} of {no_of_blocks}",
+                    comm=self.comm,
+                )
+
+                # the writer thread must never touch device memory
+                block.to_cpu()
+                gpumem_cleanup()
+                writes.append(writer.submit(write_block, block))
+                del block
+
+            while writes:
+                finish_write()
+
+    def _execute_section_blocks_threaded(
+        self, section: Section, section_index: int, splitter: BlockSplitter
+    ):
+        """Processes the blocks of a block-parallel CPU section with up to `cpu_threads`
+        blocks computed concurrently in a thread pool.
+
+        Blocks are read and written on the main thread, in order, and the monitor is only
+        reported to from the main thread. The side outputs of the methods are appended
+        once the last block of the chunk has been collected, as in sequential execution.
+
+        The same method wrappers are executed from several threads, so nothing is read
+        back from them per block. Methods with an `ncore` parameter (e.g. tomopy's) are
+        run with a single core each, unless configured otherwise, as the blocks are
+        already processed in parallel.
+        """
+        assert self.source is not None, "Dataset has not been loaded yet"
+        assert self.sink is not None, "Sink setup failed"
+        no_of_blocks = len(splitter)
+        max_in_flight = self._max_blocks_in_flight(splitter, self._cpu_threads)
+        self._log_pipeline(
+            f"Processing up to {max_in_flight} blocks concurrently",
+            level=logging.DEBUG,
+        )
+        # the side inputs come from previous sections, so they don't change while the
+        # blocks of this section are processed
+        for method in section:
+            self.set_side_inputs(method)
+            if "ncore" in method.parameters and "ncore" not in method.config_params:
+                method["ncore"] = 1
+
+        MethodReport = Tuple[
+            MethodWrapper,
+            Tuple[int, int, int],
+            Tuple[int, int, int],
+            Tuple[int, int, int],
+            float,
+        ]
+
+        def compute_block(
+            block: DataSetBlock,
+        ) -> Tuple[DataSetBlock, List[MethodReport]]:
+            reports: List[MethodReport] = []
+            for method in section:
+                with catchtime() as t:
+                    block = method.execute(block)
+                reports.append(
+                    (
+                        method,
+                        block.shape,
+                        block.chunk_index,
+                        block.global_index,
+                        t.elapsed,
+                    )
+                )
+                if method.padding:
+                    block = self._trim_padding(block, method.calculate_padding())
+            return block, reports
+
+        pending: Deque["Future[Tuple[DataSetBlock, List[MethodReport]]]"] = deque()
+        progress = tqdm.tqdm(
+            total=no_of_blocks,
+            file=open(os.devnull, "w"),
+            unit="block",
+            ascii=True,
         )
 
+        def finish_block():
+            block, reports = pending.popleft().result()
+            for method, shape, chunk_index, global_index, elapsed in reports:
+                if self.monitor is not None:
+                    self.monitor.report_method_block(
+                        method.method_name,
+                        method.module_path,
+                        method.task_id,
+                        _get_slicing_dim(method.pattern) - 1,
+                        shape,
+                        chunk_index,
+                        global_index,
+                        elapsed,
+                        # block-parallel sections are CPU-only
+                        0.0,
+                        0.0,
+                        0.0,
+                    )
+            progress.update()
+            log_once(f"   {str(progress)}", level=logging.INFO)
+            log_rank(
+                f"    Finished processing block {progress.n} of {no_of_blocks}",
+                comm=self.comm,
+            )
+
+            with catchtime() as t:
+                self.sink.write_block(block)
+            self._report_sink_block(section, section_index, block, t.elapsed)
+            if block.is_last_in_chunk:
+                for method in section:
+                    self.append_side_outputs(method.get_side_output())
+            del block.data
+
+        with ThreadPoolExecutor(
+            max_workers=max_in_flight, thread_name_prefix="httomo-cpu"
+        ) as pool:
+            for idx in range(no_of_blocks):
+                while len(pending) >= max_in_flight:
+                    finish_block()
+                with catchtime() as t:
+                    block = splitter[idx]
+                self._report_source_block(section, section_index, block, t.elapsed)
+                pending.append(pool.submit(compute_block, block))
+                del block
+
+            while pending:
+                finish_block()
+
+    def _balances_dynamically(self, section_index: int) -> bool:
+        """Whether the blocks of the section are handed out to the processes at runtime
+        (see DynamicBlockSplitter) rather than split into static chunks.
+
+        This is only done for the first section, which reads from the loader (so that any
+        process can read any block), and only if all of its methods are block-parallel,
+        i.e. don't depend on the chunk a block is in. The sections that follow use the
+        usual static chunks again."""
+        if (
+            not self._dynamic_load_balancing
+            or self.comm.size == 1
+            or section_index != 0
+            or self._checkpoint is not None
+        ):
+            return False
+        return all(m.block_parallel for m in self._sections[section_index])
+
+    def _can_pipeline(self) -> bool:
+        if self.comm.size > 1 and MPI.Query_thread() < MPI.THREAD_MULTIPLE:
+            log_once(
+                "WARNING: pipelined execution requires MPI to be initialised with "
+                "MPI_THREAD_MULTIPLE - falling back to sequential block processing",
+                level=logging.WARNING,
+            )
+            return False
+        return True
+
+    def _max_blocks_in_flight(
+        self, splitter: BlockSplitter, max_blocks: Optional[int] = None
+    ) -> int:
+        """Determines how many blocks can be alive at the same time in pipelined or
+        threaded mode (at most `max_blocks`, by default the number of pipeline stages),
+        so that the prefetched and not-yet-written blocks fit into the memory limit"""
+        if max_blocks is None:
+            max_blocks = self._default_blocks_in_flight
+        if self._memory_limit_bytes == 0:
+            return max_blocks
+
+        assert self.source is not None
+        block_shape = list(self.source.chunk_shape)
+        block_shape[self.source.slicing_dim] = splitter.slices_per_block
+        # data may be converted to float32 by the methods
+        itemsize = max(np.dtype(self.source.dtype).itemsize, 4)
+        block_bytes = int(np.prod(block_shape)) * itemsize
+        return max(1, min(max_blocks, self._memory_limit_bytes // block_bytes))
+
+    def _report_source_block(
+        self, section: Section, section_index: int, block: DataSetBlock, elapsed: float
+    ):
+        if self.monitor is not None:
+            self.monitor.report_source_block(
+                f"sec_{section_index}",
+                section.methods[0].task_id if len(section) > 0 else "",
+                _get_slicing_dim(section.pattern) - 1,
+                block.shape,
+                block.chunk_index,
+                block.global_index,
+                elapsed,
+            )
+
+    def _report_sink_block(
+        self, section: Section, section_index: int, block: DataSetBlock, elapsed: float
+    ):
+        if self.monitor is not None:
+            self.monitor.report_sink_block(
+                f"sec_{section_index}",
+                section.methods[-1].task_id if len(section) > 0 else "",
+                _get_slicing_dim(section.pattern) - 1,
+                block.shape,
+                block.chunk_index,
+                block.global_index,
+                elapsed,
+            )
+
     def _setup_source_sink(self, section: Section, idx: int):
         assert self.source is not None, "Dataset has not been loaded yet"
 
@@ -176,7 +647,12 @@ class TaskRunner:
             # we have a store-based sink from the last section - use that to determine
             # the source for this one
             assert isinstance(self.sink, ReadableDataSetSink)
-            self.source = self.sink.make_reader(slicing_dim_section)
+            self._setup_section_comm(section, idx, self.sink.global_shape)
+            self.source = self.sink.make_reader(
+                slicing_dim_section,
+                padding=determine_section_padding(section),
+                active_comm=self._section_comm,
+            )
 
         store_backing = determine_store_backing(
             comm=self.comm,
@@ -185,18 +661,132 @@ class TaskRunner:
             dtype=self.source.dtype,
             global_shape=self.source.global_shape,
             section_idx=idx,
+            nprocs=self._section_nprocs,
+            compression_ratio=self._compressed_store_ratio,
         )
 
         if section.is_last:
             # we don't need to store the results - this sink just discards it
             self.sink = DummySink(slicing_dim_section)
         else:
-            self.sink = DataSetStoreWriter(
-                slicing_dim_section,
-                self.comm,
-                self.reslice_dir,
-                store_backing=store_backing,
+            self.sink = self._make_store_writer(idx, store_backing)
+            if self._checkpoint is not None:
+                self.sink = self._checkpoint.make_sink(self.sink, idx)
+
+    def _setup_section_comm(
+        self, section: Section, idx: int, global_shape: Tuple[int, int, int]
+    ):
+        """Picks the number of processes the section runs with, and creates a
+        sub-communicator for its methods and stores if that is not all of them. The
+        data is redistributed to these processes when the section's reader is created,
+        and the others skip the section."""
+        self._free_section_comm()
+        self._section_nprocs = self.comm.size
+        if self.comm.size == 1 or self._checkpoint is not None:
+            return
+        nprocs = determine_section_nprocs(
+            section, global_shape, self.comm.size, self._min_slices_per_process
+        )
+        if nprocs == self.comm.size:
+            return
+
+        self._section_nprocs = nprocs
+        self._section_comm = self.comm.Split(
+            0 if self.comm.rank < nprocs else MPI.UNDEFINED, self.comm.rank
+        )
+        self._log_pipeline(
+            f"Section {idx} runs on {nprocs} of {self.comm.size} processes",
+            level=logging.DEBUG,
+        )
+        if self._section_comm != MPI.COMM_NULL:
+            for method in section:
+                method.comm = self._section_comm
+
+    def _free_section_comm(self):
+        """Frees the sub-communicator of the previous section, if it had one - the
+        section has finished and shared its results by then, so it isn't used anymore"""
+        if self._section_comm is not None and self._section_comm != MPI.COMM_NULL:
+            self._section_comm.Free()
+        self._section_comm = None
+
+    def _make_store_writer(
+        self, section_idx: int, store_backing: DataSetStoreBacking
+    ) -> DataSetStoreWriter:
+        section = self._sections[section_idx]
+        slicing_dim_section: Literal[0, 1] = _get_slicing_dim(section.pattern) - 1  # type: ignore
+        # the store of the last section is read in the dimension it's written in
+        next_pattern = (
+            self._sections[section_idx + 1].pattern
+            if section_idx + 1 < len(self._sections)
+            else section.pattern
+        )
+        read_slicing_dim: Literal[0, 1] = _get_slicing_dim(next_pattern) - 1  # type: ignore
+        next_slicing_dim: Optional[Literal[0, 1]] = None
+        # the processes of the next section aren't known until its reader is made
+        if self._incremental_reslice and self._min_slices_per_process == 0:
+            next_slicing_dim = read_slicing_dim
+        if store_backing is DataSetStoreBacking.File:
+            store_backing = self._file_store_backing
+        return DataSetStoreWriter(
+            slicing_dim_section,
+            self.comm,
+            self.reslice_dir,
+            store_backing=store_backing,
+            next_slicing_dim=next_slicing_dim,
+            dynamic_chunks=self._balances_dynamically(section_idx),
+            active_comm=self._section_comm,
+            read_slicing_dim=read_slicing_dim,
+            # the chunk written and the one read by the next section share the limit
+            ram_budget_bytes=self._memory_limit_bytes // 2,
+        )
+
+    def _restore_checkpoint(self) -> int:
+        """Restores the store written by the last completed section of a previous run
+        from the checkpoint, and returns the index of the section to continue with"""
+        assert self._checkpoint is not None, "Resuming requires a checkpoint"
+        # the last section is never checkpointed, as its output isn't stored
+        completed = min(self._checkpoint.completed_sections(), len(self._sections) - 1)
+        if completed == 0:
+            self._log_pipeline(
+                "No completed sections found in the checkpoint - starting from the beginning",
+                level=logging.WARNING,
             )
+            return 0
+
+        section_idx = completed - 1
+        global_shape, dtype = self._checkpoint.stored_shape_and_dtype(section_idx)
+        store_backing = determine_store_backing(
+            comm=self.comm,
+            sections=self._sections,
+            memory_limit_bytes=self._memory_limit_bytes,
+            dtype=dtype,
+            global_shape=global_shape,
+            section_idx=section_idx,
+            compression_ratio=self._compressed_store_ratio,
+        )
+        self.sink = self._make_store_writer(section_idx, store_backing)
+        self.side_outputs, self._method_side_outputs = self._checkpoint.restore(
+            section_idx, self.sink, httomo.globals.MAX_CPU_SLICES
+        )
+        self._resolve_restored_output_refs(completed)
+        self._log_pipeline(
+            f"Resuming from checkpoint: skipping {completed} completed section(s)",
+            level=logging.INFO,
+        )
+        return completed
+
+    def _resolve_restored_output_refs(self, first_section: int):
+        """Replaces references to side outputs of methods in restored sections (which
+        therefore haven't run) with the values saved in the checkpoint"""
+        for section in self._sections[first_section:]:
+            for method in section:
+                for name, value in method.config_params.items():
+                    if (
+                        isinstance(value, OutputRef)
+                        and value.method.task_id in self._method_side_outputs
+                    ):
+                        saved = self._method_side_outputs[value.method.task_id]
+                        method[name] = saved[value.mapped_output_name]
 
     def _execute_section_block(
         self, section: Section, block: DataSetBlock
@@ -204,8 +794,39 @@ class TaskRunner:
         for method in section:
             self.set_side_inputs(method)
             block = self._execute_method(method, block)
+            if method.padding:
+                # the neighbourhood this method needed isn't needed by any methods
+                # that follow it
+                block = self._trim_padding(block, method.calculate_padding())
         return block
 
+    def _trim_padding(self, block: DataSetBlock, trim: Tuple[int, int]) -> DataSetBlock:
+        """Removes the given number of padding slices from both sides of the block"""
+        if trim == (0, 0):
+            return block
+        if trim[0] > block.padding[0] or trim[1] > block.padding[1]:
+            raise ValueError(
+                f"Cannot trim {trim} slices from a block with padding {block.padding}"
+            )
+        dim = block.slicing_dim
+        slices = [slice(None), slice(None), slice(None)]
+        slices[dim] = slice(trim[0], block.shape[dim] - trim[1])
+        chunk_shape = list(block.chunk_shape)
+        chunk_shape[dim] -= trim[0] + trim[1]
+        return DataSetBlock(
+            data=block.data[slices[0], slices[1], slices[2]],
+            aux_data=block.aux_data,
+            slicing_dim=dim,
+            block_start=block.chunk_index[dim] + trim[0],
+            chunk_start=block.global_index[dim]
+            - block.chunk_index[dim]
+            - block.padding[0]
+            + trim[0],
+            global_shape=block.global_shape,
+            chunk_shape=make_3d_shape_from_shape(chunk_shape),
+            padding=(block.padding[0] - trim[0], block.padding[1] - trim[1]),
+        )
+
     def _log_pipeline(self, msg: Any, level: int = logging.INFO):
         log_once(msg, level=level)
 
@@ -223,7 +844,13 @@ class TaskRunner:
             self.pipeline.loader.method_name,
         )
         loader_padding = determine_section_padding(self._sections[0])
-        self.source = self.pipeline.loader.make_data_source(padding=loader_padding)
+        if self._balances_dynamically(0):
+            # any process may be handed any block of the data
+            self.source = self.pipeline.loader.make_data_source(
+                padding=loader_padding, comm=MPI.COMM_SELF
+            )
+        else:
+            self.source = self.pipeline.loader.make_data_source(padding=loader_padding)
         self._log_task_end(
             "loader",
             start_time,
@@ -315,22 +942,13 @@ class TaskRunner:
         assert len(section) > 0, "Section should contain at least 1 method"
 
         data_shape = self.source.chunk_shape
-        max_slices = data_shape[slicing_dim]
-        # loop over all methods in section
-        has_gpu = False
-        for idx, m in enumerate(section):
-            if m.implementation in ["gpu", "gpu_cupy"] or m.is_gpu:
-                has_gpu = True
-
         # if section consists of all cpu method then MAX_CPU_SLICES defines the block size
-        if not has_gpu:
-            section.max_slices = min(httomo.globals.MAX_CPU_SLICES, max_slices)
+        if not section_has_gpu_methods(section):
+            section.max_slices = calculate_section_max_slices(
+                section, data_shape, slicing_dim, 0
+            )
             return
 
-        nsl_dim_l = list(data_shape)
-        nsl_dim_l.pop(slicing_dim)
-        non_slice_dims_shape = (nsl_dim_l[0], nsl_dim_l[1])
-
         available_memory = get_available_gpu_memory(10.0)
         available_memory_in_GB = round(available_memory / (1024**3), 2)
         memory_str = (
@@ -344,26 +962,6 @@ class TaskRunner:
                 level=logging.DEBUG,
             )
 
-        max_slices_methods = [max_slices] * len(section)
-
-        SOURCE_DTYPE = np.dtype("float32")
-        # NOTE: as the convertion of the raw data from uint16 to float32 happens after the data gets loaded,
-        # we should consider self.source.dtype to be float for memory estimators.
-        # see https://github.com/DiamondLightSource/httomo/issues/440
-
-        # loop over all methods in section
-        for idx, m in enumerate(section):
-            if m.memory_gpu is None:
-                max_slices_methods[idx] = max_slices
-                continue
-
-            output_dims = m.calculate_output_dims(non_slice_dims_shape)
-            (slices_estimated, available_memory) = m.calculate_max_slices(
-                SOURCE_DTYPE,  # self.source.dtype,
-                non_slice_dims_shape,
-                available_memory,
-            )
-            max_slices_methods[idx] = min(max_slices, slices_estimated)
-            non_slice_dims_shape = output_dims
-
-        section.max_slices = min(max_slices_methods)
+        section.max_slices = calculate_section_max_slices(
+            section, data_shape, slicing_dim, available_memory
+        )
@@ -1,4 +1,4 @@
-from typing import Literal, Optional, TypeAlias, TypedDict, Union
+from typing import Any, Dict, Literal, Optional, TypeAlias, TypedDict, Union
 
 from httomo.loaders.types import (
     AnglesConfig,
@@ -127,3 +127,24 @@ def parse_angles(angles_data: dict) -> AnglesConfig:
         )
 
     raise ValueError(f"Unknown rotation_angles param value for loader: {angles_data}")
+
+
+def parse_collective_reads(
+    param_value: Union[bool, Dict[str, Any], None],
+) -> Optional[Dict[str, str]]:
+    """
+    Get the MPI-IO hints for reading the input data collectively (e.g. `romio_cb_read`,
+    `cb_buffer_size`, `cb_nodes`), or `None` if the data should be read independently
+    by each process.
+
+    The parameter is either a bool to enable collective reads with the default hints of
+    the MPI library, or a dict of hints to enable them with.
+    """
+    if param_value is None or param_value is False:
+        return None
+    if param_value is True:
+        return dict()
+    if isinstance(param_value, dict):
+        return {str(key): str(value) for key, value in param_value.items()}
+
+    raise ValueError(f"Unknown collective_reads param value for loader: {param_value}")
@@ -18,7 +18,11 @@ from httomo.loaders import make_loader
 from httomo.runner.loader import LoaderInterface
 from httomo.runner.output_ref import OutputRef
 from httomo.sweep_runner.param_sweep_yaml_loader import get_param_sweep_yaml_loader
-from httomo.transform_loader_params import parse_angles, parse_preview
+from httomo.transform_loader_params import (
+    parse_angles,
+    parse_collective_reads,
+    parse_preview,
+)
 
 
 MethodConfig: TypeAlias = Dict[str, Any]
@@ -139,6 +143,9 @@ class UiLayer:
         with h5py.File(in_file, "r") as f:
             data_shape = f[data_path].shape
         preview = parse_preview(parameters.get("preview", None), data_shape)
+        collective_reads = parse_collective_reads(
+            parameters.get("collective_reads", None)
+        )
 
         loader = make_loader(
             repo=self.repo,
@@ -156,6 +163,7 @@ class UiLayer:
             ),
             preview=preview,
             comm=self.comm,
+            collective_reads=collective_reads,
         )
 
         return loader
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from httomo.data.compressed_chunk import (
+    CompressedChunk,
+    compress_array,
+    decompress_array,
+)
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.uint16])
+def test_compress_array_round_trip(dtype):
+    data = np.arange(1000, dtype=dtype).reshape(10, 10, 10)
+
+    compressed = compress_array(data)
+
+    assert len(compressed) < data.nbytes
+    np.testing.assert_array_equal(
+        decompress_array(compressed, data.shape, data.dtype), data
+    )
+
+
+def test_compressed_chunk_reads_what_was_written_in_blocks():
+    data = np.random.default_rng(0).random((11, 13, 5), dtype=np.float32)
+    chunk = CompressedChunk(data.shape, data.dtype, (3, 4, 5), origin=(2, 0, 0))
+
+    for start in range(0, data.shape[0], 5):
+        chunk[start : start + 5] = data[start : start + 5]
+
+    # tiles at the end of the blocks are only compressed once complete
+    assert len(chunk._partial) == 0
+    np.testing.assert_array_equal(chunk[:, :, :], data)
+    np.testing.assert_array_equal(chunk[:, 6:9, :], data[:, 6:9, :])
+    np.testing.assert_array_equal(chunk[3:4, 2:3, 1:2], data[3:4, 2:3, 1:2])
+    assert chunk.shape == data.shape
+    assert chunk.dtype == data.dtype
+    chunk.close()
+
+
+def test_compressed_chunk_keeps_partial_tiles_until_flushed():
+    chunk = CompressedChunk((4, 4, 4), np.float32, (4, 4, 4))
+
+    chunk[0:2] = 1.0
+
+    assert len(chunk._partial) == 1
+    np.testing.assert_array_equal(chunk[0:2], np.ones((2, 4, 4), np.float32))
+    # never written parts read as zeros
+    np.testing.assert_array_equal(chunk[2:4], np.zeros((2, 4, 4), np.float32))
+
+    chunk.flush()
+
+    assert len(chunk._partial) == 0
+    np.testing.assert_array_equal(chunk[0:2], np.ones((2, 4, 4), np.float32))
+    chunk[1:3] = 2.0
+    np.testing.assert_array_equal(chunk[:, 0:1, 0:1][:, 0, 0], [1.0, 2.0, 2.0, 0.0])
+    chunk.close()
+
+
+def test_compressed_chunk_compresses_smooth_data():
+    data = np.tile(np.arange(64, dtype=np.float32), (32, 32, 1))
+    chunk = CompressedChunk(data.shape, data.dtype, (8, 8, 64))
+
+    chunk[:, :, :] = data
+
+    assert chunk.compressed_nbytes < data.nbytes / 4
+    chunk.close()
+
+
+def test_compressed_chunk_rejects_strided_slices():
+    chunk = CompressedChunk((4, 4, 4), np.float32, (2, 2, 4))
+
+    with pytest.raises(ValueError):
+        chunk[::2]
+    chunk.close()
@@ -1,11 +1,15 @@
 from os import PathLike
 from pathlib import Path
-from typing import Literal
+import time
+from typing import List, Literal, Tuple
 from unittest.mock import ANY
 import numpy as np
 import pytest
 from pytest_mock import MockerFixture
 from httomo.data.dataset_store import DataSetStoreReader, DataSetStoreWriter
+from httomo.data.hdf._utils.chunk import calculate_store_chunks, is_orthogonal_read
+from httomo.data.hdf._utils.reslice import IncrementalReslicer
+from httomo.data.spilled_chunk import SpilledChunk
 from mpi4py import MPI
 import h5py
 from httomo.runner.auxiliary_data import AuxiliaryData
@@ -61,7 +65,15 @@ def test_reader_throws_if_no_data(tmp_path: PathLike):
 
 
 @pytest.mark.parametrize(
-    "store_backing", [DataSetStoreBacking.RAM, DataSetStoreBacking.File]
+    "store_backing",
+    [
+        DataSetStoreBacking.RAM,
+        DataSetStoreBacking.File,
+        DataSetStoreBacking.Mmap,
+        DataSetStoreBacking.CompressedRAM,
+        DataSetStoreBacking.Hybrid,
+        DataSetStoreBacking.LocalFile,
+    ],
 )
 def test_can_write_and_read_blocks(
     tmp_path: PathLike,
@@ -120,7 +132,15 @@ def test_can_write_and_read_blocks(
 
 
 @pytest.mark.parametrize(
-    "store_backing", [DataSetStoreBacking.RAM, DataSetStoreBacking.File]
+    "store_backing",
+    [
+        DataSetStoreBacking.RAM,
+        DataSetStoreBacking.File,
+        DataSetStoreBacking.Mmap,
+        DataSetStoreBacking.CompressedRAM,
+        DataSetStoreBacking.Hybrid,
+        DataSetStoreBacking.LocalFile,
+    ],
 )
 def test_write_after_read_throws(
     dummy_block: DataSetBlock,
@@ -181,6 +201,250 @@ def test_making_reader_closes_file_and_deletes(
     assert not writer.filename.exists()
 
 
+def test_local_file_store_writes_chunk_to_file_of_process(
+    dummy_block: DataSetBlock, tmp_path: PathLike
+):
+    writer = DataSetStoreWriter(
+        slicing_dim=0,
+        comm=MPI.COMM_WORLD,
+        temppath=tmp_path,
+        store_backing=DataSetStoreBacking.LocalFile,
+        ram_budget_bytes=10 * dummy_block.data.nbytes,
+    )
+    writer.write_block(dummy_block)
+
+    assert writer._h5file is None
+    assert isinstance(writer._data, SpilledChunk)
+    assert writer._data.spilled_nbytes == writer._data.nbytes
+    spill_file = writer._data.filename
+    assert spill_file is not None
+    assert spill_file.parent == Path(tmp_path)
+
+    reader = writer.make_reader()
+    np.testing.assert_array_equal(reader.read_block(0, 2).data, dummy_block.data[:2])
+    reader.finalize()
+
+    assert not spill_file.exists()
+
+
+def test_mmap_reader_returns_views_and_deletes_file(
+    dummy_block: DataSetBlock, tmp_path: PathLike
+):
+    writer = DataSetStoreWriter(
+        slicing_dim=0,
+        comm=MPI.COMM_WORLD,
+        temppath=tmp_path,
+        store_backing=DataSetStoreBacking.Mmap,
+    )
+    writer.write_block(dummy_block)
+    reader = writer.make_reader()
+
+    assert writer.filename is not None
+    assert writer.filename.exists()
+    assert reader.filename == writer.filename
+    assert isinstance(reader, DataSetStoreReader)
+    assert reader.is_mmap_based
+
+    block = reader.read_block(0, 2)
+    assert isinstance(block.data, np.memmap)
+    np.testing.assert_array_equal(block.data, dummy_block.data[:2])
+
+    # modifying the block doesn't change the stored data
+    block.data[:] = -1
+    np.testing.assert_array_equal(reader.read_block(0, 2).data, dummy_block.data[:2])
+
+    reader.finalize()
+
+    assert not writer.filename.exists()
+
+
+def test_mmap_reader_reads_blocks_after_file_path_is_gone(
+    dummy_block: DataSetBlock, tmp_path: PathLike
+):
+    writer = DataSetStoreWriter(
+        slicing_dim=0,
+        comm=MPI.COMM_WORLD,
+        temppath=tmp_path,
+        store_backing=DataSetStoreBacking.Mmap,
+    )
+    writer.write_block(dummy_block)
+    reader = writer.make_reader()
+    assert writer.filename is not None
+
+    # the path is gone, as when another process has finalized its reader already
+    moved = Path(tmp_path) / "moved.raw"
+    writer.filename.rename(moved)
+
+    np.testing.assert_array_equal(reader.read_block(2, 2).data, dummy_block.data[2:4])
+    moved.rename(writer.filename)
+    reader.finalize()
+
+
+@pytest.mark.parametrize(
+    "store_backing",
+    [DataSetStoreBacking.CompressedRAM, DataSetStoreBacking.Hybrid],
+)
+@pytest.mark.parametrize("new_slicing_dim", [0, 1], ids=["same-dim", "reslice"])
+def test_local_chunk_store_reads_padded_blocks_in_both_dims(
+    tmp_path: PathLike,
+    store_backing: DataSetStoreBacking,
+    new_slicing_dim: Literal[0, 1],
+):
+    GLOBAL_SHAPE = (12, 9, 7)
+    global_data = np.arange(np.prod(GLOBAL_SHAPE), dtype=np.float32).reshape(
+        GLOBAL_SHAPE
+    )
+    writer = DataSetStoreWriter(
+        slicing_dim=0,
+        comm=MPI.COMM_SELF,
+        temppath=tmp_path,
+        store_backing=store_backing,
+        read_slicing_dim=1,
+        # half of the chunk in memory for the hybrid store
+        ram_budget_bytes=global_data.nbytes // 2,
+    )
+    for start in range(0, GLOBAL_SHAPE[0], 5):
+        stop = min(start + 5, GLOBAL_SHAPE[0])
+        writer.write_block(
+            DataSetBlock(
+                data=global_data[start:stop],
+                aux_data=AuxiliaryData(angles=np.ones(GLOBAL_SHAPE[0], np.float32)),
+                global_shape=GLOBAL_SHAPE,
+                block_start=start,
+                chunk_start=0,
+                chunk_shape=GLOBAL_SHAPE,
+            )
+        )
+    padding = (2, 3)
+    reader = writer.make_reader(new_slicing_dim=new_slicing_dim, padding=padding)
+
+    assert reader.is_compressed is (store_backing is DataSetStoreBacking.CompressedRAM)
+    pad_width = [(0, 0), (0, 0), (0, 0)]
+    pad_width[new_slicing_dim] = padding
+    expected = np.pad(global_data, pad_width, mode="edge")
+    length = GLOBAL_SHAPE[new_slicing_dim]
+    for start in range(0, length, 4):
+        block = reader.read_block(start, min(4, length - start))
+        np.testing.assert_array_equal(
+            block.data,
+            np.take(
+                expected,
+                range(start, start + block.shape[new_slicing_dim]),
+                axis=new_slicing_dim,
+            ),
+        )
+
+
+@pytest.mark.parametrize(
+    "read_slicing_dim, expected_chunks",
+    [(1, (10, 10, 2560)), (0, (1, 2160, 2560))],
+    ids=["proj2sino", "same-dim"],
+)
+def test_store_chunks_suit_write_and_read_dims(
+    read_slicing_dim: int, expected_chunks: Tuple[int, int, int]
+):
+    chunks = calculate_store_chunks((1800, 2160, 2560), 4, 0, read_slicing_dim)
+
+    assert chunks == expected_chunks
+
+
+def test_file_store_is_chunked_for_next_slicing_dim(
+    dummy_block: DataSetBlock, tmp_path: PathLike
+):
+    writer = DataSetStoreWriter(
+        slicing_dim=0,
+        comm=MPI.COMM_WORLD,
+        temppath=tmp_path,
+        store_backing=DataSetStoreBacking.File,
+        read_slicing_dim=1,
+    )
+    writer.write_block(dummy_block)
+
+    assert writer._h5file is not None
+    assert writer._h5file["data"].chunks == calculate_store_chunks(
+        dummy_block.global_shape, dummy_block.data.itemsize, 0, 1
+    )
+
+    reader = writer.make_reader(new_slicing_dim=1)
+    block = reader.read_block(0, 3)
+    np.testing.assert_array_equal(block.data, dummy_block.data[:, :3, :])
+
+
+@pytest.mark.parametrize(
+    "chunks, slicing_dim, expected",
+    [
+        ((10, 2160, 2560), 1, True),
+        ((10, 10, 2560), 1, False),
+        ((10, 40, 2560), 1, False),
+        (None, 0, False),
+        (None, 1, True),
+    ],
+    ids=[
+        "strips-of-chunks",
+        "layers-of-chunks",
+        "block-long-chunks",
+        "contiguous-rows",
+        "contiguous-strips",
+    ],
+)
+def test_is_orthogonal_read(
+    chunks: Tuple[int, int, int], slicing_dim: int, expected: bool
+):
+    assert is_orthogonal_read((1800, 2160, 2560), chunks, slicing_dim, 40) is expected
+
+
+@pytest.mark.parametrize("buffer_bytes", [0, 1], ids=["at-once", "in-rounds"])
+def test_file_store_is_transposed_for_orthogonal_reads(
+    mocker: MockerFixture, tmp_path: PathLike, buffer_bytes: int
+):
+    mocker.patch("httomo.globals.RESLICE_BUFFER_BYTES", buffer_bytes)
+    # chunked in layers of 16 projections spanning all sinograms
+    global_shape = (64, 128, 128)
+    global_data = np.arange(np.prod(global_shape), dtype=np.float32).reshape(
+        global_shape
+    )
+    aux_data = AuxiliaryData(angles=np.ones(global_shape[0], dtype=np.float32))
+    writer = DataSetStoreWriter(
+        slicing_dim=0,
+        comm=MPI.COMM_SELF,
+        temppath=tmp_path,
+        store_backing=DataSetStoreBacking.File,
+    )
+    # blocks of 8 projections are about as large as blocks of 16 sinograms
+    for start in range(0, global_shape[0], 8):
+        writer.write_block(
+            DataSetBlock(
+                data=global_data[start : start + 8],
+                aux_data=aux_data,
+                global_shape=global_shape,
+                chunk_shape=global_shape,
+                block_start=start,
+            )
+        )
+    written_file = writer.filename
+    assert written_file is not None
+    assert writer._h5file is not None
+    assert writer._h5file["data"].chunks == (16, 128, 128)
+
+    reader = writer.make_reader(new_slicing_dim=1)
+    transposed_file = reader.filename
+
+    assert not written_file.exists()
+    assert transposed_file is not None
+    assert transposed_file != written_file
+    assert reader._h5file is not None
+    assert reader._h5file["data"].chunks == calculate_store_chunks(
+        global_shape, global_data.itemsize, 1, 1
+    )
+    assert reader.slicing_dim == 1
+    assert reader.chunk_shape == global_shape
+    np.testing.assert_array_equal(reader.read_block(2, 3).data, global_data[:, 2:5, :])
+
+    reader.finalize()
+
+    assert not transposed_file.exists()
+
+
 def test_can_write_and_read_block_with_different_sizes(tmp_path: PathLike):
     writer = DataSetStoreWriter(
         slicing_dim=0,
@@ -430,7 +694,13 @@ def test_reslice_single_block_single_process(
 )
 @pytest.mark.parametrize(
     "store_backing",
-    [DataSetStoreBacking.RAM, DataSetStoreBacking.File],
+    [
+        DataSetStoreBacking.RAM,
+        DataSetStoreBacking.File,
+        DataSetStoreBacking.CompressedRAM,
+        DataSetStoreBacking.Hybrid,
+        DataSetStoreBacking.LocalFile,
+    ],
 )
 def test_full_integration_with_reslice(
     tmp_path: PathLike,
@@ -511,8 +781,247 @@ def test_full_integration_with_reslice(
         )
 
 
+@pytest.mark.mpi
+@pytest.mark.skipif(
+    MPI.COMM_WORLD.size != 2, reason="Only rank-2 MPI is supported with this test"
+)
+@pytest.mark.parametrize("padding", [(0, 0), (2, 1)], ids=["no-padding", "padded"])
 @pytest.mark.parametrize(
-    "store_backing", [DataSetStoreBacking.RAM, DataSetStoreBacking.File]
+    "store_backing",
+    [
+        DataSetStoreBacking.RAM,
+        DataSetStoreBacking.CompressedRAM,
+        DataSetStoreBacking.Hybrid,
+        DataSetStoreBacking.LocalFile,
+    ],
+)
+def test_full_integration_with_incremental_reslice(
+    tmp_path: PathLike, padding: Tuple[int, int], store_backing: DataSetStoreBacking
+):
+    GLOBAL_DATA_SHAPE = (10, 10, 10)
+    global_data = np.arange(np.prod(GLOBAL_DATA_SHAPE), dtype=np.float32).reshape(
+        GLOBAL_DATA_SHAPE
+    )
+    aux_data = AuxiliaryData(angles=np.ones(GLOBAL_DATA_SHAPE[0], dtype=np.float32))
+    comm = MPI.COMM_WORLD
+
+    chunk_start = 0 if comm.rank == 0 else GLOBAL_DATA_SHAPE[0] // 2
+    chunk_size = GLOBAL_DATA_SHAPE[0] // 2
+    chunk_shape = (chunk_size, GLOBAL_DATA_SHAPE[1], GLOBAL_DATA_SHAPE[2])
+
+    writer = DataSetStoreWriter(
+        slicing_dim=0,
+        comm=comm,
+        temppath=tmp_path,
+        store_backing=store_backing,
+        next_slicing_dim=1,
+    )
+    assert writer.reslices_incrementally is True
+
+    # write the chunk in blocks of 2 slices
+    for block_start in range(0, chunk_size, 2):
+        length = min(2, chunk_size - block_start)
+        block = DataSetBlock(
+            data=global_data[
+                chunk_start + block_start : chunk_start + block_start + length, :, :
+            ],
+            aux_data=aux_data,
+            global_shape=GLOBAL_DATA_SHAPE,
+            block_start=block_start,
+            chunk_start=chunk_start,
+            chunk_shape=chunk_shape,
+        )
+        writer.write_block(block)
+    reader = writer.make_reader(new_slicing_dim=1, padding=padding)
+    block = reader.read_block(0, GLOBAL_DATA_SHAPE[1] // 2)
+
+    assert reader.slicing_dim == 1
+    assert reader.global_shape == GLOBAL_DATA_SHAPE
+    assert reader.chunk_shape == (
+        GLOBAL_DATA_SHAPE[0],
+        GLOBAL_DATA_SHAPE[1] // 2 + padding[0] + padding[1],
+        GLOBAL_DATA_SHAPE[2],
+    )
+    new_start = comm.rank * GLOBAL_DATA_SHAPE[1] // 2
+    np.testing.assert_array_equal(
+        block.data_unpadded,
+        global_data[:, new_start : new_start + GLOBAL_DATA_SHAPE[1] // 2, :],
+    )
+    if comm.rank == 0 and padding[1] > 0:
+        np.testing.assert_array_equal(
+            block.data[:, -padding[1] :, :],
+            global_data[:, new_start + GLOBAL_DATA_SHAPE[1] // 2 :][:, : padding[1], :],
+        )
+
+
+@pytest.mark.mpi
+@pytest.mark.skipif(
+    MPI.COMM_WORLD.size != 2, reason="Only rank-2 MPI is supported with this test"
+)
+def test_incremental_reslice_throttles_pending_sends(
+    mocker: MockerFixture, tmp_path: PathLike
+):
+    GLOBAL_DATA_SHAPE = (10, 10, 10)
+    global_data = np.arange(np.prod(GLOBAL_DATA_SHAPE), dtype=np.float32).reshape(
+        GLOBAL_DATA_SHAPE
+    )
+    aux_data = AuxiliaryData(angles=np.ones(GLOBAL_DATA_SHAPE[0], dtype=np.float32))
+    comm = MPI.COMM_WORLD
+    mocker.patch("httomo.globals.RESLICE_BUFFER_BYTES", 100)
+    throttle = mocker.spy(IncrementalReslicer, "throttle")
+
+    chunk_start = 0 if comm.rank == 0 else GLOBAL_DATA_SHAPE[0] // 2
+    chunk_size = GLOBAL_DATA_SHAPE[0] // 2
+    chunk_shape = (chunk_size, GLOBAL_DATA_SHAPE[1], GLOBAL_DATA_SHAPE[2])
+    writer = DataSetStoreWriter(
+        slicing_dim=0,
+        comm=comm,
+        temppath=tmp_path,
+        store_backing=DataSetStoreBacking.RAM,
+        next_slicing_dim=1,
+    )
+    for block_start in range(0, chunk_size, 2):
+        length = min(2, chunk_size - block_start)
+        block = DataSetBlock(
+            data=global_data[
+                chunk_start + block_start : chunk_start + block_start + length, :, :
+            ],
+            aux_data=aux_data,
+            global_shape=GLOBAL_DATA_SHAPE,
+            block_start=block_start,
+            chunk_start=chunk_start,
+            chunk_shape=chunk_shape,
+        )
+        writer.write_block(block)
+    reader = writer.make_reader(new_slicing_dim=1)
+    block = reader.read_block(0, GLOBAL_DATA_SHAPE[1] // 2)
+
+    assert throttle.call_count == 3
+    throttle.assert_called_with(
+        ANY, max_pending_sends=4 * 2 * comm.size, max_pending_bytes=100
+    )
+    new_start = comm.rank * GLOBAL_DATA_SHAPE[1] // 2
+    np.testing.assert_array_equal(
+        block.data,
+        global_data[:, new_start : new_start + GLOBAL_DATA_SHAPE[1] // 2, :],
+    )
+
+
+@pytest.mark.mpi
+@pytest.mark.skipif(
+    MPI.COMM_WORLD.size != 2, reason="Only rank-2 MPI is supported with this test"
+)
+@pytest.mark.parametrize("next_slicing_dim", [0, 1], ids=["same-dim", "reslice"])
+@pytest.mark.parametrize(
+    "rank_blocks",
+    [
+        # uneven blocks of the whole data, none of which match the static chunks
+        ([(0, 3), (3, 6), (9, 10)], [(6, 9)]),
+        # fewer blocks than processes
+        ([(0, 10)], []),
+    ],
+    ids=["uneven-blocks", "process-without-blocks"],
+)
+def test_dynamic_chunks_end_up_in_static_chunks(
+    tmp_path: PathLike,
+    next_slicing_dim: Literal[0, 1],
+    rank_blocks: Tuple[List[Tuple[int, int]], List[Tuple[int, int]]],
+):
+    GLOBAL_DATA_SHAPE = (10, 6, 8)
+    global_data = np.arange(np.prod(GLOBAL_DATA_SHAPE), dtype=np.float32).reshape(
+        GLOBAL_DATA_SHAPE
+    )
+    aux_data = AuxiliaryData(angles=np.ones(GLOBAL_DATA_SHAPE[0], dtype=np.float32))
+    comm = MPI.COMM_WORLD
+    writer = DataSetStoreWriter(
+        slicing_dim=0,
+        comm=comm,
+        temppath=tmp_path,
+        store_backing=DataSetStoreBacking.RAM,
+        next_slicing_dim=next_slicing_dim,
+        dynamic_chunks=True,
+    )
+    assert writer.redistributes_blocks is True
+
+    for start, stop in rank_blocks[comm.rank]:
+        writer.write_block(
+            DataSetBlock(
+                data=global_data[start:stop],
+                aux_data=aux_data,
+                global_shape=GLOBAL_DATA_SHAPE,
+                block_start=start,
+                chunk_start=0,
+                chunk_shape=GLOBAL_DATA_SHAPE,
+            )
+        )
+    reader = writer.make_reader(new_slicing_dim=next_slicing_dim)
+
+    length = GLOBAL_DATA_SHAPE[next_slicing_dim] // 2
+    new_start = comm.rank * length
+    expected_shape = list(GLOBAL_DATA_SHAPE)
+    expected_shape[next_slicing_dim] = length
+    assert reader.chunk_shape == tuple(expected_shape)
+    block = reader.read_block(0, length)
+    np.testing.assert_array_equal(
+        block.data,
+        np.take(
+            global_data, range(new_start, new_start + length), axis=next_slicing_dim
+        ),
+    )
+
+
+def test_incremental_reslice_ignored_for_single_process(tmp_path: PathLike):
+    writer = DataSetStoreWriter(
+        slicing_dim=0,
+        comm=MPI.COMM_SELF,
+        temppath=tmp_path,
+        store_backing=DataSetStoreBacking.RAM,
+        next_slicing_dim=1,
+    )
+
+    assert writer.reslices_incrementally is False
+
+
+@pytest.mark.mpi
+@pytest.mark.skipif(
+    MPI.COMM_WORLD.size != 2, reason="Only rank-2 MPI is supported with this test"
+)
+def test_incremental_reslice_reader_in_other_dim_throws(tmp_path: PathLike):
+    GLOBAL_DATA_SHAPE = (10, 10, 10)
+    comm = MPI.COMM_WORLD
+    chunk_size = GLOBAL_DATA_SHAPE[0] // 2
+    writer = DataSetStoreWriter(
+        slicing_dim=0,
+        comm=comm,
+        temppath=tmp_path,
+        next_slicing_dim=1,
+    )
+    block = DataSetBlock(
+        data=np.ones((chunk_size, 10, 10), dtype=np.float32),
+        aux_data=AuxiliaryData(angles=np.ones(10, dtype=np.float32)),
+        global_shape=GLOBAL_DATA_SHAPE,
+        block_start=0,
+        chunk_start=comm.rank * chunk_size,
+        chunk_shape=(chunk_size, 10, 10),
+    )
+    writer.write_block(block)
+
+    with pytest.raises(ValueError) as e:
+        writer.make_reader(new_slicing_dim=2)
+
+    assert "resliced incrementally" in str(e)
+
+
+@pytest.mark.parametrize(
+    "store_backing",
+    [
+        DataSetStoreBacking.RAM,
+        DataSetStoreBacking.File,
+        DataSetStoreBacking.Mmap,
+        DataSetStoreBacking.CompressedRAM,
+        DataSetStoreBacking.Hybrid,
+        DataSetStoreBacking.LocalFile,
+    ],
 )
 def test_can_write_blocks_with_padding_and_read(
     tmp_path: PathLike,
@@ -614,6 +1123,7 @@ def test_can_write_and_read_padded_blocks_filebased_center(
     mock_source = mocker.create_autospec(
         DataSetStoreWriter,
         _data=source_data,
+        _reslicer=None,
         is_file_based=True,
         filename=file,
         slicing_dim=0,
@@ -675,6 +1185,7 @@ def test_adapts_shapes_with_padding_and_reslicing(
     mock_source = mocker.create_autospec(
         DataSetStoreWriter,
         _data=source_data,
+        _reslicer=None,
         is_file_based=True,
         filename=file,
         slicing_dim=0,
@@ -736,6 +1247,7 @@ def test_can_write_and_read_padded_blocks_filebased_boundaries(
     mock_source = mocker.create_autospec(
         DataSetStoreWriter,
         _data=source_data,
+        _reslicer=None,
         is_file_based=True,
         filename=file,
         slicing_dim=0,
@@ -841,6 +1353,7 @@ def test_can_write_and_read_padded_blocks_ram(mocker: MockerFixture):
     mock_source = mocker.create_autospec(
         DataSetStoreWriter,
         _data=source_data,
+        _reslicer=None,
         is_file_based=False,
         slicing_dim=0,
         global_shape=GLOBAL_SHAPE,
@@ -929,6 +1442,7 @@ def test_adapts_shapes_with_padding_and_reslicing_mpi(
     mock_source = mocker.create_autospec(
         DataSetStoreWriter,
         _data=source_data,
+        _reslicer=None,
         is_file_based=False,
         slicing_dim=0,
         global_shape=GLOBAL_SHAPE,
@@ -998,3 +1512,163 @@ def test_adapts_shapes_with_padding_and_reslicing_mpi(
 
     np.testing.assert_array_equal(block1.data, b1expected)
     np.testing.assert_array_equal(block2.data, b2expected)
+
+
+@pytest.mark.mpi
+@pytest.mark.skipif(
+    MPI.COMM_WORLD.size != 2, reason="Only rank-2 MPI is supported with this test"
+)
+@pytest.mark.parametrize(
+    "store_backing",
+    [
+        DataSetStoreBacking.RAM,
+        DataSetStoreBacking.File,
+        DataSetStoreBacking.CompressedRAM,
+        DataSetStoreBacking.Hybrid,
+        DataSetStoreBacking.LocalFile,
+    ],
+)
+@pytest.mark.parametrize("next_slicing_dim", [0, 1], ids=["same-dim", "reslice"])
+def test_data_written_by_subset_of_processes_is_redistributed(
+    tmp_path: PathLike,
+    store_backing: DataSetStoreBacking,
+    next_slicing_dim: Literal[0, 1],
+):
+    GLOBAL_DATA_SHAPE = (10, 6, 8)
+    global_data = np.arange(np.prod(GLOBAL_DATA_SHAPE), dtype=np.float32).reshape(
+        GLOBAL_DATA_SHAPE
+    )
+    aux_data = AuxiliaryData(angles=np.ones(GLOBAL_DATA_SHAPE[0], dtype=np.float32))
+    comm = MPI.COMM_WORLD
+    # only rank 0 writes, holding the full data
+    active_comm = comm.Split(0 if comm.rank == 0 else MPI.UNDEFINED, comm.rank)
+    writer = DataSetStoreWriter(
+        slicing_dim=0,
+        comm=comm,
+        temppath=tmp_path,
+        store_backing=store_backing,
+        active_comm=active_comm,
+    )
+    if comm.rank == 0:
+        for start in range(0, GLOBAL_DATA_SHAPE[0], 4):
+            stop = min(start + 4, GLOBAL_DATA_SHAPE[0])
+            writer.write_block(
+                DataSetBlock(
+                    data=global_data[start:stop],
+                    aux_data=aux_data,
+                    global_shape=GLOBAL_DATA_SHAPE,
+                    block_start=start,
+                    chunk_start=0,
+                    chunk_shape=GLOBAL_DATA_SHAPE,
+                )
+            )
+    writer.share_chunk_layout()
+    assert writer.active_procs == 1
+    assert writer.global_shape == GLOBAL_DATA_SHAPE
+
+    reader = writer.make_reader(new_slicing_dim=next_slicing_dim)
+
+    length = GLOBAL_DATA_SHAPE[next_slicing_dim] // 2
+    new_start = comm.rank * length
+    expected_shape = list(GLOBAL_DATA_SHAPE)
+    expected_shape[next_slicing_dim] = length
+    assert reader.chunk_shape == tuple(expected_shape)
+    assert reader.global_index[next_slicing_dim] == new_start
+    block = reader.read_block(0, length)
+    np.testing.assert_array_equal(
+        block.data,
+        np.take(
+            global_data, range(new_start, new_start + length), axis=next_slicing_dim
+        ),
+    )
+
+
+@pytest.mark.mpi
+@pytest.mark.skipif(
+    MPI.COMM_WORLD.size != 2, reason="Only rank-2 MPI is supported with this test"
+)
+def test_reader_for_subset_of_processes_gets_all_data_with_padding(
+    tmp_path: PathLike,
+):
+    GLOBAL_DATA_SHAPE = (10, 6, 8)
+    global_data = np.arange(np.prod(GLOBAL_DATA_SHAPE), dtype=np.float32).reshape(
+        GLOBAL_DATA_SHAPE
+    )
+    aux_data = AuxiliaryData(angles=np.ones(GLOBAL_DATA_SHAPE[0], dtype=np.float32))
+    comm = MPI.COMM_WORLD
+    chunk_size = GLOBAL_DATA_SHAPE[0] // 2
+    chunk_shape = (chunk_size, GLOBAL_DATA_SHAPE[1], GLOBAL_DATA_SHAPE[2])
+    chunk_start = comm.rank * chunk_size
+    writer = DataSetStoreWriter(
+        slicing_dim=0,
+        comm=comm,
+        temppath=tmp_path,
+        store_backing=DataSetStoreBacking.RAM,
+    )
+    writer.write_block(
+        DataSetBlock(
+            data=global_data[chunk_start : chunk_start + chunk_size],
+            aux_data=aux_data,
+            global_shape=GLOBAL_DATA_SHAPE,
+            block_start=0,
+            chunk_start=chunk_start,
+            chunk_shape=chunk_shape,
+        )
+    )
+
+    # only rank 0 reads, in the sinogram dimension
+    active_comm = comm.Split(0 if comm.rank == 0 else MPI.UNDEFINED, comm.rank)
+    reader = writer.make_reader(
+        new_slicing_dim=1, padding=(1, 1), active_comm=active_comm
+    )
+
+    if comm.rank == 0:
+        assert reader.chunk_shape == (10, 8, 8)
+        assert reader.global_index == (0, -1, 0)
+        block = reader.read_block(0, GLOBAL_DATA_SHAPE[1])
+        np.testing.assert_array_equal(block.data_unpadded, global_data)
+    else:
+        assert reader.chunk_shape[1] == 2  # empty chunk, with padding only
+        assert reader.global_index[1] == GLOBAL_DATA_SHAPE[1] - 1
+
+
+@pytest.mark.perf
+@pytest.mark.parametrize("chunked", [False, True], ids=["contiguous", "chunked"])
+def test_file_store_proj2sino_performance(
+    mocker: MockerFixture, tmp_path: PathLike, chunked: bool
+):
+    GLOBAL_SHAPE = (1801, 128, 2560)
+    BLOCK_SLICES = 8
+    comm = MPI.COMM_WORLD
+    writer = DataSetStoreWriter(
+        slicing_dim=0,
+        comm=comm,
+        temppath=tmp_path,
+        store_backing=DataSetStoreBacking.File,
+        read_slicing_dim=1,
+    )
+    if not chunked:
+        mocker.patch.object(writer, "_file_chunks", return_value=None)
+    data = np.ones((BLOCK_SLICES, GLOBAL_SHAPE[1], GLOBAL_SHAPE[2]), dtype=np.float32)
+    aux_data = AuxiliaryData(angles=np.ones(GLOBAL_SHAPE[0], dtype=np.float32))
+
+    start = time.perf_counter_ns()
+    for block_start in range(0, GLOBAL_SHAPE[0], BLOCK_SLICES):
+        length = min(BLOCK_SLICES, GLOBAL_SHAPE[0] - block_start)
+        writer.write_block(
+            DataSetBlock(
+                data=data[:length],
+                aux_data=aux_data,
+                global_shape=GLOBAL_SHAPE,
+                block_start=block_start,
+                chunk_start=0,
+                chunk_shape=GLOBAL_SHAPE,
+            )
+        )
+    reader = writer.make_reader(new_slicing_dim=1)
+    for block_start in range(0, GLOBAL_SHAPE[1], BLOCK_SLICES):
+        reader.read_block(block_start, min(BLOCK_SLICES, GLOBAL_SHAPE[1] - block_start))
+    duration_ms = float(time.perf_counter_ns() - start) * 1e-6
+    reader.finalize()
+
+    assert "performance in ms" == duration_ms
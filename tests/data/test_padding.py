@@ -1,8 +1,15 @@
+from pathlib import Path
 from typing import List
+import h5py
 import numpy as np
 import pytest
 
-from httomo.data.padding import extrapolate_after, extrapolate_before
+from httomo.data.padding import (
+    Halo,
+    extrapolate_after,
+    extrapolate_before,
+    read_runs_into_block,
+)
 from httomo.preview import PreviewConfig, PreviewDimConfig
 
 
@@ -234,3 +241,73 @@ def test_extrapolate_after_previewed(slicing_dim: int):
         preview_config=PREVIEW_CONFIG,
     )
     np.testing.assert_array_equal(block_data, expected_padded_block)
+
+
+@pytest.mark.parametrize(
+    "slicing_dim",
+    [0, 1],
+    ids=["projection-padding", "sinogram-padding"],
+)
+def test_halo_fills_start_of_next_block(slicing_dim: int):
+    GLOBAL_SHAPE = (20, 16, 6)
+    PADDING = (2, 3)
+    global_data = np.arange(np.prod(GLOBAL_SHAPE), dtype=np.float32).reshape(
+        GLOBAL_SHAPE
+    )
+    halo = Halo(slicing_dim, PADDING[0] + PADDING[1])
+
+    def take(start: int, stop: int) -> np.ndarray:
+        slices = [slice(None)] * 3
+        slices[slicing_dim] = slice(start, stop)
+        return global_data[slices[0], slices[1], slices[2]]
+
+    # the first block, for the core [2, 6), holds the range [0, 9)
+    block_data = take(0, 9).copy()
+    assert halo.fill(block_data, 0, 0, 9) == 0
+    halo.keep(block_data, 0, 0, 9)
+    # methods may modify the block in-place
+    block_data[:] = -1
+
+    # the next block, for the core [6, 10), holds the range [4, 13)
+    next_block_shape = list(GLOBAL_SHAPE)
+    next_block_shape[slicing_dim] = 9
+    next_block = np.zeros(next_block_shape, dtype=np.float32)
+    assert halo.fill(next_block, 4, 4, 13) == 9
+
+    expected = np.zeros(next_block_shape, dtype=np.float32)
+    slices = [slice(None)] * 3
+    slices[slicing_dim] = slice(0, 5)
+    expected[slices[0], slices[1], slices[2]] = take(4, 9)
+    np.testing.assert_array_equal(next_block, expected)
+
+
+def test_halo_ignores_blocks_not_following_on():
+    halo = Halo(0, 2)
+    block_data = np.ones((6, 2, 2), dtype=np.float32)
+    halo.keep(block_data, 10, 10, 16)
+
+    assert halo.fill(np.zeros((6, 2, 2), dtype=np.float32), 0, 0, 6) == 0
+    assert halo.fill(np.zeros((6, 2, 2), dtype=np.float32), 16, 16, 22) == 16
+
+
+@pytest.mark.parametrize("in_file", [False, True], ids=["numpy", "h5py"])
+def test_read_runs_into_block(tmp_path: Path, in_file: bool):
+    global_data = np.arange(20 * 4 * 5, dtype=np.float32).reshape(20, 4, 5)
+    RUNS = [(2, 5), (7, 8), (10, 14)]
+    block_data = np.zeros((10, 2, 5), dtype=np.float32)
+    slices_read = (slice(None), slice(1, 3), slice(None))
+    slices_wrt = (slice(1, 9), slice(None), slice(None))
+
+    if in_file:
+        with h5py.File(tmp_path / "data.h5", "w") as f:
+            f.create_dataset("data", data=global_data)
+        with h5py.File(tmp_path / "data.h5", "r") as f:
+            read_runs_into_block(
+                f["data"], block_data, 0, RUNS, slices_read, slices_wrt
+            )
+    else:
+        read_runs_into_block(global_data, block_data, 0, RUNS, slices_read, slices_wrt)
+
+    expected = np.zeros_like(block_data)
+    expected[1:9] = global_data[[2, 3, 4, 7, 10, 11, 12, 13], 1:3, :]
+    np.testing.assert_array_equal(block_data, expected)
@@ -0,0 +1,47 @@
+from os import PathLike
+
+import numpy as np
+
+from httomo.data.spilled_chunk import SpilledChunk
+
+
+def test_spilled_chunk_keeps_what_fits_in_memory(tmp_path: PathLike):
+    data = np.arange(10 * 4 * 5, dtype=np.float32).reshape(10, 4, 5)
+    slice_bytes = 4 * 5 * data.itemsize
+    chunk = SpilledChunk(data.shape, data.dtype, 0, 6 * slice_bytes, tmp_path)
+
+    chunk[:, :, :] = data
+
+    assert chunk.spilled_nbytes == 4 * slice_bytes
+    assert chunk.filename is not None
+    assert chunk.filename.exists()
+    np.testing.assert_array_equal(chunk[:, :, :], data)
+    # across the boundary between memory and file, in both dimensions
+    np.testing.assert_array_equal(chunk[4:8], data[4:8])
+    np.testing.assert_array_equal(chunk[:, 1:3, :], data[:, 1:3, :])
+
+    chunk.close()
+
+    assert not chunk.filename.exists()
+
+
+def test_spilled_chunk_doesnt_create_file_if_it_fits(tmp_path: PathLike):
+    chunk = SpilledChunk((10, 4, 5), np.float32, 1, 10**6, tmp_path)
+
+    chunk[:, 1:2, :] = 3.0
+
+    assert chunk.spilled_nbytes == 0
+    assert chunk.filename is None
+    np.testing.assert_array_equal(chunk[:, 1:2, :], np.full((10, 1, 5), 3.0))
+    chunk.close()
+
+
+def test_spilled_chunk_like_splits_in_given_dim(tmp_path: PathLike):
+    chunk = SpilledChunk((10, 4, 5), np.float32, 0, 0, tmp_path)
+
+    other = chunk.like((2, 20, 5), (0, 4, 0), 1)
+
+    assert other.shape == (2, 20, 5)
+    assert other.spilled_nbytes == 2 * 20 * 5 * 4
+    chunk.close()
+    other.close()
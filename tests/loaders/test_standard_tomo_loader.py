@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Literal, Tuple
+from typing import Dict, Literal, Optional, Tuple
 from unittest import mock
 
 import h5py
@@ -8,7 +8,10 @@ import numpy as np
 from mpi4py import MPI
 from pytest_mock import MockerFixture
 
-from httomo.darks_flats import DarksFlatsFileConfig
+import httomo.loaders.standard_tomo_loader
+from httomo.darks_flats import DarksFlatsFileConfig, get_darks_flats
+from httomo.data.hdf._utils.chunk import calculate_chunk_cache
+from httomo.data.padding import Halo
 from httomo.loaders.standard_tomo_loader import StandardTomoLoader
 from httomo.loaders.types import RawAngles, UserDefinedAngles
 from httomo.preview import PreviewConfig, PreviewDimConfig
@@ -16,7 +19,11 @@ from httomo.preview import PreviewConfig, PreviewDimConfig
 SlicingDimType = Literal[0, 1, 2]
 
 
-def make_standard_tomo_loader() -> StandardTomoLoader:
+def make_standard_tomo_loader(
+    padding: Tuple[int, int] = (0, 0),
+    collective_reads: Optional[Dict[str, str]] = None,
+    super_block_bytes: int = 0,
+) -> StandardTomoLoader:
     """
     Create an instance of `StandardTomoLoader` with some commonly used default values for
     loading the test data `tomo_standard.nxs`.
@@ -45,6 +52,9 @@ def make_standard_tomo_loader() -> StandardTomoLoader:
         preview_config=PREVIEW_CONFIG,
         slicing_dim=SLICING_DIM,
         comm=COMM,
+        padding=padding,
+        collective_reads=collective_reads,
+        super_block_bytes=super_block_bytes,
     )
     return loader
 
@@ -697,27 +707,27 @@ def test_standard_tomo_loader_closes_file(mocker: MockerFixture):
     file_close.assert_called_once()
 
 
-def test_standard_tomo_loader_raises_error_slicing_dim(
+@pytest.mark.parametrize("super_block_bytes", [0, 2**20], ids=["blocks", "super"])
+def test_standard_tomo_loader_reads_sinograms(
     standard_data_darks_flats_config: DarksFlatsFileConfig,
+    super_block_bytes: int,
 ):
     IN_FILE_PATH = Path(__file__).parent.parent / "test_data/tomo_standard.nxs"
     ANGLES_CONFIG = RawAngles(data_path="/entry1/tomo_entry/data/rotation_angle")
     PREVIEW_CONFIG = PreviewConfig(
         angles=PreviewDimConfig(start=0, stop=180),
-        detector_y=PreviewDimConfig(start=0, stop=128),
+        detector_y=PreviewDimConfig(start=10, stop=30),
         detector_x=PreviewDimConfig(start=0, stop=160),
     )
     SLICING_DIM: SlicingDimType = 1
-    COMM = MPI.COMM_WORLD
+    PADDING = (1, 2)
+    BLOCK_LENGTH = 6
 
-    with (
-        mock.patch(
-            "httomo.darks_flats.get_darks_flats",
-            return_value=(np.zeros(1), np.zeros(1)),
-        ),
-        pytest.raises(NotImplementedError),
+    with mock.patch(
+        "httomo.darks_flats.get_darks_flats",
+        return_value=(np.zeros(1), np.zeros(1)),
     ):
-        _ = StandardTomoLoader(
+        loader = StandardTomoLoader(
             in_file=IN_FILE_PATH,
             data_path=standard_data_darks_flats_config.data_path,
             image_key_path=standard_data_darks_flats_config.image_key_path,
@@ -726,7 +736,34 @@ def test_standard_tomo_loader_raises_error_slicing_dim(
             preview_config=PREVIEW_CONFIG,
             angles=ANGLES_CONFIG,
             slicing_dim=SLICING_DIM,
-            comm=COMM,
+            comm=MPI.COMM_SELF,
+            padding=PADDING,
+            super_block_bytes=super_block_bytes,
+        )
+
+    with h5py.File(IN_FILE_PATH, "r") as f:
+        image_key = f[standard_data_darks_flats_config.image_key_path][:]
+        indices = np.flatnonzero(image_key == 0)
+        indices = indices[indices < PREVIEW_CONFIG.angles.stop]
+        sinograms = f[standard_data_darks_flats_config.data_path][indices, 10:30, :]
+    assert loader.global_shape == sinograms.shape
+    assert loader.global_index == (0, -PADDING[0], 0)
+    assert loader.chunk_shape == sinograms.shape
+
+    # the padding at the boundaries of the data is extrapolated
+    padded_sinograms = np.concatenate(
+        [sinograms[:, :1]] * PADDING[0]
+        + [sinograms]
+        + [sinograms[:, -1:]] * PADDING[1],
+        axis=1,
+    )
+    for start in range(0, sinograms.shape[1], BLOCK_LENGTH):
+        length = min(BLOCK_LENGTH, sinograms.shape[1] - start)
+        block = loader.read_block(start, length)
+        assert block.slicing_dim == SLICING_DIM
+        np.testing.assert_array_equal(
+            block.data,
+            padded_sinograms[:, start : start + length + PADDING[0] + PADDING[1]],
         )
 
 
@@ -1255,3 +1292,243 @@ def test_standard_tomo_loader_read_block_padded_inner_chunk_boundaries_two_procs
     assert block.chunk_index == block_expected_chunk_index
     assert block.chunk_index_unpadded == block_expected_chunk_index_unpadded
     assert block.data.shape == expected_block_shape
+
+
+def test_standard_tomo_loader_reads_padding_of_consecutive_blocks_once(
+    mocker: MockerFixture,
+):
+    PADDING = (2, 3)
+    BLOCK_LENGTH = 4
+    with mock.patch(
+        "httomo.darks_flats.get_darks_flats",
+        return_value=(np.zeros(1), np.zeros(1)),
+    ):
+        loader = make_standard_tomo_loader(padding=PADDING)
+        fresh_loader = make_standard_tomo_loader(padding=PADDING)
+    read_spy = mocker.spy(httomo.loaders.standard_tomo_loader, "read_into_block")
+
+    for start in range(0, 3 * BLOCK_LENGTH, BLOCK_LENGTH):
+        block = loader.read_block(start, BLOCK_LENGTH)
+        # a loader which has never read the block before
+        fresh_loader._halo = Halo(0, PADDING[0] + PADDING[1])
+        expected = fresh_loader.read_block(start, BLOCK_LENGTH)
+        np.testing.assert_array_equal(block.data, expected.data)
+
+    # the blocks after the first only read the slices that weren't in the previous one
+    slices_read = [
+        call.args[2][0].stop - call.args[2][0].start
+        for call in read_spy.call_args_list[::2]
+    ]
+    assert slices_read == [BLOCK_LENGTH + PADDING[1], BLOCK_LENGTH, BLOCK_LENGTH]
+
+
+@pytest.mark.parametrize("padding", [(0, 0), (2, 1)], ids=["no_padding", "padding"])
+def test_standard_tomo_loader_reads_super_blocks(
+    mocker: MockerFixture, padding: Tuple[int, int]
+):
+    BLOCK_LENGTH = 3
+    SUPER_BLOCK_SLICES = 10
+    with mock.patch(
+        "httomo.darks_flats.get_darks_flats",
+        return_value=(np.zeros(1), np.zeros(1)),
+    ):
+        loader = make_standard_tomo_loader(padding=padding)
+        slice_bytes = (
+            loader.global_shape[1] * loader.global_shape[2] * loader.dtype.itemsize
+        )
+        super_block_loader = make_standard_tomo_loader(
+            padding=padding, super_block_bytes=SUPER_BLOCK_SLICES * slice_bytes
+        )
+    read_spy = mocker.spy(httomo.loaders.standard_tomo_loader, "read_into_block")
+
+    for start in range(0, 6 * BLOCK_LENGTH, BLOCK_LENGTH):
+        expected = loader.read_block(start, BLOCK_LENGTH)
+        read_spy.reset_mock()
+        block = super_block_loader.read_block(start, BLOCK_LENGTH)
+        np.testing.assert_array_equal(block.data, expected.data)
+        # the file is only read when the block goes beyond the current super-block
+        if start in [0, 3 * BLOCK_LENGTH]:
+            read_spy.assert_called_once()
+            slices_read = read_spy.call_args.args[2][0]
+            assert slices_read.stop - slices_read.start == SUPER_BLOCK_SLICES
+        else:
+            read_spy.assert_not_called()
+
+    super_block_loader.finish_reads()
+    assert super_block_loader._super_block is None
+
+
+@pytest.mark.parametrize("super_block_bytes", [0, 2**20], ids=["blocks", "super"])
+def test_standard_tomo_loader_reads_non_consecutive_projections(
+    mocker: MockerFixture, tmp_path: Path, super_block_bytes: int
+):
+    # flats taken in the middle of the scan
+    IMAGE_KEY = np.array([2, 1, 0, 0, 0, 1, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 2])
+    data = np.arange(len(IMAGE_KEY) * 4 * 5, dtype=np.float32).reshape(-1, 4, 5)
+    IN_FILE_PATH = tmp_path / "interleaved.nxs"
+    with h5py.File(IN_FILE_PATH, "w") as f:
+        f.create_dataset("data", data=data)
+        f.create_dataset("image_key", data=IMAGE_KEY)
+    DARKS_FLATS_CONFIG = DarksFlatsFileConfig(
+        file=IN_FILE_PATH, data_path="data", image_key_path="image_key"
+    )
+    PADDING = (1, 1)
+    BLOCK_LENGTH = 4
+    with mock.patch(
+        "httomo.darks_flats.get_darks_flats",
+        return_value=(np.zeros(1), np.zeros(1)),
+    ):
+        loader = StandardTomoLoader(
+            in_file=IN_FILE_PATH,
+            data_path="data",
+            image_key_path="image_key",
+            darks=DARKS_FLATS_CONFIG,
+            flats=DARKS_FLATS_CONFIG,
+            angles=UserDefinedAngles(start_angle=0, stop_angle=180, angles_total=12),
+            preview_config=PreviewConfig(
+                angles=PreviewDimConfig(start=0, stop=len(IMAGE_KEY)),
+                detector_y=PreviewDimConfig(start=0, stop=4),
+                detector_x=PreviewDimConfig(start=0, stop=5),
+            ),
+            slicing_dim=0,
+            comm=MPI.COMM_SELF,
+            padding=PADDING,
+            super_block_bytes=super_block_bytes,
+        )
+    runs_spy = mocker.spy(httomo.loaders.standard_tomo_loader, "read_runs_into_block")
+
+    projections = data[IMAGE_KEY == 0]
+    assert loader.global_shape == projections.shape
+    # the padding at the boundaries of the data is extrapolated
+    padded_projections = np.concatenate(
+        [projections[:1], projections, projections[-1:]]
+    )
+    for start in range(0, len(projections), BLOCK_LENGTH):
+        block = loader.read_block(start, BLOCK_LENGTH)
+        np.testing.assert_array_equal(
+            block.data,
+            padded_projections[start : start + BLOCK_LENGTH + PADDING[0] + PADDING[1]],
+        )
+    # the runs of consecutive frames of a (super-)block are read in one go
+    if super_block_bytes:
+        runs_spy.assert_called_once()
+        assert runs_spy.call_args.args[3] == [(2, 5), (7, 11), (12, 17)]
+    else:
+        # the last block is within a single run
+        assert runs_spy.call_count == 2
+        assert runs_spy.call_args.args[3] == [(9, 11), (12, 14)]
+
+
+def test_standard_tomo_loader_reads_sinograms_of_non_consecutive_projections(
+    tmp_path: Path,
+):
+    # flats taken in the middle of the scan, and one chunk per frame
+    IMAGE_KEY = np.array([2, 1, 0, 0, 0, 1, 1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 2])
+    data = np.arange(len(IMAGE_KEY) * 8 * 5, dtype=np.float32).reshape(-1, 8, 5)
+    IN_FILE_PATH = tmp_path / "interleaved.nxs"
+    with h5py.File(IN_FILE_PATH, "w") as f:
+        f.create_dataset("data", data=data, chunks=(1, 8, 5))
+        f.create_dataset("image_key", data=IMAGE_KEY)
+    DARKS_FLATS_CONFIG = DarksFlatsFileConfig(
+        file=IN_FILE_PATH, data_path="data", image_key_path="image_key"
+    )
+    PADDING = (1, 1)
+    BLOCK_LENGTH = 3
+    with mock.patch(
+        "httomo.darks_flats.get_darks_flats",
+        return_value=(np.zeros(1), np.zeros(1)),
+    ):
+        loader = StandardTomoLoader(
+            in_file=IN_FILE_PATH,
+            data_path="data",
+            image_key_path="image_key",
+            darks=DARKS_FLATS_CONFIG,
+            flats=DARKS_FLATS_CONFIG,
+            angles=UserDefinedAngles(start_angle=0, stop_angle=180, angles_total=12),
+            preview_config=PreviewConfig(
+                angles=PreviewDimConfig(start=0, stop=len(IMAGE_KEY)),
+                detector_y=PreviewDimConfig(start=1, stop=7),
+                detector_x=PreviewDimConfig(start=0, stop=5),
+            ),
+            slicing_dim=1,
+            comm=MPI.COMM_SELF,
+            padding=PADDING,
+        )
+
+    # the chunk cache holds the chunks of all frames
+    nslots, cache_bytes, _ = loader._data.id.get_access_plist().get_chunk_cache()
+    assert (cache_bytes, nslots) == calculate_chunk_cache(
+        data.shape, (1, 8, 5), data.itemsize, 1
+    )
+    assert cache_bytes >= data.nbytes
+    sinograms = data[IMAGE_KEY == 0, 1:7, :]
+    padded_sinograms = np.concatenate(
+        [sinograms[:, :1], sinograms, sinograms[:, -1:]], axis=1
+    )
+    for start in range(0, sinograms.shape[1], BLOCK_LENGTH):
+        block = loader.read_block(start, BLOCK_LENGTH)
+        np.testing.assert_array_equal(
+            block.data,
+            padded_sinograms[:, start : start + BLOCK_LENGTH + PADDING[0] + PADDING[1]],
+        )
+
+
+@pytest.mark.mpi
+@pytest.mark.skipif(
+    MPI.COMM_WORLD.size != 2, reason="Only rank-2 MPI is supported with this test"
+)
+def test_standard_tomo_loader_reads_aux_data_on_first_process_only(
+    mocker: MockerFixture,
+    standard_data_path: str,
+    standard_image_key_path: str,
+):
+    IN_FILE_PATH = Path(__file__).parent.parent / "test_data/tomo_standard.nxs"
+    read_spy = mocker.spy(httomo.loaders.standard_tomo_loader, "get_darks_flats")
+    loader = make_standard_tomo_loader()
+
+    assert read_spy.call_count == (1 if MPI.COMM_WORLD.rank == 0 else 0)
+    config = DarksFlatsFileConfig(
+        file=IN_FILE_PATH,
+        data_path=standard_data_path,
+        image_key_path=standard_image_key_path,
+    )
+    expected_darks, expected_flats = get_darks_flats(
+        config, config, loader._preview.config
+    )
+    with h5py.File(IN_FILE_PATH, "r") as f:
+        expected_angles = np.deg2rad(f["/entry1/tomo_entry/data/rotation_angle"][...])
+    np.testing.assert_array_equal(loader.darks, expected_darks)
+    np.testing.assert_array_equal(loader.flats, expected_flats)
+    np.testing.assert_array_equal(loader.aux_data.get_angles(), expected_angles)
+    # the processes of a node share the same memory
+    assert loader.darks is not None and not loader.darks.flags.writeable
+
+
+@pytest.mark.mpi
+@pytest.mark.skipif(
+    MPI.COMM_WORLD.size != 2, reason="Only rank-2 MPI is supported with this test"
+)
+def test_standard_tomo_loader_collective_reads_different_number_of_blocks():
+    PADDING = (1, 2)
+    BLOCK_LENGTH = 5
+    COMM = MPI.COMM_WORLD
+    with mock.patch(
+        "httomo.darks_flats.get_darks_flats",
+        return_value=(np.zeros(1), np.zeros(1)),
+    ):
+        loader = make_standard_tomo_loader(
+            padding=PADDING, collective_reads={"romio_cb_read": "enable"}
+        )
+        independent_loader = make_standard_tomo_loader(padding=PADDING)
+    assert loader._h5file.driver == "mpio"
+
+    # the second process is done after the first block, and takes part in the
+    # remaining reads of the first one with `finish_reads`
+    blocks = 3 if COMM.rank == 0 else 1
+    for start in range(0, blocks * BLOCK_LENGTH, BLOCK_LENGTH):
+        block = loader.read_block(start, BLOCK_LENGTH)
+        expected = independent_loader.read_block(start, BLOCK_LENGTH)
+        np.testing.assert_array_equal(block.data, expected.data)
+    loader.finish_reads()
+
+    assert not loader._h5file
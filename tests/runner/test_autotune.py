@@ -0,0 +1,152 @@
+import json
+from os import PathLike
+from pathlib import Path
+
+import numpy as np
+import pytest
+from mpi4py import MPI
+from pytest_mock import MockerFixture
+
+from httomo.data.dataset_store import DataSetStoreWriter
+from httomo.runner.autotune import CpuBlockSizeTuner
+from httomo.runner.dataset import DataSetBlock
+from httomo.runner.dataset_store_backing import DataSetStoreBacking
+from httomo.runner.pipeline import Pipeline
+from httomo.runner.task_runner import TaskRunner
+
+from ..testing_utils import make_test_loader, make_test_method
+
+
+def test_candidate_slices_are_capped_and_unique(tmp_path: PathLike):
+    tuner = CpuBlockSizeTuner(None, "hash", MPI.COMM_SELF)
+
+    assert tuner.candidate_slices(64, 1000) == [16, 32, 64, 128, 256]
+    assert tuner.candidate_slices(64, 100) == [16, 32, 64, 100]
+    assert tuner.candidate_slices(2, 100) == [1, 2, 4, 8]
+
+
+def test_select_picks_best_throughput():
+    tuner = CpuBlockSizeTuner(None, "hash", MPI.COMM_SELF)
+
+    # 8 slices/s, 10 slices/s, 5 slices/s, not tried
+    best = tuner.select([4, 8, 16, 32], [0.5, 0.8, 3.2, None])
+
+    assert best == 8
+
+
+def test_select_returns_none_if_nothing_tried():
+    tuner = CpuBlockSizeTuner(None, "hash", MPI.COMM_SELF)
+
+    assert tuner.select([4, 8], [None, None]) is None
+
+
+def test_tuned_slices_are_cached(tmp_path: PathLike):
+    cache_file = Path(tmp_path) / "cache" / "tuning.json"
+    tuner = CpuBlockSizeTuner(cache_file, "hash", MPI.COMM_SELF)
+    key = tuner.key(1, (100, 20, 30), np.dtype(np.float32))
+    assert tuner.cached_slices(key) is None
+
+    tuner.store(key, 32)
+
+    assert json.loads(cache_file.read_text()) == {key: 32}
+    assert CpuBlockSizeTuner(cache_file, "hash", MPI.COMM_SELF).cached_slices(key) == 32
+    other_pipeline = CpuBlockSizeTuner(cache_file, "other", MPI.COMM_SELF)
+    assert (
+        other_pipeline.cached_slices(
+            other_pipeline.key(1, (100, 20, 30), np.dtype(np.float32))
+        )
+        is None
+    )
+
+
+def test_task_runner_tunes_cpu_section_and_reuses_cache(
+    mocker: MockerFixture, dummy_block: DataSetBlock, tmp_path: PathLike
+):
+    mocker.patch(
+        "httomo.runner.task_runner.determine_store_backing",
+        return_value=DataSetStoreBacking.RAM,
+    )
+    cache_file = Path(tmp_path) / "tuning.json"
+
+    def run_section():
+        loader = make_test_loader(mocker, dummy_block)
+        method = make_test_method(mocker, method_name="m1")
+        block_lengths = []
+
+        def double(block: DataSetBlock) -> DataSetBlock:
+            block_lengths.append(block.shape[0])
+            block.data = block.data * 2
+            return block
+
+        mocker.patch.object(method, "execute", side_effect=double)
+        p = Pipeline(loader=loader, methods=[method])
+        tuner = CpuBlockSizeTuner(
+            cache_file, "hash", MPI.COMM_WORLD, factors=(0.1, 0.2, 0.3)
+        )
+        t = TaskRunner(p, reslice_dir=tmp_path, comm=MPI.COMM_WORLD, autotuner=tuner)
+        t._prepare()
+        t._sections[0].is_last = False
+        t._execute_section(t._sections[0])
+        assert isinstance(t.sink, DataSetStoreWriter)
+        data = t.sink.make_reader().read_block(0, dummy_block.shape[0]).data
+        return block_lengths, data, t._sections[0].max_slices
+
+    block_lengths, data, tuned = run_section()
+
+    # first a warm-up block, then the candidates are tried, then the rest is processed
+    # with the best one
+    assert block_lengths[:4] == [1, 1, 2, 3]
+    assert tuned in [1, 2, 3]
+    assert all(length <= tuned for length in block_lengths[4:])
+    assert sum(block_lengths) == dummy_block.shape[0]
+    np.testing.assert_array_equal(data, dummy_block.data * 2)
+
+    block_lengths, data, cached = run_section()
+
+    assert cached == tuned
+    assert block_lengths[0] == tuned
+    assert sum(block_lengths) == dummy_block.shape[0]
+    np.testing.assert_array_equal(data, dummy_block.data * 2)
+
+
+@pytest.mark.mpi
+@pytest.mark.skipif(
+    MPI.COMM_WORLD.size != 2, reason="Only rank-2 MPI is supported with this test"
+)
+def test_task_runner_tunes_with_same_blocks_on_all_processes(
+    mocker: MockerFixture, dummy_block: DataSetBlock, tmp_path: PathLike
+):
+    mocker.patch(
+        "httomo.runner.task_runner.determine_store_backing",
+        return_value=DataSetStoreBacking.RAM,
+    )
+    comm = MPI.COMM_WORLD
+    # chunks of 5 and 6 slices
+    global_shape = (11, dummy_block.shape[1], dummy_block.shape[2])
+    chunk_start = 0 if comm.rank == 0 else 5
+    chunk_shape = (5 + comm.rank, global_shape[1], global_shape[2])
+    block = DataSetBlock(
+        data=np.ones(chunk_shape, dtype=np.float32),
+        aux_data=dummy_block.aux_data,
+        global_shape=global_shape,
+        chunk_start=chunk_start,
+        chunk_shape=chunk_shape,
+    )
+    loader = make_test_loader(mocker, block)
+    method = make_test_method(mocker, method_name="m1")
+    mocker.patch.object(method, "execute", side_effect=lambda block: block)
+    p = Pipeline(loader=loader, methods=[method])
+    # a warm-up block and candidates of 1 and 4 slices fit into the larger chunk only
+    tuner = CpuBlockSizeTuner(None, "hash", comm, factors=(0.2, 0.8))
+    t = TaskRunner(p, reslice_dir=tmp_path, comm=comm, autotuner=tuner)
+    t._prepare()
+    t._sections[0].max_slices = chunk_shape[0]
+    t._sections[0].is_last = False
+    t._setup_source_sink(t._sections[0], 0)
+
+    tuned_slices = t._autotune_block_size(t._sections[0], 0)
+
+    # the same blocks are processed everywhere, so no process enters a collective
+    # (e.g. the loader's collective reads) that the others don't
+    assert comm.allgather(tuned_slices) == [2, 2]
+    assert comm.allgather(method.execute.call_count) == [2, 2]
@@ -1,7 +1,9 @@
 from unittest.mock import call
+import numpy as np
 import pytest
+from mpi4py import MPI
 from pytest_mock import MockerFixture
-from httomo.runner.block_split import BlockSplitter
+from httomo.runner.block_split import BlockSplitter, DynamicBlockSplitter
 from httomo.runner.dataset_store_interfaces import DataSetSource
 
 
@@ -133,3 +135,55 @@ def test_block_can_iterate(mocker: MockerFixture, slicing_dim: int):
     source.read_block.assert_has_calls(
         [call(0, max_slices), call(max_slices, max_slices)]
     )
+
+
+@pytest.mark.parametrize("slicing_dim", [0, 1], ids=["proj", "sino"])
+def test_block_splitter_from_start(mocker: MockerFixture, slicing_dim: int):
+    CHUNK_SHAPE = (10, 10, 100)
+    source = mocker.create_autospec(
+        DataSetSource, chunk_shape=CHUNK_SHAPE, slicing_dim=slicing_dim
+    )
+
+    splitter = BlockSplitter(source, 4, start=3)
+    list(splitter)
+
+    assert len(splitter) == 2
+    source.read_block.assert_has_calls([call(3, 4), call(7, 3)])
+
+
+@pytest.mark.parametrize("slicing_dim", [0, 1], ids=["proj", "sino"])
+def test_dynamic_block_splitter_single_process_reads_all_blocks(
+    mocker: MockerFixture, slicing_dim: int
+):
+    CHUNK_SHAPE = (10, 10, 100)
+    source = mocker.create_autospec(
+        DataSetSource, chunk_shape=CHUNK_SHAPE, slicing_dim=slicing_dim
+    )
+
+    splitter = DynamicBlockSplitter(source, 4, MPI.COMM_SELF)
+    list(splitter)
+    splitter.finalize()
+
+    assert len(splitter) == 3
+    source.read_block.assert_has_calls([call(0, 4), call(4, 4), call(8, 2)])
+
+
+@pytest.mark.mpi
+@pytest.mark.skipif(
+    MPI.COMM_WORLD.size != 2, reason="Only rank-2 MPI is supported with this test"
+)
+def test_dynamic_block_splitter_hands_out_every_block_once(mocker: MockerFixture):
+    CHUNK_SHAPE = (23, 10, 100)
+    comm = MPI.COMM_WORLD
+    source = mocker.create_autospec(
+        DataSetSource, chunk_shape=CHUNK_SHAPE, slicing_dim=0
+    )
+
+    splitter = DynamicBlockSplitter(source, 2, comm)
+    list(splitter)
+    splitter.finalize()
+
+    starts = [c.args[0] for c in source.read_block.call_args_list]
+    assert starts[0] == comm.rank * 2
+    all_starts = np.concatenate(comm.allgather(np.array(starts, dtype=np.int64)))
+    np.testing.assert_array_equal(np.sort(all_starts), np.arange(0, 23, 2))
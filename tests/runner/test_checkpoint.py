@@ -0,0 +1,151 @@
+from os import PathLike
+from pathlib import Path
+
+import numpy as np
+import pytest
+from mpi4py import MPI
+from pytest_mock import MockerFixture
+
+from httomo.data.dataset_store import DataSetStoreWriter
+from httomo.runner.auxiliary_data import AuxiliaryData
+from httomo.runner.checkpoint import SectionCheckpoint, pipeline_hash
+from httomo.runner.dataset import DataSetBlock
+from httomo.runner.dataset_store_backing import DataSetStoreBacking
+from httomo.runner.output_ref import OutputRef
+from httomo.runner.pipeline import Pipeline
+from httomo.runner.task_runner import TaskRunner
+from httomo.utils import Pattern
+
+from ..testing_utils import make_test_loader, make_test_method
+
+
+def _write_chunk_in_blocks(sink, global_data: np.ndarray, aux_data: AuxiliaryData):
+    for start in range(0, global_data.shape[0], 3):
+        sink.write_block(
+            DataSetBlock(
+                data=global_data[start : start + 3],
+                aux_data=aux_data,
+                block_start=start,
+                chunk_start=0,
+                global_shape=global_data.shape,
+                chunk_shape=global_data.shape,
+            )
+        )
+
+
+def test_pipeline_hash_changes_with_config(tmp_path: PathLike):
+    config = Path(tmp_path) / "pipeline.yaml"
+    config.write_text("- method: a\n")
+    hash1 = pipeline_hash(config)
+    config.write_text("- method: b\n")
+    hash2 = pipeline_hash(config)
+
+    assert hash1 != hash2
+    assert hash2 == pipeline_hash(config)
+
+
+def test_checkpoint_commit_and_restore(tmp_path: PathLike):
+    checkpoint = SectionCheckpoint(
+        Path(tmp_path) / "checkpoint", "hash", "input.nxs", MPI.COMM_SELF
+    )
+    assert checkpoint.completed_sections() == 0
+
+    global_data = np.arange(10 * 4 * 5, dtype=np.float32).reshape((10, 4, 5))
+    aux_data = AuxiliaryData(
+        angles=np.linspace(0, 1, 10, dtype=np.float32),
+        darks=np.zeros((2, 4, 5), dtype=np.float32),
+        flats=np.ones((2, 4, 5), dtype=np.float32),
+    )
+    writer = DataSetStoreWriter(0, MPI.COMM_SELF, tmp_path)
+    sink = checkpoint.make_sink(writer, 0)
+    _write_chunk_in_blocks(sink, global_data, aux_data)
+    checkpoint.commit(0, sink, {"cor": 42.0}, {"task_1": {"cor": 42.0}})
+
+    assert checkpoint.completed_sections() == 1
+    assert checkpoint.stored_shape_and_dtype(0) == (global_data.shape, np.float32)
+    # the sink still passes the data on to the wrapped writer
+    np.testing.assert_array_equal(
+        sink.make_reader().read_block(0, 10).data, global_data
+    )
+
+    restored = DataSetStoreWriter(0, MPI.COMM_SELF, tmp_path)
+    side_outputs, method_side_outputs = checkpoint.restore(0, restored, 4)
+    block = restored.make_reader().read_block(0, 10)
+
+    assert side_outputs == {"cor": 42.0}
+    assert method_side_outputs == {"task_1": {"cor": 42.0}}
+    np.testing.assert_array_equal(block.data, global_data)
+    np.testing.assert_array_equal(block.aux_data.get_angles(), aux_data.get_angles())
+    np.testing.assert_array_equal(block.aux_data.get_darks(), aux_data.get_darks())
+    np.testing.assert_array_equal(block.aux_data.get_flats(), aux_data.get_flats())
+
+
+@pytest.mark.parametrize(
+    "other_key",
+    [("other-hash", "input.nxs"), ("hash", "other-input.nxs")],
+    ids=["pipeline-changed", "input-changed"],
+)
+def test_checkpoint_ignored_for_different_key(tmp_path: PathLike, other_key):
+    checkpoint = SectionCheckpoint(tmp_path, "hash", "input.nxs", MPI.COMM_SELF)
+    writer = DataSetStoreWriter(0, MPI.COMM_SELF, tmp_path)
+    sink = checkpoint.make_sink(writer, 0)
+    _write_chunk_in_blocks(
+        sink,
+        np.ones((6, 4, 5), dtype=np.float32),
+        AuxiliaryData(angles=np.ones(6, dtype=np.float32)),
+    )
+    checkpoint.commit(0, sink, {}, {})
+
+    other = SectionCheckpoint(tmp_path, *other_key, MPI.COMM_SELF)
+
+    assert checkpoint.completed_sections() == 1
+    assert other.completed_sections() == 0
+
+
+def test_task_runner_resumes_after_checkpointed_section(
+    mocker: MockerFixture, dummy_block: DataSetBlock, tmp_path: PathLike
+):
+    mocker.patch(
+        "httomo.runner.task_runner.determine_store_backing",
+        return_value=DataSetStoreBacking.RAM,
+    )
+
+    def make_pipeline():
+        loader = make_test_loader(mocker, dummy_block)
+        method1 = make_test_method(mocker, method_name="m1", pattern=Pattern.projection)
+        mocker.patch.object(method1, "execute", side_effect=lambda block: block)
+        mocker.patch.object(method1, "get_side_output", return_value={"cor": 3.5})
+        method2 = make_test_method(
+            mocker,
+            method_name="m2",
+            pattern=Pattern.sinogram,
+            center=OutputRef(method1, "cor"),
+        )
+        mocker.patch.object(method2, "execute", side_effect=lambda block: block)
+        mocker.patch.object(method2, "get_side_output", return_value={})
+        return Pipeline(loader=loader, methods=[method1, method2])
+
+    checkpoint_dir = Path(tmp_path) / "checkpoint"
+    pipeline = make_pipeline()
+    checkpoint = SectionCheckpoint(checkpoint_dir, "hash", "in.nxs", MPI.COMM_WORLD)
+    TaskRunner(
+        pipeline, reslice_dir=tmp_path, comm=MPI.COMM_WORLD, checkpoint=checkpoint
+    ).execute()
+    assert checkpoint.completed_sections() == 1
+
+    resumed_pipeline = make_pipeline()
+    resumed_method1, resumed_method2 = resumed_pipeline[0], resumed_pipeline[1]
+    t = TaskRunner(
+        resumed_pipeline,
+        reslice_dir=tmp_path,
+        comm=MPI.COMM_WORLD,
+        checkpoint=SectionCheckpoint(checkpoint_dir, "hash", "in.nxs", MPI.COMM_WORLD),
+        resume=True,
+    )
+    t.execute()
+
+    resumed_method1.execute.assert_not_called()
+    resumed_method2.execute.assert_called()
+    resumed_method2.__setitem__.assert_called_with("center", 3.5)
+    assert t.source is not None
+    assert t.source.slicing_dim == 1
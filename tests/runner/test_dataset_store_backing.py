@@ -10,6 +10,7 @@ from httomo.runner.dataset_store_backing import (
     calculate_section_chunk_shape,
     calculate_section_chunk_bytes,
     determine_store_backing,
+    reduce_store_backings,
 )
 from httomo.runner.methods_repository_interface import GpuMemoryRequirement
 from httomo.runner.pipeline import Pipeline
@@ -332,6 +333,69 @@ def test_determine_store_backing_non_last_section_pipeline_single_proc(
     assert store_backing is expected_store_backing
 
 
+@pytest.mark.parametrize(
+    "compression_ratio, expected_store_backing",
+    [
+        (0.0, DataSetStoreBacking.File),
+        (1.1, DataSetStoreBacking.File),
+        (2.0, DataSetStoreBacking.CompressedRAM),
+    ],
+    ids=["no-compression", "too-little-compression", "compressed-ram-backing"],
+)
+def test_determine_store_backing_non_last_section_pipeline_compressed_single_proc(
+    mocker: MockerFixture,
+    compression_ratio: float,
+    expected_store_backing: DataSetStoreBacking,
+):
+    COMM = MPI.COMM_WORLD
+
+    # The write and read chunks are ~3.4MB each, so ~6.9MB together exceed the 6MB
+    # limit, but fit once compressed by a ratio of 2
+    DTYPE = np.float32
+    GLOBAL_SHAPE = (10, 300, 300)
+
+    loader = make_test_loader(mocker=mocker)
+    m1 = make_test_method(mocker=mocker, method_name="m1", pattern=Pattern.projection)
+    m2 = make_test_method(mocker=mocker, method_name="m2", pattern=Pattern.sinogram)
+    pipeline = Pipeline(
+        loader=loader,
+        methods=[m1, m2],
+    )
+    sections = sectionize(pipeline)
+
+    store_backing = determine_store_backing(
+        comm=COMM,
+        sections=sections,
+        memory_limit_bytes=6 * 1024**2,
+        dtype=DTYPE,
+        global_shape=GLOBAL_SHAPE,
+        section_idx=0,
+        compression_ratio=compression_ratio,
+    )
+    assert store_backing is expected_store_backing
+
+
+@pytest.mark.parametrize(
+    "backings, expected_store_backing",
+    [
+        ([DataSetStoreBacking.RAM, DataSetStoreBacking.RAM], DataSetStoreBacking.RAM),
+        (
+            [DataSetStoreBacking.RAM, DataSetStoreBacking.CompressedRAM],
+            DataSetStoreBacking.CompressedRAM,
+        ),
+        (
+            [DataSetStoreBacking.File, DataSetStoreBacking.CompressedRAM],
+            DataSetStoreBacking.File,
+        ),
+    ],
+    ids=["all-ram", "any-compressed", "any-file"],
+)
+def test_reduce_store_backings(
+    backings: List[DataSetStoreBacking], expected_store_backing: DataSetStoreBacking
+):
+    assert reduce_store_backings(backings) is expected_store_backing
+
+
 @pytest.mark.mpi
 @pytest.mark.skipif(
     MPI.COMM_WORLD.size != 2, reason="Only rank-2 MPI is supported with this test"
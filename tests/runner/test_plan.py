@@ -0,0 +1,154 @@
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pytest
+from mpi4py import MPI
+from pytest_mock import MockerFixture
+
+from httomo.darks_flats import DarksFlatsFileConfig
+from httomo.loaders.standard_tomo_loader import StandardLoaderWrapper
+from httomo.loaders.types import RawAngles
+from httomo.preview import PreviewConfig, PreviewDimConfig
+from httomo.runner.dataset_store_backing import DataSetStoreBacking
+from httomo.runner.pipeline import Pipeline
+from httomo.runner.plan import (
+    calculate_reslice_bytes,
+    format_plan,
+    loader_global_shape_and_dtype,
+    plan_pipeline,
+)
+from httomo.utils import Pattern
+
+from ..testing_utils import make_test_loader, make_test_method
+
+
+def make_cpu_pipeline(mocker: MockerFixture) -> Pipeline:
+    return Pipeline(
+        loader=make_test_loader(mocker),
+        methods=[
+            make_test_method(mocker, method_name="m1", pattern=Pattern.projection),
+            make_test_method(mocker, method_name="m2", pattern=Pattern.sinogram),
+        ],
+    )
+
+
+def test_loader_global_shape_and_dtype_matches_loader():
+    in_file = Path(__file__).parent.parent / "test_data/tomo_standard.nxs"
+    darks_flats = DarksFlatsFileConfig(
+        file=in_file,
+        data_path="/entry1/tomo_entry/data/data",
+        image_key_path="/entry1/tomo_entry/instrument/detector/image_key",
+    )
+    loader = StandardLoaderWrapper(
+        comm=MPI.COMM_SELF,
+        in_file=in_file,
+        data_path=darks_flats.data_path,
+        image_key_path=darks_flats.image_key_path,
+        darks=darks_flats,
+        flats=darks_flats,
+        angles=RawAngles(data_path="/entry1/tomo_entry/data/rotation_angle"),
+        preview=PreviewConfig(
+            angles=PreviewDimConfig(start=0, stop=180),
+            detector_y=PreviewDimConfig(start=10, stop=60),
+            detector_x=PreviewDimConfig(start=0, stop=160),
+        ),
+    )
+
+    global_shape, dtype = loader_global_shape_and_dtype(loader)
+
+    with mock.patch(
+        "httomo.darks_flats.get_darks_flats",
+        return_value=(np.zeros(1), np.zeros(1)),
+    ):
+        source = loader.make_data_source()
+    assert global_shape == source.global_shape
+    assert dtype == source.dtype
+
+
+def test_plan_pipeline_in_memory(mocker: MockerFixture):
+    global_shape = (180, 128, 160)
+    plans = plan_pipeline(
+        make_cpu_pipeline(mocker), global_shape, np.uint16, nprocs=[1, 2]
+    )
+
+    assert len(plans) == 2
+    assert plans[0].pattern == Pattern.projection
+    assert plans[0].methods == ["m1"]
+    assert plans[0].dtype == np.uint16
+    assert plans[1].dtype == np.float32
+    assert plans[1].global_shape == global_shape
+
+    single, double = plans[0].rank_counts[1], plans[0].rank_counts[2]
+    assert single.max_slices == 64
+    assert single.chunk_bytes == 180 * 128 * 160 * 2
+    assert single.store_backing == DataSetStoreBacking.RAM
+    assert single.reslice_bytes == 0
+    assert double.chunk_bytes == 90 * 128 * 160 * 2
+    # each process keeps a quarter of the float32 data and sends another quarter
+    assert double.reslice_bytes == 180 * 128 * 160 * 4 // 2
+
+    last = plans[1].rank_counts[2]
+    assert last.store_backing is None
+    assert last.reslice_bytes == 0
+
+
+def test_plan_pipeline_spills_to_file(mocker: MockerFixture):
+    global_shape = (180, 128, 160)
+    plans = plan_pipeline(
+        make_cpu_pipeline(mocker),
+        global_shape,
+        np.float32,
+        nprocs=[1],
+        memory_limit_bytes=1024**2,
+    )
+
+    assert plans[0].rank_counts[1].store_backing == DataSetStoreBacking.File
+    assert plans[0].rank_counts[1].reslice_bytes == 2 * 180 * 128 * 160 * 4
+
+
+def test_plan_pipeline_gpu_section_needs_gpu_memory(mocker: MockerFixture):
+    pipeline = Pipeline(
+        loader=make_test_loader(mocker),
+        methods=[make_test_method(mocker, gpu=True, method_name="m1")],
+    )
+
+    unknown = plan_pipeline(pipeline, (180, 128, 160), np.float32, nprocs=[1])
+    known = plan_pipeline(
+        pipeline,
+        (180, 128, 160),
+        np.float32,
+        nprocs=[1],
+        gpu_memory_bytes=1024**3,
+    )
+
+    assert unknown[0].rank_counts[1].max_slices is None
+    assert known[0].rank_counts[1].max_slices == 180
+
+
+@pytest.mark.parametrize("slicing_dim,next_slicing_dim", [(0, 0), (1, 1)])
+def test_calculate_reslice_bytes_same_dim(slicing_dim: int, next_slicing_dim: int):
+    assert (
+        calculate_reslice_bytes(
+            (10, 20, 30),
+            np.float32,
+            slicing_dim,
+            next_slicing_dim,
+            4,
+            DataSetStoreBacking.RAM,
+        )
+        == 0
+    )
+
+
+def test_format_plan(mocker: MockerFixture):
+    plans = plan_pipeline(
+        make_cpu_pipeline(mocker), (180, 128, 160), np.uint16, nprocs=[1, 2]
+    )
+
+    report = format_plan(plans)
+
+    assert "Section 0 (pattern=projection, padding=(0, 0)" in report
+    assert "Section 1 (pattern=sinogram" in report
+    assert "RAM" in report
+    assert "m2" in report
@@ -3,7 +3,13 @@ import pytest
 from pytest_mock import MockerFixture
 from httomo.runner.output_ref import OutputRef
 from httomo.runner.pipeline import Pipeline
-from httomo.runner.section import determine_section_padding, sectionize, Section
+from httomo.runner.section import (
+    calculate_section_cpu_max_slices,
+    determine_section_nprocs,
+    determine_section_padding,
+    sectionize,
+    Section,
+)
 from httomo.utils import Pattern
 from ..testing_utils import make_test_loader, make_test_method
 
@@ -288,7 +294,9 @@ def test_sectionizer_sets_padding_property(mocker: MockerFixture, padding: bool)
     assert s[-1].padding is padding
 
 
-def test_sectionizer_splits_section_if_multiple_padding_methods(mocker: MockerFixture):
+def test_sectionizer_keeps_multiple_padding_methods_in_one_section(
+    mocker: MockerFixture,
+):
     p = Pipeline(
         loader=make_test_loader(mocker, pattern=Pattern.projection),
         methods=[
@@ -301,13 +309,9 @@ def test_sectionizer_splits_section_if_multiple_padding_methods(mocker: MockerFi
 
     s = sectionize(p)
 
-    assert len(s) == 2
+    assert len(s) == 1
     assert s[0].padding is True
-    assert s[1].padding is True
-    assert (
-        len(s[0]) == 3
-    )  # loader + 3 methods, as we want right before the next padding method
-    assert len(s[1]) == 1  # just the last method with padding
+    assert len(s[0]) == 4
 
 
 def test_determine_section_padding_no_padding_method_in_section(
@@ -372,3 +376,83 @@ def test_determine_section_padding_one_padding_method_and_other_methods_in_secti
 
     section_padding = determine_section_padding(sections[0])
     assert section_padding == PADDING
+
+
+def test_determine_section_padding_accumulates_multiple_padding_methods(
+    mocker: MockerFixture,
+):
+    loader = make_test_loader(mocker)
+    padding_method_1 = make_test_method(mocker=mocker, padding=True)
+    mocker.patch.object(
+        target=padding_method_1,
+        attribute="calculate_padding",
+        return_value=(3, 5),
+    )
+    padding_method_2 = make_test_method(mocker=mocker, padding=True)
+    mocker.patch.object(
+        target=padding_method_2,
+        attribute="calculate_padding",
+        return_value=(2, 1),
+    )
+    method = make_test_method(mocker=mocker, padding=False)
+
+    pipeline = Pipeline(
+        loader=loader,
+        methods=[padding_method_1, method, padding_method_2],
+    )
+
+    sections = sectionize(pipeline)
+    assert len(sections) == 1
+
+    section_padding = determine_section_padding(sections[0])
+    assert section_padding == (5, 6)
+
+
+@pytest.mark.parametrize(
+    "min_slices, expected",
+    [(0, 8), (1, 8), (4, 5), (10, 2), (100, 1)],
+    ids=["disabled", "one-slice", "some", "few", "at-least-one"],
+)
+def test_determine_section_nprocs(
+    mocker: MockerFixture, min_slices: int, expected: int
+):
+    section = Section(
+        pattern=Pattern.sinogram,
+        max_slices=0,
+        methods=[make_test_method(mocker, pattern=Pattern.sinogram)],
+    )
+
+    assert determine_section_nprocs(section, (180, 20, 160), 8, min_slices) == expected
+
+
+def test_determine_section_nprocs_uses_all_processes_when_saving_intermediate(
+    mocker: MockerFixture,
+):
+    section = Section(
+        pattern=Pattern.projection,
+        max_slices=0,
+        methods=[
+            make_test_method(mocker),
+            make_test_method(mocker, method_name="save_intermediate_data"),
+        ],
+    )
+
+    assert determine_section_nprocs(section, (10, 20, 160), 8, 5) == 8
+
+
+def test_calculate_section_cpu_max_slices_accounts_for_output_dims(
+    mocker: MockerFixture,
+):
+    m1 = make_test_method(mocker)
+    mocker.patch.object(m1, "calculate_output_dims", return_value=(20, 160))
+    m2 = make_test_method(mocker)
+    mocker.patch.object(m2, "calculate_output_dims", return_value=(160, 160))
+    section = Section(pattern=Pattern.projection, max_slices=0, methods=[m1, m2])
+
+    # the second method holds 20x160 input and 160x160 output float32 slices
+    slice_bytes = (20 * 160 + 160 * 160) * 4
+    assert (
+        calculate_section_cpu_max_slices(section, (180, 20, 160), 0, 10 * slice_bytes)
+        == 10
+    )
+    assert calculate_section_cpu_max_slices(section, (180, 20, 160), 0, 2**40) == 180
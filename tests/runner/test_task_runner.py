@@ -1,5 +1,6 @@
 from os import PathLike
 from pathlib import Path
+import time
 from typing import List, Tuple
 from unittest.mock import ANY, call
 
@@ -17,6 +18,7 @@ from httomo.method_wrappers import make_method_wrapper
 from httomo.methods_database.query import MethodDatabaseRepository, MethodsDatabaseQuery
 from httomo.preview import PreviewConfig, PreviewDimConfig
 from httomo.runner.auxiliary_data import AuxiliaryData
+from httomo.runner.block_split import BlockSplitter
 from httomo.runner.dataset import DataSetBlock
 from httomo.runner.dataset_store_backing import DataSetStoreBacking
 from httomo.runner.methods_repository_interface import GpuMemoryRequirement
@@ -377,6 +379,319 @@ def test_execute_section_calls_blockwise_execute_and_monitors(
     assert mon.report_sink_block.call_count == 2
 
 
+def test_execute_section_pipelined_writes_blocks_in_order_and_monitors(
+    mocker: MockerFixture, dummy_block: DataSetBlock, tmp_path: PathLike
+):
+    original_value = dummy_block.data[0, 0, 0]  # it has all the same number
+    loader = make_test_loader(mocker, dummy_block)
+    method = make_test_method(mocker, method_name="m1")
+    p = Pipeline(loader=loader, methods=[method])
+    s = sectionize(p)
+    mon = mocker.create_autospec(MonitoringInterface, instance=True)
+    t = TaskRunner(
+        p, reslice_dir=tmp_path, comm=MPI.COMM_WORLD, monitor=mon, pipelined=True
+    )
+
+    # Patch the store backing calculator function to assume being backed by RAM
+    mocker.patch(
+        "httomo.runner.task_runner.determine_store_backing",
+        return_value=DataSetStoreBacking.RAM,
+    )
+
+    t._prepare()
+    mocker.patch.object(t, "determine_max_slices")
+    s[0].max_slices = 1  # one block per slice
+
+    def mul_block_by_index(section, block: DataSetBlock):
+        block.data = block.data * (block.chunk_index[0] + 2)
+        return block
+
+    block_mock = mocker.patch.object(
+        t, "_execute_section_block", side_effect=mul_block_by_index
+    )
+
+    s[0].is_last = False
+    t._execute_section(s[0])
+    assert isinstance(t.sink, DataSetStoreWriter)
+    reader = t.sink.make_reader()
+    data = reader.read_block(0, dummy_block.shape[0])
+
+    for i in range(dummy_block.shape[0]):
+        np.testing.assert_allclose(data.data[i], original_value * (i + 2))
+    no_of_blocks = dummy_block.chunk_shape[0]
+    assert block_mock.call_count == no_of_blocks
+    assert mon.report_source_block.call_count == no_of_blocks
+    assert mon.report_sink_block.call_count == no_of_blocks
+
+
+def test_execute_section_threaded_writes_blocks_in_order(
+    mocker: MockerFixture, dummy_block: DataSetBlock, tmp_path: PathLike
+):
+    original_value = dummy_block.data[0, 0, 0]  # it has all the same number
+    loader = make_test_loader(mocker, dummy_block)
+    method = make_test_method(mocker, method_name="m1", block_parallel=True)
+
+    def mul_block_by_index(block: DataSetBlock):
+        # make the earlier blocks finish last
+        time.sleep(0.002 * (dummy_block.shape[0] - block.chunk_index[0]))
+        block.data = block.data * (block.chunk_index[0] + 2)
+        return block
+
+    mocker.patch.object(method, "execute", side_effect=mul_block_by_index)
+    mocker.patch.object(method, "get_side_output", return_value={"answer": 42})
+    p = Pipeline(loader=loader, methods=[method])
+    s = sectionize(p)
+    mon = mocker.create_autospec(MonitoringInterface, instance=True)
+    t = TaskRunner(
+        p, reslice_dir=tmp_path, comm=MPI.COMM_WORLD, monitor=mon, cpu_threads=3
+    )
+    mocker.patch(
+        "httomo.runner.task_runner.determine_store_backing",
+        return_value=DataSetStoreBacking.RAM,
+    )
+    t._prepare()
+    mocker.patch.object(t, "determine_max_slices")
+    s[0].max_slices = 1  # one block per slice
+    s[0].is_last = False
+
+    t._execute_section(s[0])
+
+    assert isinstance(t.sink, DataSetStoreWriter)
+    data = t.sink.make_reader().read_block(0, dummy_block.shape[0])
+    for i in range(dummy_block.shape[0]):
+        np.testing.assert_allclose(data.data[i], original_value * (i + 2))
+    no_of_blocks = dummy_block.chunk_shape[0]
+    assert method.execute.call_count == no_of_blocks
+    assert mon.report_method_block.call_count == no_of_blocks
+    assert mon.report_sink_block.call_count == no_of_blocks
+    assert t.side_outputs == {"answer": 42}
+
+
+@pytest.mark.parametrize("configured", [False, True], ids=["default", "configured"])
+def test_execute_section_threaded_runs_methods_with_one_core(
+    mocker: MockerFixture,
+    dummy_block: DataSetBlock,
+    tmp_path: PathLike,
+    configured: bool,
+):
+    loader = make_test_loader(mocker, dummy_block)
+    kwargs = {"ncore": 4} if configured else {}
+    method = make_test_method(mocker, method_name="m1", block_parallel=True, **kwargs)
+    method.parameters = ["data", "ncore"]
+    mocker.patch.object(method, "execute", side_effect=lambda block: block)
+    mocker.patch.object(method, "get_side_output", return_value={})
+    p = Pipeline(loader=loader, methods=[method])
+    s = sectionize(p)
+    t = TaskRunner(p, reslice_dir=tmp_path, comm=MPI.COMM_WORLD, cpu_threads=3)
+    mocker.patch(
+        "httomo.runner.task_runner.determine_store_backing",
+        return_value=DataSetStoreBacking.RAM,
+    )
+    t._prepare()
+    mocker.patch.object(t, "determine_max_slices")
+    s[0].max_slices = 1
+    s[0].is_last = False
+
+    t._execute_section(s[0])
+
+    if configured:
+        method.__setitem__.assert_not_called()
+    else:
+        method.__setitem__.assert_called_once_with("ncore", 1)
+
+
+def test_execute_section_not_threaded_without_block_parallel_methods(
+    mocker: MockerFixture, dummy_block: DataSetBlock, tmp_path: PathLike
+):
+    loader = make_test_loader(mocker, dummy_block)
+    method1 = make_test_method(mocker, method_name="m1", block_parallel=True)
+    method2 = make_test_method(mocker, method_name="m2")
+    p = Pipeline(loader=loader, methods=[method1, method2])
+    t = TaskRunner(p, reslice_dir=tmp_path, comm=MPI.COMM_WORLD, cpu_threads=3)
+    t._prepare()
+    threaded = mocker.patch.object(t, "_execute_section_blocks_threaded")
+    sequential = mocker.patch.object(t, "_execute_section_blocks")
+
+    t._execute_section(t._sections[0])
+
+    threaded.assert_not_called()
+    sequential.assert_called_once()
+
+
+def test_does_not_balance_dynamically_with_single_process(
+    mocker: MockerFixture, tmp_path: PathLike
+):
+    loader = make_test_loader(mocker)
+    method = make_test_method(mocker, method_name="m1", block_parallel=True)
+    p = Pipeline(loader=loader, methods=[method])
+    t = TaskRunner(
+        p, reslice_dir=tmp_path, comm=MPI.COMM_SELF, dynamic_load_balancing=True
+    )
+    t._sections = sectionize(p)
+
+    assert t._balances_dynamically(0) is False
+
+
+@pytest.mark.mpi
+@pytest.mark.skipif(
+    MPI.COMM_WORLD.size != 2, reason="Only rank-2 MPI is supported with this test"
+)
+@pytest.mark.parametrize("block_parallel", [True, False])
+def test_balances_dynamically_only_with_block_parallel_methods(
+    mocker: MockerFixture, tmp_path: PathLike, block_parallel: bool
+):
+    loader = make_test_loader(mocker)
+    method1 = make_test_method(
+        mocker, method_name="m1", pattern=Pattern.projection, block_parallel=True
+    )
+    method2 = make_test_method(
+        mocker,
+        method_name="m2",
+        pattern=Pattern.projection,
+        block_parallel=block_parallel,
+    )
+    method3 = make_test_method(
+        mocker, method_name="m3", pattern=Pattern.sinogram, block_parallel=True
+    )
+    p = Pipeline(loader=loader, methods=[method1, method2, method3])
+    t = TaskRunner(
+        p, reslice_dir=tmp_path, comm=MPI.COMM_WORLD, dynamic_load_balancing=True
+    )
+    t._sections = sectionize(p)
+
+    assert t._balances_dynamically(0) is block_parallel
+    assert t._balances_dynamically(1) is False
+
+
+@pytest.mark.mpi
+@pytest.mark.skipif(
+    MPI.COMM_WORLD.size != 2, reason="Only rank-2 MPI is supported with this test"
+)
+@pytest.mark.parametrize(
+    "max_slices", [1, 1000], ids=["one-slice-blocks", "fewer-blocks-than-processes"]
+)
+def test_execute_section_balanced_dynamically_writes_static_chunks(
+    mocker: MockerFixture,
+    dummy_block: DataSetBlock,
+    tmp_path: PathLike,
+    max_slices: int,
+):
+    comm = MPI.COMM_WORLD
+    original_value = dummy_block.data[0, 0, 0]  # it has all the same number
+    # the loader gives the whole data, as it's created for a single process
+    loader = make_test_loader(mocker, dummy_block)
+    make_data_source = mocker.spy(loader, "make_data_source")
+    method = make_test_method(mocker, method_name="m1", block_parallel=True)
+
+    def mul_block_by_index(block: DataSetBlock):
+        block.data = block.data * (block.global_index[0] + 2)
+        return block
+
+    mocker.patch.object(method, "execute", side_effect=mul_block_by_index)
+    p = Pipeline(loader=loader, methods=[method])
+    s = sectionize(p)
+    t = TaskRunner(p, reslice_dir=tmp_path, comm=comm, dynamic_load_balancing=True)
+    mocker.patch(
+        "httomo.runner.task_runner.determine_store_backing",
+        return_value=DataSetStoreBacking.RAM,
+    )
+    t._prepare()
+    mocker.patch.object(t, "determine_max_slices")
+    s[0].max_slices = max_slices
+    s[0].is_last = False
+
+    t._execute_section(s[0])
+
+    make_data_source.assert_called_once_with(padding=(0, 0), comm=MPI.COMM_SELF)
+    # every process gets at least one block
+    block_size = min(max_slices, dummy_block.shape[0] // 2)
+    assert method.execute.call_count >= 1
+    assert comm.allreduce(method.execute.call_count) == (
+        dummy_block.shape[0] // block_size
+    )
+    assert isinstance(t.sink, DataSetStoreWriter)
+    reader = t.sink.make_reader()
+    chunk_size = dummy_block.shape[0] // 2
+    assert reader.chunk_shape[0] == chunk_size
+    data = reader.read_block(0, chunk_size).data
+    for i in range(chunk_size):
+        global_i = comm.rank * chunk_size + i
+        block_start = global_i - global_i % block_size
+        np.testing.assert_allclose(data[i], original_value * (block_start + 2))
+
+
+@pytest.mark.mpi
+@pytest.mark.skipif(
+    MPI.COMM_WORLD.size != 2, reason="Only rank-2 MPI is supported with this test"
+)
+def test_setup_section_comm_frees_previous_section_comm(
+    mocker: MockerFixture, tmp_path: PathLike
+):
+    loader = make_test_loader(mocker)
+    method = make_test_method(mocker)
+    p = Pipeline(loader=loader, methods=[method])
+    t = TaskRunner(
+        p, reslice_dir=tmp_path, comm=MPI.COMM_WORLD, min_slices_per_process=1000
+    )
+
+    t._setup_section_comm(t._sections[0], 0, (10, 10, 10))
+    first_comm = t._section_comm
+    assert first_comm is not None
+    assert (first_comm == MPI.COMM_NULL) is (MPI.COMM_WORLD.rank != 0)
+    t._setup_section_comm(t._sections[0], 1, (10, 10, 10))
+
+    # freeing a communicator sets its handle to null
+    assert first_comm == MPI.COMM_NULL
+    assert t._section_comm is not first_comm
+    t._free_section_comm()
+    assert t._section_comm is None
+
+
+@pytest.mark.parametrize(
+    "memory_limit_bytes,expected",
+    [(0, 3), (1, 1), (2 * 10 * 20 * 4 * 2, 2), (10**9, 3)],
+    ids=["unlimited", "too-small", "two-blocks", "large"],
+)
+def test_max_blocks_in_flight_respects_memory_limit(
+    mocker: MockerFixture,
+    tmp_path: PathLike,
+    memory_limit_bytes: int,
+    expected: int,
+):
+    data = np.ones((10, 10, 20), dtype=np.float32)
+    aux_data = AuxiliaryData(angles=np.ones(10, dtype=np.float32))
+    block = DataSetBlock(data=data, aux_data=aux_data)
+    loader = make_test_loader(mocker, block)
+    method = make_test_method(mocker, method_name="m1")
+    p = Pipeline(loader=loader, methods=[method])
+    t = TaskRunner(
+        p,
+        reslice_dir=tmp_path,
+        comm=MPI.COMM_WORLD,
+        memory_limit_bytes=memory_limit_bytes,
+        pipelined=True,
+    )
+    t._prepare()
+
+    # 2 slices per block of size 10x20 float32
+    assert t._max_blocks_in_flight(BlockSplitter(t.source, 2)) == expected
+
+
+def test_pipelined_falls_back_without_thread_multiple(
+    mocker: MockerFixture, dummy_block: DataSetBlock, tmp_path: PathLike
+):
+    loader = make_test_loader(mocker, dummy_block)
+    method = make_test_method(mocker, method_name="m1")
+    p = Pipeline(loader=loader, methods=[method])
+    comm = mocker.MagicMock(size=2)
+    t = TaskRunner(p, reslice_dir=tmp_path, comm=comm, pipelined=True)
+    mocker.patch(
+        "httomo.runner.task_runner.MPI.Query_thread",
+        return_value=MPI.THREAD_SERIALIZED,
+    )
+    assert t._can_pipeline() is False
+
+
 def test_execute_section_for_block(
     mocker: MockerFixture, tmp_path: PathLike, dummy_block: DataSetBlock
 ):
@@ -394,6 +709,51 @@ def test_execute_section_for_block(
     exec_method.assert_has_calls(calls)
 
 
+def test_execute_section_block_trims_padding_after_each_padding_method(
+    mocker: MockerFixture, tmp_path: PathLike
+):
+    data = np.arange(14 * 4 * 5, dtype=np.float32).reshape((14, 4, 5))
+    aux_data = AuxiliaryData(angles=np.ones(20, dtype=np.float32))
+    # core of the block is slices 2-9 of a chunk of 10 slices starting at global index 2
+    block = DataSetBlock(
+        data=data,
+        aux_data=aux_data,
+        slicing_dim=0,
+        block_start=2 - 4,
+        chunk_start=2 - 4,
+        global_shape=(20, 4, 5),
+        chunk_shape=(16, 4, 5),
+        padding=(4, 2),
+    )
+    loader = make_test_loader(mocker)
+    method1 = make_test_method(mocker, method_name="m1", padding=True)
+    mocker.patch.object(method1, "calculate_padding", return_value=(3, 1))
+    method2 = make_test_method(mocker, method_name="m2")
+    method3 = make_test_method(mocker, method_name="m3", padding=True)
+    mocker.patch.object(method3, "calculate_padding", return_value=(1, 1))
+    p = Pipeline(loader=loader, methods=[method1, method2, method3])
+    s = sectionize(p)
+    assert len(s) == 1
+    t = TaskRunner(p, reslice_dir=tmp_path, comm=MPI.COMM_WORLD)
+
+    seen_padding: List[Tuple[int, int]] = []
+
+    def record_padding(method, block: DataSetBlock):
+        seen_padding.append(block.padding)
+        return block
+
+    mocker.patch.object(t, "_execute_method", side_effect=record_padding)
+    out = t._execute_section_block(s[0], block)
+
+    assert seen_padding == [(4, 2), (1, 1), (1, 1)]
+    assert out.padding == (0, 0)
+    assert out.shape == (8, 4, 5)
+    assert out.chunk_index == (2, 0, 0)
+    assert out.global_index == block.global_index_unpadded
+    assert out.chunk_shape == (10, 4, 5)
+    np.testing.assert_array_equal(out.data, block.data_unpadded)
+
+
 def test_does_reslice_when_needed_and_reports_time(
     mocker: MockerFixture, dummy_block: DataSetBlock, tmp_path: PathLike
 ):
@@ -428,6 +788,44 @@ def test_does_reslice_when_needed_and_reports_time(
     mon.report_total_time.assert_called_once()
 
 
+@pytest.mark.parametrize("incremental_reslice", [False, True])
+def test_sets_up_writer_with_next_slicing_dim_for_incremental_reslice(
+    mocker: MockerFixture,
+    dummy_block: DataSetBlock,
+    tmp_path: PathLike,
+    incremental_reslice: bool,
+):
+    loader = make_test_loader(mocker, dummy_block)
+    method1 = make_test_method(mocker, method_name="m1", pattern=Pattern.projection)
+    method2 = make_test_method(mocker, method_name="m2", pattern=Pattern.sinogram)
+    p = Pipeline(loader=loader, methods=[method1, method2])
+    t = TaskRunner(
+        p,
+        reslice_dir=tmp_path,
+        comm=MPI.COMM_WORLD,
+        incremental_reslice=incremental_reslice,
+    )
+    mocker.patch(
+        "httomo.runner.task_runner.determine_store_backing",
+        return_value=DataSetStoreBacking.RAM,
+    )
+    writer_mock = mocker.patch("httomo.runner.task_runner.DataSetStoreWriter")
+    t._prepare()
+    t._setup_source_sink(t._sections[0], 0)
+
+    writer_mock.assert_called_once_with(
+        0,
+        MPI.COMM_WORLD,
+        tmp_path,
+        store_backing=DataSetStoreBacking.RAM,
+        next_slicing_dim=1 if incremental_reslice else None,
+        dynamic_chunks=False,
+        active_comm=None,
+        read_slicing_dim=1,
+        ram_budget_bytes=0,
+    )
+
+
 def test_warns_with_multiple_reslices(
     mocker: MockerFixture,
     dummy_block: DataSetBlock,
@@ -584,6 +982,9 @@ def test_execute_section_with_padding_produces_correct_result(
     mock_repo = mocker.MagicMock()
     method_query = MethodsDatabaseQuery(MODULE_PATH, METHOD_NAME)
     mocker.patch.object(target=method_query, attribute="padding", return_value=True)
+    mocker.patch.object(
+        target=method_query, attribute="block_parallel", return_value=False
+    )
     mocker.patch(
         "httomo.methods_database.query.import_module",
         return_value=FakeSupportingFunctionsModule,
@@ -193,3 +193,9 @@ def test_database_query_calculate_padding(mocker: MockerFixture):
     )
 
     assert pads == PADDING_RETURNED
+
+
+def test_database_query_block_parallel():
+    assert MethodsDatabaseQuery("tomopy.prep.normalize", "minus_log").block_parallel()
+    # not flagged in the database
+    assert not MethodsDatabaseQuery("tomopy.recon.algorithm", "recon").block_parallel()
@@ -2,14 +2,60 @@ import numpy as np
 import pytest
 from mpi4py import MPI
 
-from httomo.data.mpiutil import alltoall
+from httomo.data.mpiutil import alltoallw_regions, bcast_shared
 
 
+@pytest.mark.parametrize("dtype", [np.uint16, np.float32, np.float64, np.complex64])
 @pytest.mark.mpi
-def test_all_to_all():
+def test_alltoallw_regions(dtype):
     comm = MPI.COMM_WORLD
-    data = [np.ones((5, 5, 5), dtype=np.uint16) * comm.rank for _ in range(comm.size)]
-    rec = alltoall(data, comm)
+    global_data = np.arange(4 * 3 * comm.size).reshape(4, 3, comm.size)
+    send = (global_data + comm.rank * 100).astype(dtype)
+    # rank r gets column r of every rank, stacked along the first dimension
+    send_regions = [
+        (slice(None), slice(None), slice(r, r + 1)) for r in range(comm.size)
+    ]
+    recv = np.zeros((4 * comm.size, 3, 1), dtype=dtype)
+    recv_regions = [(slice(4 * r, 4 * (r + 1)),) for r in range(comm.size)]
 
-    expected = [np.ones((5, 5, 5), dtype=np.uint16) * r for r in range(comm.size)]
-    np.testing.assert_array_equal(expected, rec)
+    alltoallw_regions(send, send_regions, recv, recv_regions, comm)
+
+    expected = np.concatenate(
+        [
+            (global_data + r * 100)[:, :, comm.rank : comm.rank + 1]
+            for r in range(comm.size)
+        ]
+    ).astype(dtype)
+    np.testing.assert_array_equal(expected, recv)
+
+
+@pytest.mark.mpi
+def test_alltoallw_regions_with_empty_regions():
+    comm = MPI.COMM_WORLD
+    send = np.full((2, 2, 2), comm.rank, dtype=np.float32)
+    # only rank 0 receives anything
+    send_regions = [(slice(None),)] + [(slice(0, 0),)] * (comm.size - 1)
+    recv = np.zeros((2 * comm.size if comm.rank == 0 else 0, 2, 2), dtype=np.float32)
+    recv_regions = [
+        (slice(2 * r, 2 * (r + 1)),) if comm.rank == 0 else (slice(0, 0),)
+        for r in range(comm.size)
+    ]
+
+    alltoallw_regions(send, send_regions, recv, recv_regions, comm)
+
+    if comm.rank == 0:
+        expected = np.repeat(np.arange(comm.size, dtype=np.float32), 8)
+        np.testing.assert_array_equal(expected.reshape(-1, 2, 2), recv)
+
+
+@pytest.mark.parametrize("shape", [(3, 4, 5), (0, 4, 5), (7,)])
+@pytest.mark.mpi
+def test_bcast_shared(shape):
+    comm = MPI.COMM_WORLD
+    expected = np.arange(int(np.prod(shape)), dtype=np.float32).reshape(shape)
+
+    shared = bcast_shared(expected.copy() if comm.rank == 0 else None, comm)
+
+    np.testing.assert_array_equal(expected, shared)
+    assert shared.dtype == expected.dtype
+    assert not shared.flags.writeable
@@ -5,7 +5,11 @@ import numpy as np
 import pytest
 from mpi4py import MPI
 
-from httomo.data.hdf._utils.reslice import reslice
+from httomo.data.hdf._utils.reslice import (
+    IncrementalReslicer,
+    _CompressionTrial,
+    reslice,
+)
 
 
 @pytest.mark.parametrize(
@@ -84,9 +88,107 @@ def test_reslice(full_shape, current_slice_dim, next_slice_dim, dtype):
     np.testing.assert_array_equal(expected, newdata)
 
 
+@pytest.mark.parametrize(
+    "current_slice_dim, next_slice_dim",
+    [(1, 2), (2, 1), (1, 3), (3, 2)],
+    ids=["proj2sino", "sino2proj", "proj2third", "third2sino"],
+)
+@pytest.mark.parametrize("full_shape", [(15, 13, 9), (1, 4, 12), (13, 23, 51)])
+@pytest.mark.parametrize("max_buffer_bytes", [0, 64, 1024**2])
+@pytest.mark.parametrize("hierarchical", [False, True], ids=["flat", "hierarchical"])
+@pytest.mark.mpi
+def test_reslice_in_rounds(
+    full_shape, current_slice_dim, next_slice_dim, max_buffer_bytes, hierarchical
+):
+    comm = MPI.COMM_WORLD
+    global_data = np.arange(np.prod(full_shape), dtype=np.float32).reshape(full_shape)
+
+    start = round(full_shape[current_slice_dim - 1] / comm.size * comm.rank)
+    stop = round(full_shape[current_slice_dim - 1] / comm.size * (comm.rank + 1))
+    slices = [slice(None), slice(None), slice(None)]
+    slices[current_slice_dim - 1] = slice(start, stop)
+    data = np.ascontiguousarray(global_data[tuple(slices)])
+
+    with mock.patch("httomo.data.mpiutil._mpi_max_elements", 128):
+        newdata, _, start_idx = reslice(
+            data,
+            current_slice_dim,
+            next_slice_dim,
+            comm,
+            max_buffer_bytes=max_buffer_bytes,
+            hierarchical=hierarchical,
+        )
+
+    new_start = round(full_shape[next_slice_dim - 1] / comm.size * comm.rank)
+    new_stop = round(full_shape[next_slice_dim - 1] / comm.size * (comm.rank + 1))
+    expected_slices = [slice(None), slice(None), slice(None)]
+    expected_slices[next_slice_dim - 1] = slice(new_start, new_stop)
+
+    assert start_idx == new_start
+    np.testing.assert_array_equal(newdata, global_data[tuple(expected_slices)])
+
+
+@pytest.mark.parametrize(
+    "current_slice_dim, next_slice_dim",
+    [(1, 2), (2, 1), (3, 2)],
+    ids=["proj2sino", "sino2proj", "third2sino"],
+)
+@pytest.mark.parametrize("full_shape", [(15, 13, 9), (1, 4, 12), (13, 23, 51)])
+@pytest.mark.mpi
+def test_reslice_compressed(mocker, full_shape, current_slice_dim, next_slice_dim):
+    comm = MPI.COMM_WORLD
+    # smooth data, so that it does compress
+    global_data = np.zeros(full_shape, dtype=np.float32)
+    global_data[..., : full_shape[2] // 2] = 1.0
+
+    start = round(full_shape[current_slice_dim - 1] / comm.size * comm.rank)
+    stop = round(full_shape[current_slice_dim - 1] / comm.size * (comm.rank + 1))
+    slices = [slice(None), slice(None), slice(None)]
+    slices[current_slice_dim - 1] = slice(start, stop)
+    data = np.ascontiguousarray(global_data[tuple(slices)])
+
+    # every round compressed, whatever the trial finds
+    mocker.patch.object(_CompressionTrial, "compresses_next_round", return_value=True)
+    mocker.patch.object(_CompressionTrial, "record")
+    newdata, _, _ = reslice(
+        data,
+        current_slice_dim,
+        next_slice_dim,
+        comm,
+        max_buffer_bytes=64,
+        compress=True,
+    )
+
+    new_start = round(full_shape[next_slice_dim - 1] / comm.size * comm.rank)
+    new_stop = round(full_shape[next_slice_dim - 1] / comm.size * (comm.rank + 1))
+    expected_slices = [slice(None), slice(None), slice(None)]
+    expected_slices[next_slice_dim - 1] = slice(new_start, new_stop)
+    np.testing.assert_array_equal(newdata, global_data[tuple(expected_slices)])
+
+
+@pytest.mark.parametrize(
+    "compressed_bytes, compressed_seconds, expected",
+    [(100, 0.5, True), (100, 2.0, False), (900, 0.5, False)],
+    ids=["faster", "slower", "incompressible"],
+)
+def test_compression_trial_switches_itself_off(
+    compressed_bytes: int, compressed_seconds: float, expected: bool
+):
+    trial = _CompressionTrial(MPI.COMM_SELF)
+
+    assert trial.compresses_next_round() is False
+    trial.record(False, 1000, 1000, 1.0)
+    assert trial.compresses_next_round() is True
+    trial.record(True, 1000, compressed_bytes, compressed_seconds)
+    trial.close()
+
+    assert trial.compresses_next_round() is expected
+
+
 @pytest.mark.mpi
 @pytest.mark.perf
-def test_reslice_performance():
+@pytest.mark.parametrize("max_buffer_bytes", [None, 256 * 1024**2])
+def test_reslice_performance(max_buffer_bytes):
     comm = MPI.COMM_WORLD
 
     process_shape = (1801, 15, 2560)
@@ -97,7 +199,13 @@ def test_reslice_performance():
     # reslice
     start = time.perf_counter_ns()
     for _ in range(10):
-        reslice(data, current_slice_dim, next_slice_dim, comm)
+        reslice(
+            data,
+            current_slice_dim,
+            next_slice_dim,
+            comm,
+            max_buffer_bytes=max_buffer_bytes,
+        )
 
     duration_ms = float(time.perf_counter_ns() - start) * 1e-6 / 10
 
@@ -105,3 +213,42 @@ def test_reslice_performance():
 
     if comm.rank == 0:
         assert "performance in ms" == duration_ms
+
+
+@pytest.mark.parametrize(
+    "current_slice_dim, next_slice_dim",
+    [(0, 1), (1, 0), (0, 2), (2, 1)],
+    ids=["proj2sino", "sino2proj", "proj2third", "third2sino"],
+)
+@pytest.mark.parametrize("full_shape", [(15, 13, 9), (1, 4, 12), (13, 23, 51)])
+@pytest.mark.parametrize("block_size", [1, 4])
+@pytest.mark.mpi
+def test_incremental_reslicer(
+    full_shape, current_slice_dim, next_slice_dim, block_size
+):
+    comm = MPI.COMM_WORLD
+    global_data = np.arange(np.prod(full_shape), dtype=np.float32).reshape(full_shape)
+
+    start = round(full_shape[current_slice_dim] / comm.size * comm.rank)
+    stop = round(full_shape[current_slice_dim] / comm.size * (comm.rank + 1))
+
+    reslicer = IncrementalReslicer(
+        comm.Dup(), current_slice_dim, next_slice_dim, full_shape, np.float32
+    )
+    for block_start in range(start, stop, block_size):
+        block_stop = min(block_start + block_size, stop)
+        block_slices = [slice(None), slice(None), slice(None)]
+        block_slices[current_slice_dim] = slice(block_start, block_stop)
+        reslicer.send_block(global_data[tuple(block_slices)], block_start)
+    newdata = reslicer.finish()
+
+    new_start = round(full_shape[next_slice_dim] / comm.size * comm.rank)
+    new_stop = round(full_shape[next_slice_dim] / comm.size * (comm.rank + 1))
+    expected_slices = [slice(None), slice(None), slice(None)]
+    expected_slices[next_slice_dim] = slice(new_start, new_stop)
+    expected_index = [0, 0, 0]
+    expected_index[next_slice_dim] = new_start
+
+    assert reslicer.global_index == tuple(expected_index)
+    assert reslicer.chunk_shape == newdata.shape
+    np.testing.assert_array_equal(newdata, global_data[tuple(expected_slices)])
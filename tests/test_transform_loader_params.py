@@ -9,6 +9,7 @@ from httomo.preview import PreviewConfig, PreviewDimConfig
 from httomo.transform_loader_params import (
     PreviewParam,
     parse_angles,
+    parse_collective_reads,
     parse_preview,
 )
 
@@ -252,3 +253,25 @@ def test_parse_preview_raises_error_mid_in_angle_dim():
 def test_parse_angles(angles_param: dict, expected_angles_config: AnglesConfig):
     angles_config = parse_angles(angles_param)
     assert angles_config == expected_angles_config
+
+
+@pytest.mark.parametrize(
+    "collective_reads_param, expected_hints",
+    [
+        (None, None),
+        (False, None),
+        (True, {}),
+        (
+            {"romio_cb_read": "enable", "cb_buffer_size": 16777216},
+            {"romio_cb_read": "enable", "cb_buffer_size": "16777216"},
+        ),
+    ],
+    ids=["not_given", "disabled", "enabled", "with_hints"],
+)
+def test_parse_collective_reads(collective_reads_param, expected_hints):
+    assert parse_collective_reads(collective_reads_param) == expected_hints
+
+
+def test_parse_collective_reads_raises_error_unknown_value():
+    with pytest.raises(ValueError):
+        parse_collective_reads("enable")
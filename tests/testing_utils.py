@@ -23,6 +23,7 @@ def make_test_method(
     task_id: Optional[str] = None,
     padding: bool = False,
     sweep: bool = False,
+    block_parallel: bool = False,
     **kwargs,
 ) -> MethodWrapper:
     if task_id is None:
@@ -41,6 +42,7 @@ def make_test_method(
         config_params=kwargs,
         padding=padding,
         sweep=sweep,
+        block_parallel=block_parallel,
         __getitem__=lambda _, k: kwargs[k],  # return kwargs value from dict access
     )
 
@@ -65,7 +67,7 @@ def make_test_loader(
         # NOTE: Even though the `padding` parameter is unused, this is needed in order to
         # replicate the signature of the `make_data_source()` method defined on the
         # `LoaderInterface` protocol
-        def mock_make_data_source(padding) -> DataSetSource:
+        def mock_make_data_source(padding, comm=None) -> DataSetSource:
             ret = mocker.create_autospec(
                 DataSetSource,
                 global_shape=block.global_shape,
@@ -113,6 +115,7 @@ def make_mock_repo(
     swap_dims_on_output=False,
     save_result_default=False,
     padding=False,
+    block_parallel=False,
 ) -> MethodRepository:
     """Makes a mock MethodRepository that returns the given properties on any query"""
     mock_repo = mocker.MagicMock()
@@ -131,4 +134,5 @@ def make_mock_repo(
         mock_query, "save_result_default", return_value=save_result_default
     )
     mocker.patch.object(mock_query, "padding", return_value=padding)
+    mocker.patch.object(mock_query, "block_parallel", return_value=block_parallel)
     return mock_repo